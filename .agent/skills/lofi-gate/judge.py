@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
+import os
 import sys
+import argparse
 try:
     from lofi_gate.logic import run_checks
 except ImportError:
@@ -7,6 +9,21 @@ except ImportError:
     print("Please run: pip install lofi-gate")
     sys.exit(1)
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+import logger
+from scheduler import run_scheduled
+
 if __name__ == "__main__":
-    # Run the verification logic
-    sys.exit(run_checks())
+    parser = argparse.ArgumentParser(description="LoFi Gate Judge")
+    parser.add_argument("--no-cache", action="store_true", help="Rerun every check, even if its inputs are unchanged")
+    parser.add_argument("--workers", type=int, default=None, help="Max checks running at once (default: all)")
+    parser.add_argument("--full", action="store_true", help="Run the package's monolithic run_checks() instead")
+    args = parser.parse_args()
+
+    if args.full:
+        exit_code = run_checks()
+        logger.write_entries([], render=True)
+        sys.exit(exit_code)
+
+    # Run the verification logic: cached PASSes are skipped, the rest run in parallel.
+    sys.exit(run_scheduled(use_cache=not args.no_cache, workers=args.workers))
@@ -1,12 +1,79 @@
-import argparse
 import os
-import datetime
 import sys
+import re
+import gzip
+import json
+import math
+import hashlib
+import time
+import contextlib
+from collections import Counter
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
 
 # --- Configuration ---
 MAX_LOG_LINES = 200
 LOG_FILENAME = "verification_history.md"
 
+# The structured store is the source of truth; verification_history.md is a view rendered from it.
+STORE_FILENAME = "verification_history.jsonl"
+
+# A pre-store Markdown ledger is kept under this name when the store is first created.
+LEGACY_FILENAME = "verification_history.legacy.md"
+
+# The rendered view shows the last MAX_LOG_LINES entries, fewer if long error dropdowns
+# would push it past this size.
+RENDER_MAX_BYTES = 128 * 1024
+
+# Once the live store passes this size it is gzipped into the archive as one segment, so
+# appends and tail reads stay on a small file while every older run remains queryable.
+SEGMENT_MAX_BYTES = 1024 * 1024
+ARCHIVE_DIRNAME = "verification_history.archive"
+ARCHIVE_INDEX_FILENAME = "index.json"
+
+# Error output is stored once per distinct body, keyed by the SHA-256 of its normalized
+# text; entries carry only the hash, a one-line excerpt and a seen count.
+BLOB_DIRNAME = "verification_history.blobs"
+BLOB_COUNTS_FILENAME = "seen.json"
+ERROR_REF_CHARS = 12
+ERROR_EXCERPT_CHARS = 120
+
+# Stripped before storing: colour codes and trailing whitespace never change the failure.
+ANSI_REGEX = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+# Masked only for the hash, so reruns of the same failure share a blob even when timings
+# or object addresses differ.
+VOLATILE_REGEX = re.compile(r"\b0x[0-9a-fA-F]+\b|\b\d+(?:\.\d+)?\s?(?:ms|s)\b")
+
+# Tail reads walk backwards through the store in blocks of this size.
+TAIL_BLOCK_BYTES = 64 * 1024
+
+# Judge Statuses might be APPROVED/REJECTED, map them widely. CACHED is a PASS the scheduler reused.
+PASS_STATUSES = ("PASS", "APPROVED", "SUCCESS", "CACHED")
+
+# --stdin mode flushes this many entries per locked write.
+STDIN_BATCH_SIZE = 50
+
+# An entry line as format_entry writes it, or as the installed lofi_gate package's logger
+# does (`lofi-gate verify` appends straight to the Markdown view, with no " - message").
+VIEW_ENTRY_REGEX = re.compile(
+    r"- \*\*\[(?P<timestamp>\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)\]\*\* \[(?P<command>.*?)\] (?:✅|❌) "
+    r"\*\*(?P<label>.+?)\*\*: (?P<status>\S+) (?:\((?P<duration>[\d.]+)s\))? "
+    r"\(total token size: (?P<used>\d+)\) \(tokens truncated: (?P<saved>\d+)\)(?: - (?P<message>.*))?$"
+)
+
+# Records are stamped before ledger_lock is taken, so the store is only roughly in time
+# order; matching view entries against it looks this far past the oldest one.
+VIEW_MATCH_SLACK_SECONDS = 300
+
+# The package logger rewrites the view in place (truncate, then write), so a view without
+# its footer is still being written; a render waits up to this many polls for it to finish.
+VIEW_WRITE_POLLS = 100
+VIEW_WRITE_POLL_SECONDS = 0.02
+
 def get_log_path():
     """
     Determines the path to the centralized log file.
@@ -54,41 +121,49 @@ def parse_footer(lines):
             
     return clean_lines, size, savings
 
-def log_to_history(label, status, message, tokens_used=0, tokens_saved=0, duration=0, command_context="", error_content=None):
+def get_store_path():
+    """The structured store lives next to the rendered ledger."""
+    return os.path.join(os.path.dirname(get_log_path()), STORE_FILENAME)
+
+def format_footer(size, savings):
+    """Renders the "Sticky Footer"."""
+    return f"\n> 📊 **Total Token Size:** {size} | 💰 **Total Token Savings:** {savings}\n"
+
+@contextlib.contextmanager
+def ledger_lock(log_path):
     """
-    Appends a log entry to the history file with metrics and interaction.
+    Exclusive inter-process lock for ledger writes.
+    
+    Why: `lofi-gate verify --parallel` finishes checks at the same time; without a lock two
+    writers read the same running totals and one entry's token increments are lost.
+    The lock covers only the write itself, so the checks still run in parallel.
+    A sidecar lock file is used because rendering replaces the ledger.
     """
-    log_path = get_log_path()
-    if not log_path:
-        print("Error: Could not determine log path.")
-        return
-
-    # 1. Read all lines
-    lines = []
-    if os.path.exists(log_path):
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+    with open(log_path + ".lock", 'a+b') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue  # LK_LOCK gives up after ~10s; keep waiting.
         try:
-            with open(log_path, 'r', encoding='utf-8') as f: lines = f.readlines()
-        except: pass
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
 
-    # 2. Extract & Remove Footer (so we can append it later)
-    lines, current_size, current_savings = parse_footer(lines)
-    
-    # 3. Log Rotation
-    # Keeps the log file lightweight.
-    SAFE_LOG_LINES = MAX_LOG_LINES * 2
-    if len(lines) > SAFE_LOG_LINES:
-        lines = lines[-SAFE_LOG_LINES:]
-        if not lines[0].startswith("..."):
-            lines.insert(0, f"... (Log truncated to last {SAFE_LOG_LINES} lines) ...\n")
-
-    # 4. Update Totals
-    current_size += tokens_used
-    current_savings += tokens_saved
-
-    # 5. Format Entry
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    # Judge Statuses might be APPROVED/REJECTED, map them widely.
-    icon = "✅" if status in ["PASS", "APPROVED", "SUCCESS"] else "❌"
+def format_entry(label, status, message, tokens_used=0, tokens_saved=0, duration=0, command_context="", error_content=None, timestamp=None):
+    """Renders one ledger entry (plus its optional error dropdown) as a single string."""
+    timestamp = timestamp or time.strftime("%Y-%m-%d %H:%M:%S")
+    icon = "✅" if status in PASS_STATUSES else "❌"
     
     duration_str = f"({duration:.2f}s)" if duration > 0 else ""
     # Metrics display for the line item
@@ -96,10 +171,9 @@ def log_to_history(label, status, message, tokens_used=0, tokens_saved=0, durati
     
     context_str = f"[{command_context}]" if command_context else "[Internal]"
     
-    entry = f"- **[{timestamp}]** {context_str} {icon} **{label}**: {status} {duration_str} {metrics_msg} - {message}\n"
-    lines.append(entry)
+    lines = [f"- **[{timestamp}]** {context_str} {icon} **{label}**: {status} {duration_str} {metrics_msg} - {message}\n"]
     
-    # 6. Append Error Snippet (HTML Dropdown)
+    # Append Error Snippet (HTML Dropdown)
     if error_content:
         lines.append("  <details>\n")
         lines.append("  <summary>🔍 View Details</summary>\n\n")
@@ -108,25 +182,621 @@ def log_to_history(label, status, message, tokens_used=0, tokens_saved=0, durati
             lines.append(f"  {line}\n")
         lines.append("  ```\n")
         lines.append("  </details>\n")
+    return "".join(lines)
+
+# --- Structured Store ---
+# One JSON object per line, appended under ledger_lock. Every record carries the running
+# token totals as of that entry, so the current totals are always the last line's.
+
+def make_record(label, status, message, tokens_used=0, tokens_saved=0, duration=0, command_context="", error_content=None):
+    """Builds a store record (without running totals) from log_to_history's parameters."""
+    now = time.time()
+    record = {
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now)),
+        "epoch": round(now, 3),
+        "label": label,
+        "status": status,
+        "message": message,
+        "duration": duration,
+        "tokens_used": tokens_used,
+        "tokens_saved": tokens_saved,
+        "command": command_context,
+    }
+    if error_content:
+        record["error_content"] = error_content
+    return record
+
+def format_record(record, blob_dir=None):
+    """
+    Renders a store record as format_entry renders a fresh entry. An error stored as a blob
+    is shown as a one-line reference unless `blob_dir` is given, in which case the blob is
+    read back and expanded into the usual dropdown.
+    """
+    error_hash = record.get("error_hash")
+    error_content = record.get("error_content")
+    if error_hash and blob_dir:
+        error_content = read_error_blob(blob_dir, error_hash)
+    text = format_entry(
+        record["label"], record["status"], record.get("message", ""),
+        record.get("tokens_used", 0), record.get("tokens_saved", 0), record.get("duration", 0),
+        record.get("command", ""), error_content, record.get("timestamp"),
+    )
+    if error_hash and not error_content:
+        text += f"  🔍 `{error_hash[:ERROR_REF_CHARS]}` (seen {record.get('error_seen', 1)} times): {record.get('error_excerpt', '')}\n"
+    return text
+
+# --- Error Blobs ---
+
+def get_blob_dir(store_path):
+    return os.path.join(os.path.dirname(store_path), BLOB_DIRNAME)
+
+def normalize_error(text):
+    """The stored form of an error body: no colour codes, CRs, trailing spaces or blank edges."""
+    lines = [line.rstrip() for line in ANSI_REGEX.sub("", text).replace("\r\n", "\n").split("\n")]
+    return "\n".join(lines).strip("\n")
 
-    # 7. Append New Sticky Footer
-    footer = f"\n> 📊 **Total Token Size:** {current_size} | 💰 **Total Token Savings:** {current_savings}\n"
-    lines.append(footer)
+def error_hash(normalized):
+    return hashlib.sha256(VOLATILE_REGEX.sub("#", normalized).encode('utf-8')).hexdigest()
+
+def error_excerpt(normalized):
+    """The last non-blank line (where tracebacks and test runners put the verdict), shortened."""
+    lines = [line.strip() for line in normalized.splitlines() if line.strip()]
+    excerpt = lines[-1] if lines else ""
+    if len(excerpt) > ERROR_EXCERPT_CHARS:
+        excerpt = excerpt[:ERROR_EXCERPT_CHARS - 1] + "…"
+    return excerpt
+
+def store_error_blobs(store_path, records):
+    """
+    Moves each record's error_content into the blob store: the body is written once per hash,
+    and the record gets error_hash, error_excerpt and error_seen (occurrences so far,
+    including this one). Callers must hold ledger_lock.
+    """
+    pending = [r for r in records if r.get("error_content")]
+    if not pending:
+        return
+    blob_dir = get_blob_dir(store_path)
+    os.makedirs(blob_dir, exist_ok=True)
+    counts_path = os.path.join(blob_dir, BLOB_COUNTS_FILENAME)
+    try:
+        with open(counts_path, 'r', encoding='utf-8') as f:
+            counts = json.load(f)
+    except (OSError, ValueError):
+        counts = {}
+    for record in pending:
+        normalized = normalize_error(record.pop("error_content"))
+        digest = error_hash(normalized)
+        blob_path = os.path.join(blob_dir, digest + ".txt")
+        if not os.path.exists(blob_path):
+            with open(blob_path + ".tmp", 'w', encoding='utf-8') as f:
+                f.write(normalized)
+            os.replace(blob_path + ".tmp", blob_path)
+        counts[digest] = counts.get(digest, 0) + 1
+        record["error_hash"] = digest
+        record["error_excerpt"] = error_excerpt(normalized)
+        record["error_seen"] = counts[digest]
+    with open(counts_path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(counts, f)
+    os.replace(counts_path + ".tmp", counts_path)
+
+def read_error_blob(blob_dir, ref):
+    """The error body for a full hash or a unique prefix of one; None if there's no match."""
+    if not re.fullmatch(r"[0-9a-f]+", ref or ""):
+        return None
+    path = os.path.join(blob_dir, ref + ".txt")
+    if not os.path.exists(path):
+        try:
+            matches = [name for name in os.listdir(blob_dir) if name.startswith(ref) and name.endswith(".txt")]
+        except OSError:
+            return None
+        if len(matches) != 1:
+            return None
+        path = os.path.join(blob_dir, matches[0])
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def parse_record(line):
+    """Decodes one store line. Returns None for blank, torn or foreign lines."""
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(record, dict) or "label" not in record or "status" not in record:
+        return None
+    return record
+
+def iter_records(store_path):
+    """Every record in the store, oldest first."""
+    if not os.path.exists(store_path):
+        return
+    with open(store_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            record = parse_record(line)
+            if record is not None:
+                yield record
+
+def iter_records_reversed(store_path):
+    """
+    Records newest first, reading the file backwards in TAIL_BLOCK_BYTES blocks.
     
-    # 8. Write
+    Why: Rendering and the running totals only need the tail, so their cost stays flat
+    however long the history grows.
+    """
+    if not os.path.exists(store_path):
+        return
+    with open(store_path, 'rb') as f:
+        position = f.seek(0, os.SEEK_END)
+        remainder = b""
+        while position > 0:
+            step = min(TAIL_BLOCK_BYTES, position)
+            position -= step
+            f.seek(position)
+            lines = (f.read(step) + remainder).split(b"\n")
+            # The first piece may be the tail of a line that starts in an earlier block.
+            remainder = lines.pop(0) if position > 0 else b""
+            for line in reversed(lines):
+                record = parse_record(line.decode('utf-8', errors='replace'))
+                if record is not None:
+                    yield record
+
+# --- Archive ---
+# Rotated segments are gzipped JSON lines. index.json lists them oldest first with the
+# timestamps of their first and last records and the running totals at the end of each,
+# so range queries open only the segments they need.
+
+def get_archive_dir(store_path):
+    return os.path.join(os.path.dirname(store_path), ARCHIVE_DIRNAME)
+
+def load_archive_index(archive_dir):
+    """The segment list from index.json; empty if there is no archive yet."""
+    try:
+        with open(os.path.join(archive_dir, ARCHIVE_INDEX_FILENAME), 'r', encoding='utf-8') as f:
+            return json.load(f)["segments"]
+    except (OSError, ValueError, KeyError):
+        return []
+
+def save_archive_index(archive_dir, segments):
+    index_path = os.path.join(archive_dir, ARCHIVE_INDEX_FILENAME)
+    with open(index_path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump({"segments": segments}, f, indent=2)
+    os.replace(index_path + ".tmp", index_path)
+
+def iter_segment(archive_dir, segment):
+    """Records of one archived segment, oldest first."""
+    with gzip.open(os.path.join(archive_dir, segment["file"]), 'rt', encoding='utf-8') as f:
+        for line in f:
+            record = parse_record(line)
+            if record is not None:
+                yield record
+
+def rotate_segment(store_path):
+    """
+    Compresses the live store into the next archive segment, indexes it and empties the
+    live store. The segment and index are written before the live store is truncated, so a
+    crash can at worst duplicate a segment's entries, never lose them.
+    Callers must hold ledger_lock.
+    """
+    records = list(iter_records(store_path))
+    if not records:
+        return None
+    archive_dir = get_archive_dir(store_path)
+    os.makedirs(archive_dir, exist_ok=True)
+    segments = load_archive_index(archive_dir)
+    segment = {
+        "file": f"segment-{len(segments) + 1:06d}.jsonl.gz",
+        "first": records[0].get("timestamp", ""),
+        "last": records[-1].get("timestamp", ""),
+        "entries": len(records),
+        "total_tokens_used": records[-1].get("total_tokens_used", 0),
+        "total_tokens_saved": records[-1].get("total_tokens_saved", 0),
+    }
+    segment_path = os.path.join(archive_dir, segment["file"])
+    with gzip.open(segment_path + ".tmp", 'wt', encoding='utf-8') as f:
+        f.writelines(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+    os.replace(segment_path + ".tmp", segment_path)
+    segments.append(segment)
+    save_archive_index(archive_dir, segments)
+    open(store_path, 'w').close()
+    return segment
+
+def iter_history(store_path, since=None, until=None):
+    """
+    Every record in the archive and the live store, oldest first. `since`/`until` are
+    inclusive "YYYY-MM-DD" bounds; archived segments entirely outside them are never opened.
+    """
+    archive_dir = get_archive_dir(store_path)
+    in_range = lambda day: (not since or day >= since) and (not until or day <= until)
+    for segment in load_archive_index(archive_dir):
+        if (since and segment["last"][:10] < since) or (until and segment["first"][:10] > until):
+            continue
+        for record in iter_segment(archive_dir, segment):
+            if in_range(record.get("timestamp", "")[:10]):
+                yield record
+    for record in iter_records(store_path):
+        if in_range(record.get("timestamp", "")[:10]):
+            yield record
+
+def iter_history_reversed(store_path):
+    """Records newest first: the live store's tail, then archived segments newest first."""
+    yield from iter_records_reversed(store_path)
+    archive_dir = get_archive_dir(store_path)
+    for segment in reversed(load_archive_index(archive_dir)):
+        yield from reversed(list(iter_segment(archive_dir, segment)))
+
+def read_recent(store_path, count):
+    """The last `count` records across the live store and the archive, oldest first."""
+    records = []
+    for record in iter_history_reversed(store_path):
+        if len(records) >= count:
+            break
+        records.append(record)
+    records.reverse()
+    return records
+
+def current_totals(store_path, log_path):
+    """
+    Running (size, savings) totals: the last record's; right after a rotation, the newest
+    archived segment's; for a new store, the footer totals of the migrated pre-store ledger,
+    so history from before the store isn't reset.
+    """
+    for record in iter_records_reversed(store_path):
+        return record.get("total_tokens_used", 0), record.get("total_tokens_saved", 0)
+    segments = load_archive_index(get_archive_dir(store_path))
+    if segments:
+        return segments[-1]["total_tokens_used"], segments[-1]["total_tokens_saved"]
+    for path in (os.path.join(os.path.dirname(log_path), LEGACY_FILENAME), log_path):
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    return parse_footer(f.readlines())[1:]
+            except: pass
+    return 0, 0
+
+def has_history(store_path):
+    """True once anything has been written to the store (live or archived)."""
+    return os.path.exists(store_path) or bool(load_archive_index(get_archive_dir(store_path)))
+
+def migrate_legacy_ledger(store_path, log_path):
+    """
+    Moves a pre-store Markdown ledger to LEGACY_FILENAME before the store is written or a
+    view is rendered over it. current_totals reads its footer there, so its totals carry
+    into the store with the first append. Callers must hold ledger_lock.
+    """
+    legacy_path = os.path.join(os.path.dirname(log_path), LEGACY_FILENAME)
+    if os.path.exists(log_path) and not os.path.exists(legacy_path) and not has_history(store_path):
+        os.replace(log_path, legacy_path)
+
+def append_records(store_path, log_path, records):
+    """
+    O(entries) write: stamps running totals onto `records` and appends them to the store in
+    a single write, rotating the store into the archive once it passes SEGMENT_MAX_BYTES.
+    The first write into a new store moves a pre-store Markdown ledger to LEGACY_FILENAME
+    and carries its totals over. Callers must hold ledger_lock.
+    """
+    migrate_legacy_ledger(store_path, log_path)
+    size, savings = current_totals(store_path, log_path)
+    store_error_blobs(store_path, records)
+    lines = []
+    for record in records:
+        size += record.get("tokens_used", 0)
+        savings += record.get("tokens_saved", 0)
+        record["total_tokens_used"] = size
+        record["total_tokens_saved"] = savings
+        lines.append(json.dumps(record, ensure_ascii=False) + "\n")
+    with open(store_path, 'a+b') as f:
+        # A writer killed mid-line leaves a torn record; start ours on a fresh line.
+        if f.seek(0, os.SEEK_END):
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                lines.insert(0, "\n")
+        f.write("".join(lines).encode('utf-8'))
+        due = f.tell() > SEGMENT_MAX_BYTES
+    if due:
+        rotate_segment(store_path)
+
+def parse_view_entries(lines):
+    """
+    Store records (without running totals) for the entries in a Markdown view. An error
+    dropdown under an entry becomes its error_content; blob references are left out.
+    """
+    records, details = [], None
+    for line in lines:
+        line = line.rstrip("\n")
+        match = VIEW_ENTRY_REGEX.match(line)
+        if match:
+            command = match["command"]
+            records.append({
+                "timestamp": match["timestamp"],
+                "label": match["label"],
+                "status": match["status"],
+                "message": match["message"] or "",
+                "duration": float(match["duration"] or 0),
+                "tokens_used": int(match["used"]),
+                "tokens_saved": int(match["saved"]),
+                "command": "" if command == "Internal" else command,
+            })
+            details = None
+        elif records and line == "  ```text":
+            details = []
+        elif details is not None:
+            if line == "  ```":
+                records[-1]["error_content"] = "\n".join(details)
+                details = None
+            else:
+                details.append(line[2:])
+    return records
+
+def read_view(view):
+    """
+    The lines of the open view file `view`, once complete: every complete view ends with
+    the totals footer, so a view without one is still being written. Gives up waiting after
+    VIEW_WRITE_POLLS polls and returns what is there.
+    """
+    for _ in range(VIEW_WRITE_POLLS):
+        view.seek(0)
+        lines = view.readlines()
+        content = [line for line in lines if line.strip()]
+        if content and "**Total Token Size:**" in content[-1]:
+            break
+        time.sleep(VIEW_WRITE_POLL_SECONDS)
+    return lines
+
+def ingest_view_entries(store_path, log_path, lines):
+    """
+    Appends entries found in the Markdown view `lines` but not in the store, so a render
+    never replaces them. The lofi_gate package's own logger (`lofi-gate verify`) writes only
+    the view; entries are matched on (timestamp, label, status) against the store's recent
+    records. Returns the number ingested. Callers must hold ledger_lock.
+    """
+    entries = parse_view_entries(lines)
+    if not entries:
+        return 0
+    oldest = min(time.mktime(time.strptime(e["timestamp"], "%Y-%m-%d %H:%M:%S")) for e in entries)
+    known = Counter()
+    for record in iter_history_reversed(store_path):
+        if record.get("epoch", 0) < oldest - VIEW_MATCH_SLACK_SECONDS:
+            break
+        known[(record.get("timestamp"), record["label"], record["status"])] += 1
+    foreign = []
+    for entry in entries:
+        key = (entry["timestamp"], entry["label"], entry["status"])
+        if known[key]:
+            known[key] -= 1
+        else:
+            foreign.append(entry)
+    if foreign:
+        now = round(time.time(), 3)
+        for entry in foreign:
+            entry["epoch"] = now
+        append_records(store_path, log_path, foreign)
+    return len(foreign)
+
+def render_history(log_path=None, limit=None, expand_errors=False):
+    """
+    Regenerates verification_history.md from the store: the last `limit` entries (default
+    MAX_LOG_LINES, trimmed to RENDER_MAX_BYTES) and the totals footer. Errors appear as
+    one-line blob references unless `expand_errors` is set. The file is replaced
+    atomically, so readers never see half a ledger. A pre-store ledger is migrated first,
+    and an empty store never overwrites an existing file. Entries other writers added to
+    the view are ingested into the store first. Returns False if nothing was rendered.
+    Callers must hold ledger_lock.
+    """
+    log_path = log_path or get_log_path()
+    store_path = os.path.join(os.path.dirname(log_path), STORE_FILENAME)
+    migrate_legacy_ledger(store_path, log_path)
+    if not has_history(store_path):
+        if os.path.exists(log_path):
+            return False
+        # An empty store marks this view as rendered, so it is never mistaken for a legacy ledger.
+        open(store_path, 'a').close()
+    limit = limit or MAX_LOG_LINES
+    try:
+        with open(log_path, 'r', encoding='utf-8') as view:
+            lines = read_view(view)
+    except FileNotFoundError:
+        lines = []
+    while True:
+        ingest_view_entries(store_path, log_path, lines)
+        temp_path = write_view(store_path, log_path, limit, expand_errors)
+        try:
+            view = open(log_path, 'r', encoding='utf-8')
+        except FileNotFoundError:
+            os.replace(temp_path, log_path)
+            return True
+        with view:
+            os.replace(temp_path, log_path)
+            # The package logger takes no lock of ours. A write it made since `lines` were
+            # read (or one it had begun) went to the file just replaced: read that back,
+            # and ingest and render again if anything was added.
+            replaced = read_view(view)
+        if replaced == lines:
+            return True
+        lines = replaced
+
+def write_view(store_path, log_path, limit, expand_errors):
+    """Renders the view to a temp file beside `log_path` and returns its path."""
+    # One extra record tells us whether anything older exists.
+    records = read_recent(store_path, limit + 1)
+    truncated = len(records) > limit
+    blob_dir = get_blob_dir(store_path) if expand_errors else None
+    texts = [format_record(r, blob_dir) for r in records[-limit:]]
+    kept_bytes = 0
+    for keep, text in enumerate(reversed(texts)):
+        kept_bytes += len(text.encode('utf-8'))
+        if keep and kept_bytes > RENDER_MAX_BYTES:
+            texts = texts[len(texts) - keep:]
+            truncated = True
+            break
+
+    lines = []
+    if truncated:
+        lines.append(f"... (Showing last {len(texts)} entries; full history in {STORE_FILENAME}) ...\n")
+    lines.extend(texts)
+    lines.append(format_footer(*current_totals(store_path, log_path)))
+
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+    temp_path = f"{log_path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.writelines(lines)
+    return temp_path
+
+# --- Writers ---
+
+def normalize_entry(entry):
+    """
+    Maps a batch/JSON entry onto log_to_history's parameters. Accepts the CLI spellings
+    ("command", "tokens-used", ...) as well as the Python ones. Raises KeyError without
+    a label or status.
+    """
+    get = lambda key, default: entry.get(key, entry.get(key.replace("_", "-"), default))
+    return {
+        "label": entry["label"],
+        "status": entry["status"],
+        "message": get("message", ""),
+        "tokens_used": int(get("tokens_used", 0)),
+        "tokens_saved": int(get("tokens_saved", 0)),
+        "duration": float(get("duration", 0)),
+        "command_context": get("command_context", entry.get("command", "")),
+        "error_content": get("error_content", None),
+    }
+
+def write_entries(records, render=False, expand_errors=False):
+    """
+    One lock acquisition and one store write for any number of records. The Markdown view
+    is only regenerated with `render` (in the same critical section): re-rendering costs far
+    more than the append, so writers leave it for one render at the end of a run (the
+    scheduler, --stdin, `logger.py --render`).
+    """
+    log_path = get_log_path()
+    if not log_path:
+        print("Error: Could not determine log path.")
+        return False
     try:
-        # Ensure dir exists in case this is the first run
-        os.makedirs(os.path.dirname(log_path), exist_ok=True)
-        with open(log_path, 'w', encoding='utf-8') as f: f.writelines(lines)
-        print(f"Logged to {LOG_FILENAME}")
+        with ledger_lock(log_path):
+            if records:
+                append_records(get_store_path(), log_path, records)
+            if render and not render_history(log_path, expand_errors=expand_errors):
+                print(f"Kept existing {LOG_FILENAME}: {STORE_FILENAME} has no entries to render.")
+        return True
     except Exception as e:
         print(f"Error writing to log: {e}")
+        return False
+
+def log_to_history(label, status, message, tokens_used=0, tokens_saved=0, duration=0, command_context="", error_content=None, render=False):
+    """
+    Appends a log entry to the history store with metrics and interaction.
+    """
+    record = make_record(label, status, message, tokens_used, tokens_saved, duration, command_context, error_content)
+    if write_entries([record], render):
+        print(f"Logged to {STORE_FILENAME}")
+
+def log_many(entries, render=False):
+    """
+    In-process batch API: logs every entry (dicts, see normalize_entry) in a single I/O pass.
+    
+    Why: A gate run with dozens of checks otherwise pays one interpreter start-up and one
+    ledger write per check. Returns the number of entries written.
+    """
+    records = [make_record(**normalize_entry(entry)) for entry in entries]
+    if not records or not write_entries(records, render):
+        return 0
+    print(f"Logged {len(records)} entries to {STORE_FILENAME}")
+    return len(records)
+
+def log_stream(stream, batch_size=STDIN_BATCH_SIZE, render=True):
+    """
+    Reads JSON-lines entries from `stream` and flushes them through log_many in groups of
+    `batch_size` (plus a final partial group at EOF). Malformed lines are reported and skipped.
+    The Markdown view is rendered once, after the last group. Returns the number of entries written.
+    """
+    batch, written = [], 0
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            entry = json.loads(line)
+            normalize_entry(entry)
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            print(f"Skipping line {line_number}: invalid entry ({e})", file=sys.stderr)
+            continue
+        batch.append(entry)
+        if len(batch) >= batch_size:
+            written += log_many(batch, render=False)
+            batch = []
+    if batch:
+        written += log_many(batch, render=False)
+    if render and written:
+        write_entries([], render=True)
+    return written
+
+# --- Analytics ---
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(len(ordered) * pct / 100))
+    return ordered[rank - 1]
+
+def history_stats(records, label=None, since=None):
+    """
+    Aggregates store records for the --stats report.
+    
+    Returns {"labels": {label: {...}}, "days": {YYYY-MM-DD: {...}}}: per label the run count,
+    pass rate, p50/p95 duration (entries that recorded one) and token totals; per day the
+    run count, pass rate and tokens saved, so trends show without reading the ledger text.
+    `since` is a "YYYY-MM-DD" lower bound.
+    """
+    labels, days, durations = {}, {}, {}
+    for record in records:
+        if label and record["label"] != label:
+            continue
+        day = record.get("timestamp", "")[:10]
+        if since and day < since:
+            continue
+        passed = record["status"] in PASS_STATUSES
+        for key, bucket in ((record["label"], labels), (day, days)):
+            stats = bucket.setdefault(key, {"runs": 0, "passes": 0, "tokens_used": 0, "tokens_saved": 0})
+            stats["runs"] += 1
+            stats["passes"] += passed
+            stats["tokens_used"] += record.get("tokens_used", 0)
+            stats["tokens_saved"] += record.get("tokens_saved", 0)
+        if record.get("duration", 0) > 0:
+            durations.setdefault(record["label"], []).append(record["duration"])
+
+    for bucket in (labels, days):
+        for stats in bucket.values():
+            stats["pass_rate"] = stats["passes"] / stats["runs"]
+    for key, stats in labels.items():
+        values = durations.get(key)
+        stats["p50_duration"] = percentile(values, 50) if values else None
+        stats["p95_duration"] = percentile(values, 95) if values else None
+    return {"labels": labels, "days": dict(sorted(days.items()))}
+
+def format_stats(report):
+    """Plain-text tables for history_stats(); slowest labels (by p95) first."""
+    seconds = lambda value: f"{value:.2f}s" if value is not None else "-"
+    lines = [f"{'Label':<24} {'Runs':>5} {'Pass':>6} {'p50':>9} {'p95':>9} {'Saved':>9}"]
+    by_p95 = sorted(report["labels"].items(), key=lambda item: -(item[1]["p95_duration"] or 0))
+    for label, s in by_p95:
+        lines.append(
+            f"{label[:24]:<24} {s['runs']:>5} {s['pass_rate']:>6.0%} "
+            f"{seconds(s['p50_duration']):>9} {seconds(s['p95_duration']):>9} {s['tokens_saved']:>9}"
+        )
+    lines.append("")
+    lines.append(f"{'Day':<12} {'Runs':>5} {'Pass':>6} {'Saved':>9}")
+    for day, s in report["days"].items():
+        lines.append(f"{day:<12} {s['runs']:>5} {s['pass_rate']:>6.0%} {s['tokens_saved']:>9}")
+    return "\n".join(lines)
 
 if __name__ == "__main__":
+    # Only the CLI needs argparse; importers of log_many don't pay for it.
+    import argparse
+
     # CLI Interface for the Judge Skill to call this script
     parser = argparse.ArgumentParser(description="Unified Logger for LoFi Gate")
-    parser.add_argument("--label", required=True, help="Label of the check (e.g. Test Suite)")
-    parser.add_argument("--status", required=True, help="Status (PASS, FAIL, etc)")
+    parser.add_argument("--label", help="Label of the check (e.g. Test Suite); with --stats, only this label")
+    parser.add_argument("--status", help="Status (PASS, FAIL, etc)")
     parser.add_argument("--message", default="", help="Log message content")
     
     # Optional Metrics
@@ -135,8 +805,56 @@ if __name__ == "__main__":
     parser.add_argument("--duration", type=float, default=0.0, help="Duration in seconds")
     parser.add_argument("--command", default="", help="Command context (e.g. npm test)")
     parser.add_argument("--error-content", default="", help="Error snippet to wrap in details")
+
+    # Streaming Mode
+    parser.add_argument("--stdin", action="store_true", help="Read JSON-lines entries from stdin (keys match the flags above)")
+    parser.add_argument("--batch-size", type=int, default=STDIN_BATCH_SIZE, help="Entries per write in --stdin mode")
+
+    # Rendering
+    parser.add_argument("--no-render", action="store_true", help=f"With --stdin, append to {STORE_FILENAME} without regenerating {LOG_FILENAME}")
+    parser.add_argument("--render", action="store_true",
+                        help=f"Regenerate {LOG_FILENAME} from {STORE_FILENAME} (after logging the entry, if one is given)")
+    parser.add_argument("--expand-errors", action="store_true", help="With --render/--history, inline full error bodies instead of blob references")
+    parser.add_argument("--show-error", metavar="HASH", help="Print the stored error body for a hash (or unique prefix) and exit")
+
+    # Analytics
+    parser.add_argument("--stats", action="store_true", help="Report per-label p50/p95 duration, pass rates and daily token savings")
+    parser.add_argument("--history", action="store_true", help="Print entries from the store and archive (see --since/--until/--label)")
+    parser.add_argument("--since", help="With --stats/--history, only entries on or after this date (YYYY-MM-DD)")
+    parser.add_argument("--until", help="With --stats/--history, only entries on or before this date (YYYY-MM-DD)")
+    parser.add_argument("--json", action="store_true", help="With --stats/--history, print JSON")
     
     args = parser.parse_args()
+
+    if args.render and not (args.label or args.status or args.stdin):
+        sys.exit(0 if write_entries([], render=True, expand_errors=args.expand_errors) else 1)
+
+    if args.show_error:
+        body = read_error_blob(get_blob_dir(get_store_path()), args.show_error)
+        if body is None:
+            print(f"No unique stored error matches '{args.show_error}'", file=sys.stderr)
+            sys.exit(1)
+        print(body)
+        sys.exit(0)
+
+    if args.stats:
+        report = history_stats(iter_history(get_store_path(), args.since, args.until), args.label)
+        print(json.dumps(report, indent=2) if args.json else format_stats(report))
+        sys.exit(0)
+
+    if args.history:
+        blob_dir = get_blob_dir(get_store_path()) if args.expand_errors else None
+        for record in iter_history(get_store_path(), args.since, args.until):
+            if not args.label or record["label"] == args.label:
+                sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n" if args.json else format_record(record, blob_dir))
+        sys.exit(0)
+
+    if args.stdin:
+        log_stream(sys.stdin, max(1, args.batch_size), render=not args.no_render)
+        sys.exit(0)
+
+    if not args.label or not args.status:
+        parser.error("--label and --status are required (or use --stdin, --render, --stats, --history or --show-error)")
     
     log_to_history(
         args.label, 
@@ -146,5 +864,6 @@ if __name__ == "__main__":
         args.tokens_saved, 
         args.duration, 
         args.command, 
-        args.error_content
+        args.error_content,
+        render=args.render
     )
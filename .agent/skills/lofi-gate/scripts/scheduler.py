@@ -0,0 +1,257 @@
+"""
+Incremental scheduler around lofi_gate.logic.run_checks.
+
+run_checks reruns every check on every call. This discovers the same checks, fingerprints
+each one's inputs, answers the ones whose fingerprint matches a cached PASS straight from
+the cache, and runs the rest concurrently on a process pool.
+"""
+import os
+import json
+import time
+import hashlib
+import subprocess
+import concurrent.futures
+
+from lofi_gate import logic
+
+import logger
+
+# The skill's logger owns the ledger (structured store + rendered Markdown). The package's
+# print_result logs through logic.log_to_history, so route those writes here too. Runs
+# that bypass this module (`lofi-gate verify`) are picked up from the view on the next render.
+logic.log_to_history = logger.log_to_history
+
+# --- Configuration ---
+CACHE_FILENAME = ".lofi-gate-cache.json"
+
+# Security scans only depend on the dependency manifests and lockfiles.
+DEPENDENCY_FILES = ("package.json", "package-lock.json", "pnpm-lock.yaml", "yarn.lock", "Cargo.toml", "Cargo.lock")
+
+# Written by every gate run, so they must never invalidate a fingerprint. Matched against every
+# path component: the ledger's blob store and archive are directories of files.
+IGNORED_PREFIXES = ("verification_history", CACHE_FILENAME)
+
+HASH_CHUNK_BYTES = 1024 * 1024
+
+# New advisories are published against dependencies that haven't changed, so a cached
+# security PASS only stands for this long.
+SECURITY_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+def build_checks(config, scripts):
+    """
+    The checks run_checks would run, in the same order and under the same lofi.toml
+    switches, as plain dicts so they can be pickled to pool workers.
+    `inputs` names what the fingerprint covers: "sources", "dependencies" or "git-status".
+    """
+    gate_config = config.get("gate", {})
+    checks = []
+
+    # 1. TDD Check
+    if gate_config.get("strict_tdd", True):
+        checks.append({"label": "TDD Check", "kind": "tdd", "command": "git status", "inputs": "git-status"})
+
+    # 2. Security
+    if gate_config.get("security_check", True):
+        security = {"kind": "security", "inputs": "dependencies", "fail_on_error": gate_config.get("security_fail_on_error", True)}
+        if os.path.exists("package.json"):
+            checks.append(dict(security, label="Security Scan", command="npm audit --audit-level=high"))
+        elif os.path.exists("Cargo.toml"):
+            checks.append(dict(security, label="Security Scan", command="cargo audit"))
+
+    # 3. Lint
+    if gate_config.get("lint_check", True):
+        if "lint" in scripts:
+            checks.append({"label": "Lint", "kind": "command", "command": "npm run lint", "inputs": "sources"})
+        elif os.path.exists("Cargo.toml"):
+            checks.append({"label": "Lint", "kind": "command", "command": "cargo check", "inputs": "sources"})
+        elif os.path.exists("go.mod"):
+            checks.append({"label": "Lint", "kind": "command", "command": "go vet ./...", "inputs": "sources"})
+
+    # 4. Tests
+    test_cmd = logic.determine_test_command(scripts, config.get("project", {}).get("test_command"))
+    if test_cmd:
+        checks.append({"label": "Test Suite", "kind": "command", "command": test_cmd, "inputs": "sources"})
+    else:
+        print("⚠️  No test framework detected. Skipping Test Suite.")
+
+    # 5. Coverage
+    if "coverage" in scripts:
+        checks.append({"label": "Coverage", "kind": "command", "command": "npm run coverage", "inputs": "sources"})
+    return checks
+
+def execute_check(check):
+    """Runs one check in a pool worker. Returns run_command's (exit_code, output, duration, command)."""
+    if check["kind"] == "tdd":
+        return logic.check_strict_tdd()
+    exit_code, output, duration, command = logic.run_command(check["command"], check["label"])
+    if check["kind"] == "security" and not check["fail_on_error"] and exit_code != 0:
+        # Warn-only security: show the output but don't fail the pipeline (as run_checks does).
+        return 0, f"⚠️  Security Check Failed (Warn Only) - Exit Code {exit_code}\n" + output, duration, command
+    return exit_code, output, duration, command
+
+# --- Fingerprints ---
+
+def source_files():
+    """Tracked and untracked-but-not-ignored files, minus the gate's own outputs (and anything under them)."""
+    try:
+        result = subprocess.run(
+            ["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True
+        )
+        paths = result.stdout.decode('utf-8', errors='replace').split("\0")
+    except (OSError, subprocess.CalledProcessError):
+        paths = [
+            os.path.relpath(os.path.join(root, name))
+            for root, dirs, names in os.walk(".")
+            if ".git" not in root.split(os.sep) and "node_modules" not in root.split(os.sep)
+            for name in names
+        ]
+    return sorted(p for p in set(paths) if p and not is_gate_output(p))
+
+def is_gate_output(path):
+    return any(part.startswith(IGNORED_PREFIXES) for part in path.replace(os.sep, "/").split("/"))
+
+class FileHasher:
+    """
+    Content digests with a stat memo: a file is only re-read when its size or mtime changed
+    since the last run, so fingerprinting an unchanged tree costs one stat per file.
+    """
+    def __init__(self, memo):
+        self.memo = memo
+        self.seen = {}
+
+    def digest(self, path):
+        if path in self.seen:
+            return self.seen[path][2]
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return "missing"
+        entry = self.memo.get(path)
+        if not entry or entry[0] != stat.st_mtime_ns or entry[1] != stat.st_size:
+            h = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+                    h.update(chunk)
+            entry = [stat.st_mtime_ns, stat.st_size, h.hexdigest()]
+        self.seen[path] = entry
+        return entry[2]
+
+def fingerprint(check, config, hasher, files):
+    """Hash of everything a check's verdict depends on: its command, lofi.toml and its input files."""
+    h = hashlib.sha256()
+    settings = {"command": check["command"], "gate": config.get("gate", {}), "project": config.get("project", {})}
+    h.update(json.dumps(settings, sort_keys=True, default=str).encode('utf-8'))
+    if check["inputs"] == "git-status":
+        status = subprocess.run(["git", "status", "--porcelain"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL).stdout
+        h.update(status)
+        h.update("\0".join(sorted(os.listdir("."))).encode('utf-8'))
+        return h.hexdigest()
+    paths = [p for p in DEPENDENCY_FILES if os.path.exists(p)] if check["inputs"] == "dependencies" else files
+    for path in paths:
+        h.update(f"{path}\0{hasher.digest(path)}\0".encode('utf-8'))
+    return h.hexdigest()
+
+# --- Cache ---
+
+def load_cache(path=CACHE_FILENAME):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        return {"checks": cache.get("checks", {}), "files": cache.get("files", {})}
+    except (OSError, ValueError, AttributeError):
+        return {"checks": {}, "files": {}}
+
+def save_cache(cache, path=CACHE_FILENAME):
+    """Atomic write. Non-fatal: a failed save only costs a rerun next time."""
+    try:
+        with open(path + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+        os.replace(path + ".tmp", path)
+    except OSError as e:
+        print(f"⚠️  Could not save check cache: {e}")
+
+def is_fresh(check, hit, now):
+    """Whether a cached PASS may still stand in for running `check`: security scans expire."""
+    return check["kind"] != "security" or now - hit.get("epoch", 0) < SECURITY_CACHE_TTL_SECONDS
+
+# --- Scheduler ---
+
+def run_scheduled(use_cache=True, workers=None):
+    """
+    Runs the gate incrementally. Checks whose fingerprint matches a cached PASS are logged
+    as CACHED (with the time they would have taken); the rest run concurrently. Only
+    passing results are cached, and security scans only for SECURITY_CACHE_TTL_SECONDS.
+    Returns the process exit code, like run_checks.
+    """
+    start_total = time.time()
+    config = logic.load_config()
+    checks = build_checks(config, logic.load_scripts())
+    cache = load_cache()
+    hasher = FileHasher(cache["files"])
+    files = source_files() if any(c["inputs"] == "sources" for c in checks) else []
+
+    pending, hits = [], []
+    for check in checks:
+        check["fingerprint"] = fingerprint(check, config, hasher, files)
+        hit = cache["checks"].get(check["label"])
+        if use_cache and hit and hit.get("fingerprint") == check["fingerprint"] and is_fresh(check, hit, start_total):
+            hits.append((check, hit))
+        else:
+            pending.append(check)
+
+    time_saved = sum(hit.get("duration", 0) for _, hit in hits)
+    if hits:
+        for check, hit in hits:
+            print(f"♻️  {check['label']} unchanged since {hit['timestamp']}. Skipped (saves ~{hit['duration']:.2f}s)")
+        logger.log_many([
+            {
+                "label": check["label"],
+                "status": "CACHED",
+                "message": f"Inputs unchanged since {hit['timestamp']}; skipped (saved {hit['duration']:.2f}s)",
+                "command": check["command"],
+            }
+            for check, hit in hits
+        ])
+
+    overall_failure = False
+    total_savings = 0
+    if pending:
+        print(f"🚀 Running {len(pending)} checks in PARALLEL ({len(hits)} cached)...")
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers or len(pending)) as pool:
+            future_to_check = {pool.submit(execute_check, check): check for check in pending}
+            for future in concurrent.futures.as_completed(future_to_check):
+                check = future_to_check[future]
+                label = check["label"]
+                try:
+                    code, out, dur, cmd = future.result()
+                    exit_code, saved = logic.print_result(label, code, out, dur, cmd)
+                except Exception as e:
+                    print(f"❌ {label} Crashed: {e}")
+                    overall_failure = True
+                    continue
+                total_savings += saved
+                if exit_code == 0:
+                    cache["checks"][label] = {
+                        "fingerprint": check["fingerprint"],
+                        "duration": round(dur, 3),
+                        "command": cmd,
+                        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+                        "epoch": round(time.time(), 3),
+                    }
+                else:
+                    cache["checks"].pop(label, None)
+                    overall_failure = True
+
+    # Only memo entries for files that still exist are kept.
+    cache["files"] = hasher.seen if files else cache["files"]
+    save_cache(cache)
+    # Checks only append to the store; the Markdown view is rendered once per run.
+    logger.write_entries([], render=True)
+
+    total_duration = time.time() - start_total
+    if overall_failure:
+        return 1
+
+    print(f"\n✨ All systems go! (Completed in {total_duration:.2f}s, {len(hits)} cached, ~{time_saved:.2f}s saved) 💰 Total Token Savings: {total_savings}")
+    return 0
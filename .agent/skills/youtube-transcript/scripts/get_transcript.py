@@ -1,24 +1,135 @@
 import sys
-import requests
+import abc
+import argparse
 import re
 import os
-import concurrent.futures
+import io
+import json
+import math
+import bisect
+import operator
+import itertools
+import glob
+import time
+import sqlite3
+import random
+import codecs
+import shutil
+import tempfile
+import filecmp
+import threading
+import contextlib
+import concurrent
+import importlib.util
+from array import array
 from collections import Counter
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional
-from youtube_transcript_api import (
-    YouTubeTranscriptApi, 
-    TranscriptsDisabled, 
-    NoTranscriptFound, 
-    VideoUnavailable, 
-    CouldNotRetrieveTranscript
-)
+from typing import List, Dict, Optional, Tuple, Iterable, Iterator
+from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+
+def lazy_import(name: str):
+    """
+    Returns a module proxy that runs the real import on first attribute access.
+    
+    Why: Agents call this script constantly, and usage errors, invalid IDs and already-exported
+    videos never touch the network, so they shouldn't pay for importing the HTTP stack
+    (~200 ms, most of the script's start-up). Each proxy is first touched on the main thread,
+    before any worker pool starts.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        # Fail as a plain `import` would, rather than on spec.loader below.
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    parent, _, child = name.rpartition(".")
+    if parent:
+        setattr(sys.modules[parent], child, module)
+    return module
+
+requests = lazy_import("requests")
+asyncio = lazy_import("asyncio")
+youtube_transcript_api = lazy_import("youtube_transcript_api")
+lazy_import("concurrent.futures")
 
 # --- Constants & Pre-compiled Regex ---
 # Compiled patterns at module level avoid the overhead of re-compiling inside functions
 # that may be called in loops or across multiple threads.
 OUTPUT_DIR = os.path.join('.agent', 'research', 'yt-transcripts')
 
+# Batch runs are bounded so a large playlist dump doesn't open hundreds of sockets at once
+# and trip YouTube's anti-bot throttling.
+DEFAULT_WORKERS = 4
+
+# Async engine defaults. The per-host bucket is the real throttle guard: the concurrency cap
+# only bounds in-flight work, while the bucket bounds how fast new fetch calls hit one host.
+# A token is one fetch call (a metadata scrape, or one transcript attempt), and a transcript
+# attempt makes several HTTP requests, so HTTP requests/sec run a few times HOST_RATE_PER_SEC.
+ASYNC_CONCURRENCY = 64
+HOST_RATE_PER_SEC = 5.0
+HOST_BURST = 10
+MAX_RETRIES = 4
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 30.0
+# youtube_transcript_api talks to the watch/innertube endpoints on this host.
+TRANSCRIPT_HOST = "www.youtube.com"
+
+# Raw transcripts are cached outside OUTPUT_DIR so the research folder stays human-readable.
+# Captions of published videos rarely change, so a week-long TTL trades very little freshness
+# for skipping the network on every repeat request.
+CACHE_DIR = os.path.join('.agent', 'research', '.yt-cache')
+CACHE_TTL_SECONDS = 7 * 24 * 3600
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Document-frequency index over the exported corpus; lives next to the transcripts it describes.
+KEYWORD_INDEX_FILENAME = ".keyword-index.json"
+
+# Term -> (video, block start) postings for timestamp-level search; SQLite so a query reads
+# only the postings for its terms instead of the whole corpus.
+SEARCH_INDEX_FILENAME = ".search-index.sqlite"
+SEARCH_RESULT_LIMIT = 10
+
+# Video ID -> export file name and the block options it was cut with. Output names come from
+# the title, which needs a network round trip; this lets a repeat request with the same block
+# options find the existing file without one.
+EXPORT_MANIFEST_FILENAME = ".exports.json"
+
+# Saved transcripts handed to a reprocess worker per task: enough to amortize the IPC round trip,
+# few enough that one slow chunk doesn't leave the other cores idle at the end.
+REPROCESS_CHUNK_SIZE = 8
+
+# Optional machine-readable copy of an export: one JSON line of metadata, then one per block.
+SIDECAR_EXTENSION = ".jsonl"
+
+# Pipeline stages timed by RunProfile, in pipeline order.
+PROFILE_STAGES = ("fetch_metadata", "fetch_transcript_raw", "group_blocks", "extract_keywords", "save_markdown")
+
+# --log sends a run summary through lofi-gate's ledger logger.
+LOFI_GATE_LOGGER = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'lofi-gate', 'scripts', 'logger.py')
+
+# Snippets are grouped into paragraphs of this many seconds unless --interval says otherwise.
+DEFAULT_BLOCK_INTERVAL = 60.0
+
+# Segmenter token budgets use the usual ~4 characters per token estimate for English.
+TOKEN_CHARS = 4
+# Once a block is this full, a token budget cuts at the next sentence end rather than
+# running on to the budget and splitting mid-sentence.
+SENTENCE_CUT_FILL = 0.5
+SENTENCE_END_CHARS = ".?!"
+
+# Chapter lists as pasted from a video description: '0:00 Intro', '1:02:03 - Q&A'.
+CHAPTER_LINE_REGEX = re.compile(r'^\s*(?:(\d+):)?(\d{1,2}):(\d{2})\b')
+KEYWORD_COUNT = 10
+
+DEFAULT_TITLE = "YouTube Transcript"
+DEFAULT_CHANNEL = "Unknown Channel"
+
 # This regex is broad to handle standard watch URLs, short URLs, and embed links. 
 # It captures the 11-char ID which is the unique key for all YouTube API interactions.
 VIDEO_ID_REGEX = re.compile(r"(?:https?:\/\/)?(?:www\.)?(?:youtube\.com\/(?:[^\/\n\s]+\/\S+\/|(?:v|e(?:mbed)?)\/|\S*?[?&]v=)|youtu\.be\/)([a-zA-Z0-9_-]{11})")
@@ -28,10 +139,24 @@ TITLE_REGEX = re.compile(r'<title>(.*?)</title>')
 CHANNEL_META_REGEX = re.compile(r'<link itemprop="name" content="(.*?)">')
 CHANNEL_AUTHOR_REGEX = re.compile(r'"author":"(.*?)"')
 
+# Watch pages are >1 MB but title/channel sit near the top; reading in small chunks lets us
+# hang up long before the inline player JS arrives.
+METADATA_CHUNK_SIZE = 16 * 1024
+
 # File systems are picky about characters like ":" or "?". 
 # Sanitization ensures the script doesn't crash during IO on Windows/Linux.
 FILENAME_SAFE_REGEX = re.compile(r'[<>:"/\\|?*]')
 
+# Inverse of the '### [timestamp](jump_url)' headers written by save_markdown.
+BLOCK_HEADER_REGEX = re.compile(r'^### \[([^\]]*)\]\(([^)]*)\)$', re.M)
+JUMP_SECONDS_REGEX = re.compile(r'[?&]t=(\d+)s')
+
+# Search indexes every word (not just keyword-length ones) so short terms like 'api' are findable.
+SEARCH_TOKEN_REGEX = re.compile(r'\b\w{2,}\b')
+
+# Words shorter than 6 characters are rarely topic-bearing, so they are never counted.
+KEYWORD_REGEX = re.compile(r'\b\w{6,}\b')
+
 # Stopwords are selected to filter out structural/conversational filler.
 # A minimum length of 6 characters is enforced later to focus on technical/unique nouns.
 STOPWORDS = {
@@ -43,7 +168,9 @@ STOPWORDS = {
 
 @dataclass
 class TranscriptBlock:
-    """Represents a logically grouped segment of time (usually 60s)."""
+    """Represents a logically grouped segment of time (DEFAULT_BLOCK_INTERVAL, 60s, unless a Segmenter cuts it)."""
+    # Long videos produce hundreds of blocks; slots drop the per-instance __dict__.
+    __slots__ = ("timestamp", "start", "text")
     timestamp: str
     start: float
     text: str
@@ -61,42 +188,218 @@ class TranscriptData:
     blocks: List[TranscriptBlock] = field(default_factory=list)
     keywords: List[str] = field(default_factory=list)
 
+@dataclass
+class MetadataStats:
+    """Cost of one (or, when accumulated, all) metadata fetches."""
+    bytes_read: int = 0
+    time_to_metadata: float = 0.0
+    # True when both fields were found before EOF, i.e. the connection was cut early.
+    complete: bool = False
+
+class MetadataScanner:
+    """
+    Incremental title/channel extractor for a page that arrives in chunks.
+    A short tail of each chunk is carried into the next scan so a tag split across a
+    chunk boundary is still matched; fields are short, so the tail bounds memory.
+    """
+    CARRY_CHARS = 4096
+
+    def __init__(self):
+        self.title: Optional[str] = None
+        self.channel: Optional[str] = None
+        self._tail = ""
+
+    @property
+    def done(self) -> bool:
+        return self.title is not None and self.channel is not None
+
+    def feed(self, text: str) -> bool:
+        """Scans the next piece of the page. Returns True once both fields are known."""
+        window = self._tail + text
+        if self.title is None:
+            title_match = TITLE_REGEX.search(window)
+            if title_match:
+                self.title = title_match.group(1).replace(" - YouTube", "").strip()
+
+        # Channel names can be in different meta tags depending on the video type (standard vs music).
+        # The schema.org tag wins over JSON-LD style when both are in the same window; otherwise
+        # the first one seen is used, since both carry the same name and waiting would defeat
+        # the early exit.
+        if self.channel is None:
+            channel_match = CHANNEL_META_REGEX.search(window) or CHANNEL_AUTHOR_REGEX.search(window)
+            if channel_match:
+                self.channel = channel_match.group(1).strip()
+
+        self._tail = window[-self.CARRY_CHARS:]
+        return self.done
+
+    def result(self) -> Dict[str, str]:
+        return {
+            "title": DEFAULT_TITLE if self.title is None else self.title,
+            "channel": DEFAULT_CHANNEL if self.channel is None else self.channel,
+        }
+
+class RunProfile:
+    """
+    Stage timings and counters (bytes fetched, snippets, blocks) for one CLI run.
+    Stage time is exclusive: work a stage pulls through a nested one (e.g. the Markdown writer
+    consuming lazily grouped blocks) is charged to the nested stage, so stages never double
+    count. Batch workers add to the same totals, so stage seconds can exceed wall time.
+    """
+    _shared: Optional['RunProfile'] = None
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.seconds = dict.fromkeys(PROFILE_STAGES, 0.0)
+        self.calls = dict.fromkeys(PROFILE_STAGES, 0)
+        self.counters = Counter()
+        self.exports: List[str] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @classmethod
+    def shared(cls) -> 'RunProfile':
+        """Process-wide instance the pipeline reports into."""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    @classmethod
+    def reset(cls) -> 'RunProfile':
+        """Starts a fresh shared profile (main() does this once per run)."""
+        cls._shared = cls()
+        return cls._shared
+
+    @contextlib.contextmanager
+    def stage(self, name: str, count: bool = True):
+        stack = self._local.__dict__.setdefault("stack", [])
+        stack.append(0.0)  # Time spent in stages nested inside this one.
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            nested = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            with self._lock:
+                self.seconds[name] = self.seconds.get(name, 0.0) + elapsed - nested
+                self.calls[name] = self.calls.get(name, 0) + count
+
+    def timed(self, iterable: Iterable, name: str) -> Iterator:
+        """Lazy form of stage(): only the time spent producing items is charged (one call per pass)."""
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name, count=False):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+            yield item
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    def add(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[counter] += amount
+
+    def exported(self, file_path: str) -> None:
+        with self._lock:
+            self.exports.append(file_path)
+
+    def record(self) -> Dict:
+        """The structured record printed by --timings."""
+        with self._lock:
+            return {
+                "total_seconds": round(time.perf_counter() - self.started, 4),
+                "stages": {name: {"seconds": round(self.seconds[name], 4), "calls": self.calls[name]} for name in self.seconds},
+                "counters": dict(self.counters),
+                "exports": list(self.exports),
+            }
+
+    def summary(self) -> str:
+        """One line for the ledger: stage times, then counters."""
+        record = self.record()
+        stages = ", ".join(f"{name} {s['seconds']:.2f}s" for name, s in record["stages"].items() if s["calls"])
+        counters = ", ".join(f"{value:,} {name.replace('_', ' ')}" for name, value in sorted(record["counters"].items()))
+        return " | ".join(part for part in (stages, counters) if part)
+
 class YouTubeClient:
     """
     Handles connectivity to external services.
     Encapsulated to allow for future proxy support or alternative scraping methods.
     """
-    def __init__(self):
+    def __init__(self, pool_size: int = DEFAULT_WORKERS):
         # A requests.Session reuses the underlying TCP connection (keep-alive).
         # This significantly speeds up multiple metadata fetches or redirect handling.
         self.session = requests.Session()
         self.session.headers.update({"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"})
+        # The default adapter keeps only 10 idle connections per host; sizing it to the worker
+        # pool (x2: metadata + transcript) lets every batch worker reuse a warm connection
+        # instead of discarding it and paying a fresh TLS handshake.
+        adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=max(10, pool_size * 2))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.hooks["response"].append(self._count_bytes)
+        # The transcript API shares our session so its requests ride the same keep-alive pool.
+        self.transcript_api = youtube_transcript_api.YouTubeTranscriptApi(http_client=self.session)
+        # Running counters across all metadata fetches (batch workers share this client).
+        self._stats_lock = threading.Lock()
+        self.metadata_totals = MetadataStats()
+        self.metadata_fetches = 0
 
     def fetch_metadata(self, url: str) -> Dict[str, str]:
         """
         Scrapes video title and channel name. 
         Metadata failure is designated as NON-FATAL; the transcript is the primary goal.
         """
+        profile = RunProfile.shared()
+        with profile.stage("fetch_metadata"):
+            metadata, stats = self.fetch_metadata_with_stats(url)
+        profile.add("bytes_fetched", stats.bytes_read)
+        return metadata
+
+    @staticmethod
+    def _count_bytes(response, *args, **kwargs):
+        # Streamed bodies (the metadata scrape) are counted by their reader, which stops early.
+        if not kwargs.get("stream"):
+            RunProfile.shared().add("bytes_fetched", len(response.content))
+
+    def fetch_metadata_with_stats(self, url: str):
+        """
+        Streams the watch page and stops reading as soon as title and channel are known.
+        Returns (metadata, MetadataStats) so callers can verify bandwidth/latency savings;
+        per-call stats are also accumulated into `self.metadata_totals`.
+        """
+        stats = MetadataStats()
+        started = time.perf_counter()
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            html = response.text
-            
-            title = "YouTube Transcript"
-            title_match = TITLE_REGEX.search(html)
-            if title_match:
-                title = title_match.group(1).replace(" - YouTube", "").strip()
-            
-            # Channel names can be in different meta tags depending on the video type (standard vs music).
-            # We try the standard schema.org tag first, then fallback to JSON-LD style.
-            channel = "Unknown Channel"
-            channel_match = CHANNEL_META_REGEX.search(html) or CHANNEL_AUTHOR_REGEX.search(html)
-            if channel_match:
-                channel = channel_match.group(1).strip()
-                
-            return {"title": title, "channel": channel}
+            # stream=True defers the body download; closing early drops the rest of the page
+            # instead of draining it into memory.
+            response = self.session.get(url, timeout=10, stream=True)
+            try:
+                response.raise_for_status()
+                decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+                scanner = MetadataScanner()
+                for chunk in response.iter_content(chunk_size=METADATA_CHUNK_SIZE):
+                    stats.bytes_read += len(chunk)
+                    if scanner.feed(decoder.decode(chunk)):
+                        stats.complete = True
+                        break
+                else:
+                    scanner.feed(decoder.decode(b'', final=True))
+            finally:
+                response.close()
+            metadata = scanner.result()
         except Exception:
-            return {"title": "YouTube Transcript", "channel": "Unknown Channel"}
+            metadata = {"title": DEFAULT_TITLE, "channel": DEFAULT_CHANNEL}
+
+        stats.time_to_metadata = time.perf_counter() - started
+        with self._stats_lock:
+            self.metadata_totals.bytes_read += stats.bytes_read
+            self.metadata_totals.time_to_metadata += stats.time_to_metadata
+            self.metadata_fetches += 1
+        return metadata, stats
 
     def fetch_transcript_raw(self, video_id: str) -> List:
         """
@@ -105,53 +408,528 @@ class YouTubeClient:
         rather than exposing the user to technical Python stack traces.
         """
         try:
-            return YouTubeTranscriptApi().fetch(video_id)
-        except TranscriptsDisabled:
-            raise Exception("ERROR: Transcripts are disabled for this video (Owner choice).")
-        except NoTranscriptFound:
-            raise Exception("ERROR: No transcript was found for this video in the requested language.")
-        except VideoUnavailable:
-            raise Exception("ERROR: This video is unavailable (Private, Deleted, or Region-Locked).")
-        except CouldNotRetrieveTranscript:
-            raise Exception("ERROR: Could not fetch the transcript (Network block or anti-bot).")
+            return self.request_transcript(video_id)
         except Exception as e:
-            raise Exception(f"ERROR: Unexpected API failure: {str(e)}")
+            raise map_transcript_error(e)
+
+    def request_transcript(self, video_id: str) -> List:
+        """Unmapped library call; raises youtube_transcript_api's own exception types so retry logic can classify them."""
+        with RunProfile.shared().stage("fetch_transcript_raw"):
+            return self.transcript_api.fetch(video_id)
+
+def map_transcript_error(e: Exception) -> Exception:
+    """Single source of the human-readable error messages, shared by the sync and async paths."""
+    api = youtube_transcript_api
+    if isinstance(e, api.TranscriptsDisabled):
+        return Exception("ERROR: Transcripts are disabled for this video (Owner choice).")
+    if isinstance(e, api.NoTranscriptFound):
+        return Exception("ERROR: No transcript was found for this video in the requested language.")
+    if isinstance(e, api.VideoUnavailable):
+        return Exception("ERROR: This video is unavailable (Private, Deleted, or Region-Locked).")
+    if isinstance(e, api.CouldNotRetrieveTranscript):
+        return Exception("ERROR: Could not fetch the transcript (Network block or anti-bot).")
+    return Exception(f"ERROR: Unexpected API failure: {str(e)}")
+
+def is_transient_error(e: Exception) -> bool:
+    """
+    Throttling, HTTP failures and dropped connections can succeed on retry.
+    Owner/availability errors (disabled, not found, private) never will, so they fail fast.
+    """
+    api = youtube_transcript_api
+    return isinstance(e, (api.RequestBlocked, api.YouTubeRequestFailed, requests.ConnectionError, requests.Timeout))
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens/sec refill, up to `capacity` for short bursts."""
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = None
+        self._loop = None
+
+    async def acquire(self) -> None:
+        # An asyncio.Lock belongs to one event loop, and every AsyncFetchEngine.run is a new
+        # asyncio.run, so the lock is made inside the loop that first needs it.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._lock, self._loop = asyncio.Lock(), loop
+        # Holding the lock while sleeping makes waiters queue FIFO instead of stampeding on refill.
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class AsyncFetchEngine:
+    """
+    Keeps many videos in flight behind a global concurrency cap and a per-host token bucket,
+    retrying transient transcript failures with jittered exponential backoff.
+    The underlying client is synchronous (requests / youtube_transcript_api), so blocking calls
+    run on a thread pool sized to the cap; asyncio only orchestrates admission and retries.
+    Errors are mapped with map_transcript_error, so results match the sync path exactly.
+    """
+    def __init__(self, client: Optional[YouTubeClient] = None, concurrency: int = ASYNC_CONCURRENCY,
+                 rate: float = HOST_RATE_PER_SEC, burst: float = HOST_BURST, max_retries: int = MAX_RETRIES,
+                 backoff_base: float = BACKOFF_BASE_SECONDS, backoff_max: float = BACKOFF_MAX_SECONDS):
+        self.concurrency = max(1, concurrency)
+        self.client = client or YouTubeClient(pool_size=self.concurrency)
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retries = 0
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def _bucket(self, host: str) -> TokenBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self.rate, self.burst)
+        return bucket
+
+    def backoff_delay(self, attempt: int) -> float:
+        """'Full jitter' backoff: spreads retries so throttled workers don't return in lockstep."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def _call(self, host: str, fn, *args):
+        await self._bucket(host).acquire()
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def fetch_metadata(self, url: str) -> Dict[str, str]:
+        # fetch_metadata is already NON-FATAL, so there is nothing to retry.
+        return await self._call(urlparse(url).hostname or TRANSCRIPT_HOST, self.client.fetch_metadata, url)
+
+    async def fetch_transcript(self, video_id: str) -> List:
+        attempt = 0
+        while True:
+            try:
+                return await self._call(TRANSCRIPT_HOST, self.client.request_transcript, video_id)
+            except Exception as e:
+                if attempt >= self.max_retries or not is_transient_error(e):
+                    raise map_transcript_error(e)
+                await asyncio.sleep(self.backoff_delay(attempt))
+                attempt += 1
+                self.retries += 1
+
+    async def fetch_video(self, url: str, video_id: str) -> Tuple[Dict[str, str], List]:
+        async with self._semaphore:
+            return await asyncio.gather(self.fetch_metadata(url), self.fetch_transcript(video_id))
+
+    async def _run(self, jobs, on_fetched):
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        # x2: metadata and transcript of one video run side by side.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.concurrency * 2) as self._executor:
+            async def one(url, video_id):
+                try:
+                    metadata, raw = await self.fetch_video(url, video_id)
+                except Exception as e:
+                    return e
+                # Processing/export is CPU + disk work; keep it off the event loop.
+                return await asyncio.get_running_loop().run_in_executor(self._executor, on_fetched, url, video_id, metadata, raw)
+            return await asyncio.gather(*(one(url, video_id) for url, video_id in jobs), return_exceptions=True)
+
+    def run(self, jobs: List[Tuple[str, str]], on_fetched) -> List:
+        """
+        Fetches every (url, video_id) job and hands each result to `on_fetched(url, video_id, metadata, raw)`
+        on a worker thread. Returns, in job order, either on_fetched's return value or the Exception raised.
+        """
+        return asyncio.run(self._run(jobs, on_fetched))
+
+def iter_snippets(raw_data: List):
+    """Yields (start, text) pairs from either snippet shape."""
+    for snippet in raw_data:
+        # We support both object-style (new API) and dict-style (mocks/older API/cache)
+        # to remain backwards compatible and testable.
+        try:
+            yield snippet.start, snippet.text
+        except AttributeError:
+            yield snippet['start'], snippet['text']
+
+class CompactTranscript:
+    """
+    Array-backed snippet container: start times and durations in typed arrays and all
+    (stripped) snippet text in one space-joined buffer with offsets, instead of one Python
+    object per 1-3 word caption. Both input shapes are normalized once here, so grouping
+    never re-dispatches per snippet, and a block's text is a single slice of the buffer.
+    """
+    __slots__ = ("starts", "text", "offsets", "durations", "is_sorted")
+
+    def __init__(self, starts: array, text: str, offsets: array, durations: Optional[array] = None):
+        self.starts = starts
+        self.text = text
+        # offsets[i] is where snippet i begins; the sentinel offsets[n] == len(text) + 1 lets
+        # snippet i (and any run a..b) end at offsets[end] - 1 without a special case.
+        self.offsets = offsets
+        # NaN where a snippet has no duration (older cache entries); NaN never opens a caption gap.
+        self.durations = durations if durations is not None else array('d', [math.nan]) * len(starts)
+        self.is_sorted = all(map(operator.le, starts, itertools.islice(starts, 1, None)))
+
+    @classmethod
+    def from_snippets(cls, raw_data: Iterable) -> 'CompactTranscript':
+        if isinstance(raw_data, cls):
+            return raw_data
+        if not isinstance(raw_data, list):
+            return cls.from_iterable(raw_data)
+        items = raw_data
+        # Shape is decided once from the first snippet; mixed-shape input takes the slower
+        # per-snippet path rather than failing.
+        try:
+            if items and isinstance(items[0], dict):
+                starts = array('d', [s['start'] for s in items])
+                texts = [s['text'].strip() for s in items]
+                durations = array('d', [s.get('duration', math.nan) for s in items])
+            else:
+                starts = array('d', [s.start for s in items])
+                texts = [s.text.strip() for s in items]
+                durations = array('d', [getattr(s, 'duration', math.nan) for s in items])
+        except (AttributeError, KeyError, TypeError):
+            pairs = list(iter_snippets(items))
+            starts = array('d', [start for start, _ in pairs])
+            texts = [text.strip() for _, text in pairs]
+            durations = None
+        offsets = array('Q', itertools.accumulate((len(t) + 1 for t in texts), initial=0))
+        return cls(starts, " ".join(texts), offsets, durations)
+
+    @classmethod
+    def from_iterable(cls, raw_data: Iterable) -> 'CompactTranscript':
+        """
+        One pass over a one-shot iterable: only the typed arrays and the text buffer grow,
+        so no list of snippets (or of their texts) is held alongside them.
+        """
+        starts, durations, offsets = array('d'), array('d'), array('Q', [0])
+        buffer = io.StringIO()
+        for snippet in raw_data:
+            if isinstance(snippet, dict):
+                start, text, duration = snippet['start'], snippet['text'], snippet.get('duration', math.nan)
+            else:
+                start, text, duration = snippet.start, snippet.text, getattr(snippet, 'duration', math.nan)
+            text = text.strip()
+            if starts:
+                buffer.write(" ")
+            buffer.write(text)
+            starts.append(start)
+            durations.append(duration)
+            offsets.append(offsets[-1] + len(text) + 1)
+        return cls(starts, buffer.getvalue(), offsets, durations)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self):
+        """Yields dict-shaped snippets, so the container is accepted anywhere raw data is."""
+        for i in range(len(self.starts)):
+            snippet = {"start": self.starts[i], "text": self.text[self.offsets[i]:self.offsets[i + 1] - 1]}
+            if not math.isnan(self.durations[i]):
+                snippet["duration"] = self.durations[i]
+            yield snippet
+
+    def block(self, a: int, b: int) -> TranscriptBlock:
+        """The block made of snippets a..b-1."""
+        return TranscriptBlock(
+            timestamp=TranscriptProcessor.format_seconds(self.starts[a]),
+            start=self.starts[a],
+            text=self.text[self.offsets[a]:self.offsets[b] - 1]
+        )
+
+    def iter_blocks(self, interval: float = DEFAULT_BLOCK_INTERVAL) -> Iterator[TranscriptBlock]:
+        """
+        Same blocks as TranscriptProcessor's snippet loop. For time-ordered captions (the normal
+        case) each block boundary is found by bisecting the start array, so the work is per
+        block rather than per snippet; out-of-order input falls back to a linear scan.
+        """
+        starts, n = self.starts, len(self.starts)
+        a = 0
+        while a < n:
+            bucket = int(starts[a] // interval)
+            if self.is_sorted:
+                b = bisect.bisect_left(starts, (bucket + 1) * interval, a + 1)
+                # Float rounding of (bucket + 1) * interval can be off by one snippet either way.
+                while b < n and int(starts[b] // interval) <= bucket:
+                    b += 1
+                while b > a + 1 and int(starts[b - 1] // interval) > bucket:
+                    b -= 1
+            else:
+                b = a + 1
+                while b < n and int(starts[b] // interval) <= bucket:
+                    b += 1
+            yield self.block(a, b)
+            a = b
+
+class SegmentRule(abc.ABC):
+    """
+    One reason to end a block. cut(t, a, i) says whether snippet i starts a new block when the
+    current block began at snippet a. Rules only look at the arrays around a and i, never
+    back over the block, so a Segmenter stays a single linear pass.
+    """
+    @abc.abstractmethod
+    def cut(self, t: CompactTranscript, a: int, i: int) -> bool:
+        ...
+
+    @property
+    @abc.abstractmethod
+    def spec(self) -> str:
+        """The rule and its settings as a short string, recorded in the export manifest."""
+
+class IntervalRule(SegmentRule):
+    """Fixed time buckets, as in iter_blocks: a new block at every `interval`-second boundary."""
+    def __init__(self, interval: float = DEFAULT_BLOCK_INTERVAL):
+        self.interval = interval
+
+    def cut(self, t: CompactTranscript, a: int, i: int) -> bool:
+        return int(t.starts[i] // self.interval) > int(t.starts[a] // self.interval)
+
+    @property
+    def spec(self) -> str:
+        return f"interval={self.interval:g}"
+
+class MaxDurationRule(SegmentRule):
+    """
+    A new block once the current one spans `max_seconds`, measured from its own first
+    snippet rather than the clock, so it bounds content-driven blocks without moving their cuts.
+    """
+    def __init__(self, max_seconds: float = DEFAULT_BLOCK_INTERVAL):
+        self.max_seconds = max_seconds
+
+    def cut(self, t: CompactTranscript, a: int, i: int) -> bool:
+        return t.starts[i] - t.starts[a] >= self.max_seconds
+
+    @property
+    def spec(self) -> str:
+        return f"max={self.max_seconds:g}"
+
+class CaptionGapRule(SegmentRule):
+    """A new block after at least `min_gap` seconds of silence (no caption on screen)."""
+    def __init__(self, min_gap: float):
+        self.min_gap = min_gap
+
+    def cut(self, t: CompactTranscript, a: int, i: int) -> bool:
+        # Unknown durations are NaN, and NaN compares False, so they never open a gap.
+        return t.starts[i] - (t.starts[i - 1] + t.durations[i - 1]) >= self.min_gap
+
+    @property
+    def spec(self) -> str:
+        return f"gap={self.min_gap:g}"
+
+class TokenBudgetRule(SegmentRule):
+    """
+    Keeps blocks under `max_tokens` (estimated from characters). Past SENTENCE_CUT_FILL of the
+    budget it cuts at the first sentence end instead, so most blocks end on a full stop.
+    """
+    def __init__(self, max_tokens: int):
+        self.max_chars = max_tokens * TOKEN_CHARS
+
+    def cut(self, t: CompactTranscript, a: int, i: int) -> bool:
+        # Block a..i-1 ends at offsets[i] - 1; offsets[i] - 2 is its last character.
+        size = t.offsets[i] - t.offsets[a] - 1
+        if size + t.offsets[i + 1] - t.offsets[i] > self.max_chars:
+            return True
+        return size >= self.max_chars * SENTENCE_CUT_FILL and t.text[t.offsets[i] - 2] in SENTENCE_END_CHARS
+
+    @property
+    def spec(self) -> str:
+        return f"tokens={self.max_chars // TOKEN_CHARS}"
+
+class ChapterRule(SegmentRule):
+    """A new block at every chapter start, so no block straddles two chapters."""
+    def __init__(self, chapter_starts: Iterable[float]):
+        self.chapter_starts = sorted(chapter_starts)
+
+    def cut(self, t: CompactTranscript, a: int, i: int) -> bool:
+        k = bisect.bisect_right(self.chapter_starts, t.starts[a])
+        return k < len(self.chapter_starts) and self.chapter_starts[k] <= t.starts[i]
+
+    @property
+    def spec(self) -> str:
+        return "chapters=" + ",".join(f"{start:g}" for start in self.chapter_starts)
+
+    @staticmethod
+    def parse(lines: Iterable[str]) -> List[float]:
+        """Chapter start seconds from description-style lines; lines without a timestamp are skipped."""
+        starts = []
+        for line in lines:
+            match = CHAPTER_LINE_REGEX.match(line)
+            if match:
+                hours, minutes, seconds = (int(g or 0) for g in match.groups())
+                starts.append(float(hours * 3600 + minutes * 60 + seconds))
+        return starts
+
+class Segmenter:
+    """
+    Pluggable block segmentation: cuts a transcript wherever any of its rules says so, in one
+    pass over the snippets. Rules compose, e.g. chapters + caption gaps + a token budget gives
+    blocks that never straddle a chapter, prefer pauses, and never outgrow the budget.
+    """
+    def __init__(self, rules: Iterable[SegmentRule]):
+        self.rules = list(rules)
+
+    @classmethod
+    def from_options(cls, interval: Optional[float] = None, min_gap: Optional[float] = None,
+                     max_tokens: Optional[int] = None, chapter_starts: Optional[List[float]] = None) -> Optional['Segmenter']:
+        """
+        The segmenter for the CLI options, or None when only fixed intervals are asked for,
+        which CompactTranscript.iter_blocks handles faster by bisecting.
+        `interval` then caps how long a block may run (default DEFAULT_BLOCK_INTERVAL), so a
+        long stretch without a gap, sentence end or chapter still can't become one huge block;
+        `interval=0` turns the cap off.
+        """
+        rules = []
+        if chapter_starts:
+            rules.append(ChapterRule(chapter_starts))
+        if min_gap is not None:
+            rules.append(CaptionGapRule(min_gap))
+        if max_tokens is not None:
+            rules.append(TokenBudgetRule(max_tokens))
+        if not rules:
+            return None
+        if interval != 0:
+            rules.append(MaxDurationRule(DEFAULT_BLOCK_INTERVAL if interval is None else interval))
+        return cls(rules)
+
+    @staticmethod
+    def spec_for(interval: float = DEFAULT_BLOCK_INTERVAL, segmenter: Optional['Segmenter'] = None) -> str:
+        """How blocks are cut, as recorded in the export manifest: the segmenter's rules, or the interval."""
+        rules = segmenter.rules if segmenter else [IntervalRule(interval)]
+        return "+".join(rule.spec for rule in rules)
+
+    def segment(self, raw_data: Iterable) -> Iterator[TranscriptBlock]:
+        t = CompactTranscript.from_snippets(raw_data)
+        cuts = [rule.cut for rule in self.rules]
+        n = len(t)
+        a = 0
+        for i in range(1, n):
+            for cut in cuts:
+                if cut(t, a, i):
+                    yield t.block(a, i)
+                    a = i
+                    break
+        if n:
+            yield t.block(a, n)
+
+class TranscriptCache:
+    """
+    On-disk cache of raw snippets + metadata, one JSON file per 11-char video ID.
+    A hit returns everything export_video needs, so no network call is made at all.
+    Entries expire after `ttl` seconds; once the directory exceeds `max_bytes`, the
+    least-recently-used entries (by mtime, bumped on every hit) are evicted.
+    """
+    def __init__(self, cache_dir: str = CACHE_DIR, ttl: float = CACHE_TTL_SECONDS,
+                 max_bytes: int = CACHE_MAX_BYTES, refresh: bool = False):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        # Refresh mode never reads, but still writes, so the next normal run hits.
+        self.refresh = refresh
+
+    def _path(self, video_id: str) -> str:
+        return os.path.join(self.cache_dir, f"{video_id}.json")
+
+    def get(self, video_id: str) -> Optional[Dict]:
+        """Returns {"title", "channel", "snippets"} or None on miss/expiry/corruption."""
+        if self.refresh:
+            return None
+        path = self._path(video_id)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - entry.get("fetched_at", 0) > self.ttl:
+            self._remove(path)
+            return None
+
+        # Touch for LRU ordering. A failure here only skews eviction order.
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return entry
+
+    def put(self, video_id: str, metadata: Dict[str, str], raw_data: List) -> None:
+        """Stores a fetch result. Cache write failures are NON-FATAL; the export still succeeds."""
+        entry = {
+            "video_id": video_id,
+            "fetched_at": time.time(),
+            "title": metadata['title'],
+            "channel": metadata['channel'],
+            # Durations are kept for caption-gap segmentation.
+            "snippets": list(CompactTranscript.from_snippets(raw_data)),
+        }
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Temp file + rename keeps readers (e.g. other batch workers) from seeing partial JSON.
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, self._path(video_id))
+            self._evict()
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
 
 class TranscriptProcessor:
     """Handles pure logic transformations. No IO occurs here."""
     
     @staticmethod
-    def group_blocks(raw_data: List) -> List[TranscriptBlock]:
+    def iter_blocks(raw_data: Iterable, interval: float = DEFAULT_BLOCK_INTERVAL) -> Iterator[TranscriptBlock]:
         """
-        Aggregates fragmented snippets into coherent 'paragraphs' by minute. 
+        Aggregates fragmented snippets into coherent 'paragraphs' of `interval` seconds.
         This is a 'readability' bridge: YouTube snippets are often 1-3 words, 
         which is difficult for both humans and AI to ingest effectively.
+        Blocks are yielded as soon as they close, so only one block is ever buffered.
+        A CompactTranscript takes its own bisecting fast path.
         """
-        blocks = []
+        if isinstance(raw_data, CompactTranscript):
+            yield from raw_data.iter_blocks(interval)
+            return
+
         current_interval = -1
         current_text = []
         current_start = 0
 
-        for snippet in raw_data:
-            # We support both object-style (new API) and dict-style (mocks/older API) 
-            # to remain backwards compatible and testable.
-            try:
-                start_time = snippet.start
-                text = snippet.text
-            except AttributeError:
-                start_time = snippet['start']
-                text = snippet['text']
-
-            interval = int(start_time // 60)
+        for start_time, text in iter_snippets(raw_data):
+            bucket = int(start_time // interval)
 
-            if interval > current_interval:
+            if bucket > current_interval:
                 if current_text:
-                    blocks.append(TranscriptBlock(
+                    yield TranscriptBlock(
                         timestamp=TranscriptProcessor.format_seconds(current_start),
                         start=current_start,
                         text=" ".join(current_text)
-                    ))
-                current_interval = interval
+                    )
+                current_interval = bucket
                 current_start = start_time
                 current_text = [text.strip()]
             else:
@@ -159,12 +937,18 @@ class TranscriptProcessor:
 
         # Cleanup: Don't forget the final trailing paragraph
         if current_text:
-            blocks.append(TranscriptBlock(
+            yield TranscriptBlock(
                 timestamp=TranscriptProcessor.format_seconds(current_start),
                 start=current_start,
                 text=" ".join(current_text)
-            ))
-        return blocks
+            )
+
+    @staticmethod
+    def group_blocks(raw_data: List, interval: float = DEFAULT_BLOCK_INTERVAL,
+                     segmenter: Optional[Segmenter] = None) -> List[TranscriptBlock]:
+        """Materialized form of iter_blocks (by minute unless `interval` or a `segmenter` says otherwise)."""
+        transcript = CompactTranscript.from_snippets(raw_data)
+        return list(segmenter.segment(transcript) if segmenter else transcript.iter_blocks(interval))
 
     @staticmethod
     def format_seconds(seconds: float) -> str:
@@ -176,50 +960,576 @@ class TranscriptProcessor:
             return f"{seconds // 3600:02d}:{(seconds % 3600) // 60:02d}:{seconds % 60:02d}"
 
     @staticmethod
-    def extract_keywords(text: str, count: int = 10) -> List[str]:
+    def extract_keywords(text: str, count: int = KEYWORD_COUNT) -> List[str]:
         """
         Local frequency analysis to provide context without external AI cost.
         Longer words are targeted as they are statistically more likely to be 
         specific nouns, terms, or tech stacks rather than grammar fillers.
         """
-        words = re.findall(r'\b\w{6,}\b', text.lower())
-        filtered = [w for w in words if w not in STOPWORDS]
-        return [word for word, _ in Counter(filtered).most_common(count)]
+        counter = KeywordCounter()
+        counter.update(text)
+        return counter.most_common(count)
+
+class KeywordCounter:
+    """
+    Incremental form of extract_keywords: feed text piece by piece (e.g. per block) and
+    get the same ranking as one pass over the joined text, without ever holding that text.
+    """
+    def __init__(self):
+        self.counts = Counter()
+
+    def update(self, text: str) -> None:
+        words = KEYWORD_REGEX.findall(text.lower())
+        self.counts.update(w for w in words if w not in STOPWORDS)
+
+    def most_common(self, count: int = KEYWORD_COUNT) -> List[str]:
+        return [word for word, _ in self.counts.most_common(count)]
+
+    def tap(self, blocks: Iterable[TranscriptBlock]) -> Iterator[TranscriptBlock]:
+        """Passes blocks through unchanged while counting their words."""
+        for block in blocks:
+            self.update(block.text)
+            yield block
+
+class CorpusIndex:
+    """
+    Persistent document-frequency index over every exported transcript.
+    Raw per-video frequency ranks words like 'function' or 'example' first because every
+    talk uses them; weighting by IDF against the corpus surfaces what is specific to *this* video.
+    Per-document term sets are kept so a re-export replaces, rather than double-counts, its terms.
+    """
+    _shared: Dict[str, 'CorpusIndex'] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path: str):
+        self.path = path
+        self.docs: Dict[str, List[str]] = {}
+        self.df = Counter()
+        self.dirty = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def default_path() -> str:
+        return os.path.join(OUTPUT_DIR, KEYWORD_INDEX_FILENAME)
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> 'CorpusIndex':
+        """A missing or corrupt index loads empty; ranking then degrades to plain frequency."""
+        index = cls(path or cls.default_path())
+        try:
+            with open(index.path, 'r', encoding='utf-8') as f:
+                index.docs = json.load(f).get("docs", {})
+        except (OSError, ValueError):
+            index.docs = {}
+        for terms in index.docs.values():
+            index.df.update(terms)
+        return index
+
+    @classmethod
+    def shared(cls, path: Optional[str] = None) -> 'CorpusIndex':
+        """Process-wide instance, so a batch loads the index once and saves it once."""
+        path = path or cls.default_path()
+        with cls._shared_lock:
+            if path not in cls._shared:
+                cls._shared[path] = cls.load(path)
+            return cls._shared[path]
+
+    def update(self, doc_key: str, terms: Iterable[str]) -> None:
+        terms = sorted(set(terms))
+        with self._lock:
+            for term in self.docs.get(doc_key, []):
+                self.df[term] -= 1
+                if self.df[term] <= 0:
+                    del self.df[term]
+            self.docs[doc_key] = terms
+            self.df.update(terms)
+            self.dirty = True
+
+    def idf(self, term: str) -> float:
+        # Smoothed IDF: never zero, so a one-document corpus still ranks by frequency.
+        return math.log((1 + len(self.docs)) / (1 + self.df.get(term, 0))) + 1
+
+    def rank(self, counts: Counter, count: int = KEYWORD_COUNT) -> List[str]:
+        """Top terms by TF-IDF. Ties keep first-seen order, matching Counter.most_common."""
+        with self._lock:
+            ranked = sorted(counts.items(), key=lambda item: -item[1] * self.idf(item[0]))
+        return [word for word, _ in ranked[:count]]
+
+    def save(self) -> None:
+        with self._lock:
+            if not self.dirty:
+                return
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path) or ".", suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({"version": 1, "docs": self.docs}, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+
+def load_export(file_path: str) -> TranscriptData:
+    """Parses a saved transcript, from its sidecar (exact block starts) when it has one."""
+    if os.path.exists(TranscriptExporter.sidecar_path(file_path)):
+        return TranscriptExporter.load_sidecar(file_path)
+    return TranscriptExporter.load_markdown(file_path)
+
+@dataclass
+class ReprocessStats:
+    """Outcome of reprocess_transcripts. `failed` holds (path, error) for files that were skipped."""
+    count: int = 0
+    rewritten: int = 0
+    workers: int = 1
+    seconds: float = 0.0
+    failed: List[Tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def rate(self) -> float:
+        """Throughput in transcripts per second."""
+        return self.count / self.seconds if self.seconds > 0 else 0.0
+
+# Corpus that reprocess pass 2 ranks against, set once per pool worker by _init_reprocess_worker.
+_reprocess_index: Optional[CorpusIndex] = None
+
+def _init_reprocess_worker(path: str, docs: Dict[str, List[str]]) -> None:
+    global _reprocess_index
+    _reprocess_index = CorpusIndex(path)
+    _reprocess_index.docs = docs
+    for terms in docs.values():
+        _reprocess_index.df.update(terms)
+
+def _count_export_terms(file_path: str) -> Tuple[str, Optional[List[str]], Optional[str]]:
+    """Reprocess pass 1, in a pool worker: parse + tokenize one file. Returns (path, terms, error)."""
+    try:
+        counter = KeywordCounter()
+        for block in load_export(file_path).blocks:
+            counter.update(block.text)
+        return file_path, list(counter.counts), None
+    except Exception as e:
+        return file_path, None, str(e)
+
+def _reexport(file_path: str) -> Tuple[str, Optional[str], bool, Optional[str]]:
+    """
+    Reprocess pass 2, in a pool worker: parse, rank keywords against the corpus, re-export.
+    Returns (path, url, rewritten, error). The export manifest is left to the parent process,
+    since its lock only serializes threads.
+    """
+    try:
+        data = load_export(file_path)
+        counter = KeywordCounter()
+        for block in data.blocks:
+            counter.update(block.text)
+        data.keywords = _reprocess_index.rank(counter.counts)
+        sidecar = os.path.exists(TranscriptExporter.sidecar_path(file_path))
+        _, rewritten = TranscriptExporter.write_markdown(data, data.blocks, file_path, sidecar, record=False)
+        return file_path, data.url, rewritten, None
+    except Exception as e:
+        return file_path, None, False, str(e)
+
+def _reprocess_map(fn, items: List[str], workers: int, chunksize: int, initializer=None, initargs=()) -> Iterator:
+    """Maps `fn` over `items` on a process pool, `chunksize` items per task; in-process for one worker."""
+    if workers == 1:
+        if initializer:
+            initializer(*initargs)
+        yield from map(fn, items)
+        return
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as pool:
+        yield from pool.map(fn, items, chunksize=chunksize)
+
+def reprocess_transcripts(workers: Optional[int] = None, chunksize: int = REPROCESS_CHUNK_SIZE) -> ReprocessStats:
+    """
+    Re-parses every saved transcript, regenerates the corpus index from scratch and re-exports
+    each file with keywords ranked against it (e.g. after a STOPWORDS change).
+    Tokenizing and ranking are CPU-bound, so both passes run on a process pool (one worker per
+    core by default) fed `chunksize` files per task. An unreadable file is recorded in
+    `failed` and skipped; the rest of the corpus is still reprocessed.
+    """
+    started = time.perf_counter()
+    paths = sorted(glob.glob(os.path.join(OUTPUT_DIR, "*.md")))
+    workers = max(1, min(workers or os.cpu_count() or 1, len(paths)))
+    stats = ReprocessStats(workers=workers)
+    index = CorpusIndex(CorpusIndex.default_path())
+
+    # Pass 1: term sets per file for document frequencies; the text is not kept.
+    parsed = []
+    for path, terms, error in _reprocess_map(_count_export_terms, paths, workers, chunksize):
+        if error is not None:
+            stats.failed.append((path, error))
+            continue
+        index.update(os.path.basename(path), terms)
+        parsed.append(path)
+
+    # Pass 2: document frequencies are final, so every file is ranked against the same corpus.
+    # Workers re-parse their files rather than receiving every file's counts from the parent.
+    exports = []
+    for path, url, rewritten, error in _reprocess_map(_reexport, parsed, workers, chunksize,
+                                                      _init_reprocess_worker, (index.path, index.docs)):
+        if error is not None:
+            stats.failed.append((path, error))
+            continue
+        stats.count += 1
+        stats.rewritten += rewritten
+        exports.append((url, path))
+
+    TranscriptExporter.record_exports(exports)
+    index.dirty = True
+    index.save()
+    with CorpusIndex._shared_lock:
+        CorpusIndex._shared[index.path] = index
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+def rebuild_keywords() -> int:
+    """
+    Regenerates the corpus index from scratch and rewrites every saved transcript's keywords
+    against it, in-process. Returns the number of files rewritten.
+    """
+    return reprocess_transcripts(workers=1).rewritten
+
+@dataclass
+class SearchHit:
+    """One ranked block: where to jump and why it ranked."""
+    title: str
+    timestamp: str
+    url: str
+    score: float
+    file: str
+
+class SearchIndex:
+    """
+    On-disk inverted index of term -> (video, block start) postings, kept next to the exports.
+    Lets agents find the exact moment a topic is discussed without reading whole transcripts
+    into context. A re-export replaces that video's postings, so the index never double-counts.
+    Index failures are NON-FATAL; the Markdown export is the primary artifact.
+    """
+    def __init__(self, directory: Optional[str] = None):
+        self.path = os.path.join(directory or OUTPUT_DIR, SEARCH_INDEX_FILENAME)
+
+    def _connect(self) -> sqlite3.Connection:
+        # A connection per operation keeps batch worker threads independent; SQLite's own
+        # locking (with a generous timeout) serializes the writers.
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(
+            "CREATE TABLE IF NOT EXISTS docs (id INTEGER PRIMARY KEY, file TEXT UNIQUE, title TEXT, base_url TEXT);"
+            "CREATE TABLE IF NOT EXISTS postings (term TEXT, doc_id INTEGER, start REAL, tf INTEGER);"
+            "CREATE INDEX IF NOT EXISTS postings_term ON postings (term);"
+            "CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id);"
+        )
+        return conn
+
+    def index_document(self, file_name: str, title: str, base_url: str,
+                       postings: Iterable[Tuple[float, Dict[str, int]]]) -> None:
+        """
+        Replaces the postings for one exported file. `postings` yields (block_start, term_counts)
+        and is consumed once, inside the transaction, so it may stream from disk.
+        """
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    row = conn.execute("SELECT id FROM docs WHERE file = ?", (file_name,)).fetchone()
+                    if row:
+                        doc_id = row[0]
+                        conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+                        conn.execute("UPDATE docs SET title = ?, base_url = ? WHERE id = ?", (title, base_url, doc_id))
+                    else:
+                        doc_id = conn.execute("INSERT INTO docs (file, title, base_url) VALUES (?, ?, ?)",
+                                              (file_name, title, base_url)).lastrowid
+                    conn.executemany(
+                        "INSERT INTO postings (term, doc_id, start, tf) VALUES (?, ?, ?, ?)",
+                        ((term, doc_id, start, tf) for start, counts in postings for term, tf in counts.items())
+                    )
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            pass
+
+    def search(self, query: str, limit: int = SEARCH_RESULT_LIMIT) -> List[SearchHit]:
+        """
+        Ranks blocks by how many query terms they contain, then by summed TF-IDF.
+        Returns [] for an empty query or a missing index.
+        """
+        terms = sorted(set(SEARCH_TOKEN_REGEX.findall(query.lower())))
+        if not terms or not os.path.exists(self.path):
+            return []
+        conn = self._connect()
+        try:
+            total_docs = conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+            placeholders = ",".join("?" * len(terms))
+            rows = conn.execute(
+                f"SELECT term, doc_id, start, tf FROM postings WHERE term IN ({placeholders})", terms
+            ).fetchall()
+            docs = {doc_id: (file, title, base_url) for doc_id, file, title, base_url in
+                    conn.execute("SELECT id, file, title, base_url FROM docs")}
+        finally:
+            conn.close()
+
+        doc_freq = Counter()
+        for term in terms:
+            doc_freq[term] = len({doc_id for t, doc_id, _, _ in rows if t == term})
+
+        blocks: Dict[Tuple[int, float], List] = {}
+        for term, doc_id, start, tf in rows:
+            idf = math.log((1 + total_docs) / (1 + doc_freq[term])) + 1
+            entry = blocks.setdefault((doc_id, start), [0, 0.0])
+            entry[0] += 1
+            entry[1] += (1 + math.log(tf)) * idf
+
+        ranked = sorted(blocks.items(), key=lambda item: (-item[1][0], -item[1][1], item[0]))[:limit]
+        hits = []
+        for (doc_id, start), (_, score) in ranked:
+            file, title, base_url = docs[doc_id]
+            separator = "&" if "?" in base_url else "?"
+            hits.append(SearchHit(
+                title=title,
+                timestamp=TranscriptProcessor.format_seconds(start),
+                url=f"{base_url}{separator}t={int(start)}s",
+                score=round(score, 3),
+                file=file
+            ))
+        return hits
 
 class TranscriptExporter:
     """Formats and writes result to disk."""
+
+    # Batch workers export concurrently; the manifest is a read-modify-write.
+    _manifest_lock = threading.Lock()
     
     @staticmethod
-    def save_markdown(data: TranscriptData) -> str:
+    def save_markdown(data: TranscriptData, file_path: Optional[str] = None, sidecar: bool = False) -> str:
         """
         The Markdown output is designed for 'Dual Consumption':
         - YAML Frontmatter: For automated tools/agents to parse state.
         - Human-readable Body: For the developer to read/scan.
         """
+        return TranscriptExporter.write_markdown(data, data.blocks, file_path, sidecar)[0]
+
+    @staticmethod
+    def write_markdown(data: TranscriptData, blocks: Iterable[TranscriptBlock], file_path: Optional[str] = None,
+                       sidecar: bool = False, record: bool = True, block_spec: Optional[str] = None) -> Tuple[str, bool]:
+        """
+        Streaming form of save_markdown: `blocks` may be a generator and is consumed once.
+        `file_path` overrides the title-derived name (e.g. to rewrite an existing export in place).
+        The body is spooled to a temp file first because the keywords header precedes it;
+        `data.keywords` is read only after `blocks` is exhausted, so a KeywordCounter tap
+        can fill it in. Search postings are spooled the same way and streamed into the index
+        afterwards, so memory stays at one block regardless of video length.
+        With `sidecar`, the same blocks also go to a JSON-lines file next to the Markdown.
+        Both files are replaced atomically, and left untouched when their content is unchanged.
+        `record=False` leaves adding the file to the export manifest to the caller; `block_spec`
+        (see Segmenter.spec_for) is recorded with it.
+        Returns (file_path, rewritten): whether either file's content actually changed.
+        """
+        file_path = file_path or TranscriptExporter.output_path(data)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+        base_url = TranscriptExporter.jump_base_url(data.url)
+        separator = "&" if "?" in base_url else "?"
+
+        with tempfile.TemporaryFile('w+', encoding='utf-8') as body, \
+             tempfile.TemporaryFile('w+', encoding='utf-8') as postings, \
+             (tempfile.TemporaryFile('w+', encoding='utf-8') if sidecar else contextlib.nullcontext()) as lines:
+            first = True
+            for b in blocks:
+                jump_url = f"{base_url}{separator}t={int(b.start)}s"
+                # Interactive headers allow the user to immediately jump to the relevant context.
+                body.write(("" if first else "\n") + f"### [{b.timestamp}]({jump_url})\n\n{b.text}\n")
+                first = False
+                postings.write(json.dumps([b.start, Counter(SEARCH_TOKEN_REGEX.findall(b.text.lower()))]) + "\n")
+                if lines:
+                    lines.write(json.dumps({"start": b.start, "timestamp": b.timestamp, "text": b.text}, ensure_ascii=False) + "\n")
+
+            # Use json.dumps to ensure proper escaping of quotes for YAML values
+            safe_title_yaml = json.dumps(data.title)
+            safe_channel_yaml = json.dumps(data.channel)
+            safe_url_yaml = json.dumps(data.url)
+            safe_keywords_yaml = json.dumps(data.keywords)
+
+            header = (
+                f"---\n"
+                f"title: {safe_title_yaml}\n"
+                f"channel: {safe_channel_yaml}\n"
+                f"url: {safe_url_yaml}\n"
+                f"keywords: {safe_keywords_yaml}\n"
+                f"---\n\n"
+                f"# {data.title}\n\n"
+                f"**Channel:** {data.channel}  \n"
+                f"**Source URL:** {data.url}\n\n"
+                f"---\n\n"
+                f"## 🔑 Top Keywords\n"
+                + ", ".join([f"`{k}`" for k in data.keywords]) + "\n\n"
+                f"---\n\n"
+            )
+
+            rewritten = TranscriptExporter.replace_if_changed(file_path, header, body)
+            if lines:
+                meta = {"title": data.title, "channel": data.channel, "url": data.url, "keywords": data.keywords}
+                rewritten = TranscriptExporter.replace_if_changed(
+                    TranscriptExporter.sidecar_path(file_path), json.dumps(meta, ensure_ascii=False) + "\n", lines
+                ) or rewritten
+
+            postings.seek(0)
+            SearchIndex(os.path.dirname(file_path)).index_document(
+                os.path.basename(file_path), data.title, base_url, (json.loads(line) for line in postings)
+            )
+        if record:
+            TranscriptExporter.record_export(data.url, file_path, block_spec)
+        return file_path, rewritten
+
+    @staticmethod
+    def replace_if_changed(file_path: str, head: str, spool) -> bool:
+        """
+        Writes `head` + the spooled rest to a temp file beside `file_path`, then renames it into
+        place, so readers see the old file or the new one, never half of one. If the existing
+        file already has exactly this content the temp file is dropped instead, so re-exports
+        don't touch mtimes (and sync tools don't see a change). Returns True if it wrote.
+        """
+        tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            spool.seek(0)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(head)
+                shutil.copyfileobj(spool, f)
+            if os.path.isfile(file_path) and filecmp.cmp(tmp_path, file_path, shallow=False):
+                os.remove(tmp_path)
+                RunProfile.shared().add("unchanged_files")
+                return False
+            os.replace(tmp_path, file_path)
+            return True
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+            raise
+
+    @staticmethod
+    def sidecar_path(file_path: str) -> str:
+        return os.path.splitext(file_path)[0] + SIDECAR_EXTENSION
+
+    @staticmethod
+    def load_sidecar(file_path: str) -> TranscriptData:
+        """
+        Loads a transcript from its JSON-lines sidecar (`file_path` may name the .md or the
+        sidecar itself); block starts keep their full precision, unlike load_markdown.
+        """
+        with open(TranscriptExporter.sidecar_path(file_path), 'r', encoding='utf-8') as f:
+            data = TranscriptData(**json.loads(f.readline()))
+            for line in f:
+                block = json.loads(line)
+                data.blocks.append(TranscriptBlock(timestamp=block["timestamp"], start=block["start"], text=block["text"]))
+        return data
+
+    @staticmethod
+    def find_export(video_id: str, directory: Optional[str] = None, block_spec: Optional[str] = None) -> Optional[str]:
+        """
+        Path of an existing export of `video_id` cut with `block_spec` (default: the default
+        interval) per the manifest; None if unknown, cut differently, or since deleted.
+        """
+        directory = directory or OUTPUT_DIR
+        try:
+            with open(os.path.join(directory, EXPORT_MANIFEST_FILENAME), 'r', encoding='utf-8') as f:
+                entry = TranscriptExporter.manifest_entry(json.load(f).get(video_id))
+        except (OSError, ValueError, AttributeError):
+            return None
+        if not entry or entry["blocks"] != (block_spec or Segmenter.spec_for()):
+            return None
+        file_path = os.path.join(directory, entry["file"])
+        return file_path if os.path.isfile(file_path) else None
+
+    @staticmethod
+    def manifest_entry(value) -> Optional[Dict[str, str]]:
+        """A manifest value as {"file", "blocks"}; entries from before block options were recorded used the default."""
+        if isinstance(value, str):
+            return {"file": value, "blocks": Segmenter.spec_for()}
+        if isinstance(value, dict) and isinstance(value.get("file"), str) and isinstance(value.get("blocks"), str):
+            return value
+        return None
+
+    @staticmethod
+    def record_export(url: str, file_path: str, block_spec: Optional[str] = None) -> None:
+        """
+        Adds the video behind `url` to its directory's export manifest.
+        Manifest failure is designated as NON-FATAL; it only costs the fast path next time.
+        """
+        TranscriptExporter.record_exports([(url, file_path)], block_spec)
+
+    @staticmethod
+    def record_exports(exports: List[Tuple[str, str]], block_spec: Optional[str] = None) -> None:
+        """
+        record_export for many (url, file_path) pairs in one manifest write; paths share a directory.
+        Without `block_spec` an existing entry keeps its block options (a rewrite in place keeps
+        the blocks it parsed back), and a new one gets the default.
+        """
+        entries = [(get_video_id(url or ""), file_path) for url, file_path in exports]
+        entries = [(video_id, file_path) for video_id, file_path in entries if video_id]
+        if not entries:
+            return
+        manifest_path = os.path.join(os.path.dirname(entries[0][1]), EXPORT_MANIFEST_FILENAME)
+        with TranscriptExporter._manifest_lock:
+            try:
+                try:
+                    with open(manifest_path, 'r', encoding='utf-8') as f:
+                        manifest = json.load(f)
+                except (OSError, ValueError):
+                    manifest = {}
+                for video_id, file_path in entries:
+                    previous = TranscriptExporter.manifest_entry(manifest.get(video_id))
+                    blocks = block_spec or (previous["blocks"] if previous else Segmenter.spec_for())
+                    manifest[video_id] = {"file": os.path.basename(file_path), "blocks": blocks}
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(manifest_path) or ".", suffix=".tmp")
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(manifest, f, sort_keys=True)
+                os.replace(tmp_path, manifest_path)
+            except (OSError, TypeError, AttributeError):
+                pass
+
+    @staticmethod
+    def output_path(data: TranscriptData) -> str:
+        """Title-derived export path; stable for a given title so re-exports overwrite in place."""
         safe_title = FILENAME_SAFE_REGEX.sub('', data.title).strip()[:200]
         if not safe_title:
              match = VIDEO_ID_REGEX.search(data.url)
              vid_id = match.group(1) if match else "unknown"
              safe_title = f"transcript_{vid_id}"
-        os.makedirs(OUTPUT_DIR, exist_ok=True)
-        file_path = os.path.join(OUTPUT_DIR, f"{safe_title}.md")
-        
-        # Strip existing 't=' parameters (and only 't=', preserving others if possible)
-        # Using [^&#]* to match until the next parameter or fragment
-        from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+        return os.path.join(OUTPUT_DIR, f"{safe_title}.md")
 
-        # Robustly strip 't' parameter using parse/unparse
-        parsed = urlparse(data.url)
+    @staticmethod
+    def load_markdown(file_path: str) -> TranscriptData:
+        """
+        Inverse of save_markdown: recovers frontmatter and blocks from an exported file.
+        Block starts come from the '?t=Ns' jump links, so they are whole seconds.
+        """
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        data = TranscriptData(url="")
+        if content.startswith("---\n"):
+            end = content.find("\n---\n", 4)
+            for line in content[4:end].splitlines():
+                key, _, value = line.partition(": ")
+                if key in ("title", "channel", "url", "keywords"):
+                    setattr(data, key, json.loads(value))
+
+        headers = list(BLOCK_HEADER_REGEX.finditer(content))
+        for i, match in enumerate(headers):
+            text_end = headers[i + 1].start() - 1 if i + 1 < len(headers) else len(content)
+            seconds = JUMP_SECONDS_REGEX.search(match.group(2))
+            data.blocks.append(TranscriptBlock(
+                timestamp=match.group(1),
+                start=float(seconds.group(1)) if seconds else 0.0,
+                text=content[match.end() + 2:text_end].rstrip("\n")
+            ))
+        return data
+
+    @staticmethod
+    def jump_base_url(url: str) -> str:
+        """Source URL with any existing 't=' removed, ready for a fresh '?t=Ns'/'&t=Ns' suffix."""
+        # Robustly strip 't' parameter using parse/unparse, preserving all other parameters.
+        parsed = urlparse(url)
         query_params = parse_qs(parsed.query, keep_blank_values=True)
         if 't' in query_params:
             del query_params['t']
         
-        # Determine the correct separator based on the remaining query
-        # If query params exist, use '?'. If not, the base URL is clean.
-        # But wait, we need to reconstruct the FULL url without 't'.
-        # Rebuilding the query string:
         new_query = urlencode(query_params, doseq=True)
-        base_url = urlunparse((
+        return urlunparse((
             parsed.scheme, 
             parsed.netloc, 
             parsed.path, 
@@ -228,42 +1538,6 @@ class TranscriptExporter:
             parsed.fragment
         ))
 
-        content_lines = []
-        for b in data.blocks:
-            separator = "&" if "?" in base_url else "?"
-            jump_url = f"{base_url}{separator}t={int(b.start)}s"
-            # Interactive headers allow the user to immediately jump to the relevant context.
-            content_lines.append(f"### [{b.timestamp}]({jump_url})\n\n{b.text}\n")
-
-        import json
-        
-        # Use json.dumps to ensure proper escaping of quotes for YAML values
-        safe_title_yaml = json.dumps(data.title)
-        safe_channel_yaml = json.dumps(data.channel)
-        safe_url_yaml = json.dumps(data.url)
-        safe_keywords_yaml = json.dumps(data.keywords)
-        
-        markdown = (
-            f"---\n"
-            f"title: {safe_title_yaml}\n"
-            f"channel: {safe_channel_yaml}\n"
-            f"url: {safe_url_yaml}\n"
-            f"keywords: {safe_keywords_yaml}\n"
-            f"---\n\n"
-            f"# {data.title}\n\n"
-            f"**Channel:** {data.channel}  \n"
-            f"**Source URL:** {data.url}\n\n"
-            f"---\n\n"
-            f"## 🔑 Top Keywords\n"
-            + ", ".join([f"`{k}`" for k in data.keywords]) + "\n\n"
-            f"---\n\n"
-            + "\n".join(content_lines)
-        )
-        
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(markdown)
-        return file_path
-
 def get_video_id(url: str) -> Optional[str]:
     """Ensures input is valid. Returns None if we can't safely proceed."""
     match = VIDEO_ID_REGEX.search(url)
@@ -271,58 +1545,391 @@ def get_video_id(url: str) -> Optional[str]:
     if len(url) == 11 and re.match(r'[a-zA-Z0-9_-]{11}', url): return url
     return None
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python get_transcript.py <youtube_url>")
-        sys.exit(1)
-
-    url = sys.argv[1]
-    video_id = get_video_id(url)
-    if not video_id:
-        # User-friendly validation prevents upstream API errors.
-        print(f"Error: Invalid YouTube URL or Video ID: '{url}'")
-        sys.exit(1)
-
-    client = YouTubeClient()
-    print(f"Fetching metadata and transcript for: {video_id}...")
+def export_video(client: YouTubeClient, url: str, video_id: str,
+                 executor: Optional['concurrent.futures.Executor'] = None,
+                 cache: Optional[TranscriptCache] = None, interval: float = DEFAULT_BLOCK_INTERVAL,
+                 sidecar: bool = False, segmenter: Optional[Segmenter] = None) -> str:
+    """
+    Runs the full fetch -> process -> export chain for one video and returns the saved path.
+    Failures surface as an Exception carrying the human-readable message so callers can
+    decide whether one bad video is fatal (single mode) or just reported (batch mode).
+    """
+    file_path = export_cached(cache, url, video_id, interval, sidecar, segmenter)
+    if file_path:
+        return file_path
+    return fetch_and_export(client, url, video_id, executor, cache, interval, sidecar, segmenter)
 
-    # --- Concurrency Model ---
-    # We use ThreadPoolExecutor because these are I/O bound network requests.
-    # Fetching HTML (Client) and Transcript (API) in parallel shaves ~50% off network latency.
-    with concurrent.futures.ThreadPoolExecutor() as executor:
+def fetch_and_export(client: YouTubeClient, url: str, video_id: str,
+                     executor: Optional['concurrent.futures.Executor'] = None,
+                     cache: Optional[TranscriptCache] = None, interval: float = DEFAULT_BLOCK_INTERVAL,
+                     sidecar: bool = False, segmenter: Optional[Segmenter] = None) -> str:
+    """The network half of export_video: fetches, caches (if `cache`) and exports, skipping the cache lookup."""
+    if executor is not None:
+        # Fetching HTML (Client) and Transcript (API) in parallel shaves ~50% off network latency.
         meta_future = executor.submit(client.fetch_metadata, url)
         transcript_future = executor.submit(client.fetch_transcript_raw, video_id)
-        
-        try:
-            metadata = meta_future.result()
-            raw_transcript = transcript_future.result()
-        except Exception as e:
-            # Re-mapping exceptions to stderr ensures failure is loud and explicit.
-            error_msg = str(e).replace("Exception: ", "")
-            print(error_msg, file=sys.stderr)
-            sys.exit(1)
+        metadata = meta_future.result()
+        raw_transcript = transcript_future.result()
+    else:
+        # Batch workers already run in parallel with each other, so a nested pool would only
+        # oversubscribe the connection pool.
+        metadata = client.fetch_metadata(url)
+        raw_transcript = client.fetch_transcript_raw(video_id)
+
+    store_fetched(cache, video_id, metadata, raw_transcript)
+    return save_transcript(url, metadata, raw_transcript, interval, sidecar, segmenter)
+
+def export_cached(cache: Optional[TranscriptCache], url: str, video_id: str, interval: float = DEFAULT_BLOCK_INTERVAL,
+                  sidecar: bool = False, segmenter: Optional[Segmenter] = None) -> Optional[str]:
+    """
+    The export half of export_video for a cache hit; None on a miss. Needs no client, so a
+    hit never loads the HTTP/transcript libraries.
+    """
+    cached = cache.get(video_id) if cache else None
+    if not cached:
+        return None
+    return save_transcript(url, {"title": cached['title'], "channel": cached['channel']},
+                           cached['snippets'], interval, sidecar, segmenter)
 
+def store_fetched(cache: Optional[TranscriptCache], video_id: str, metadata: Dict[str, str], raw_transcript: List) -> None:
+    # Fallback metadata means the scrape failed; caching it would pin the placeholder title.
+    if cache and metadata['title'] != DEFAULT_TITLE:
+        cache.put(video_id, metadata, raw_transcript)
+
+def save_transcript(url: str, metadata: Dict[str, str], raw_transcript: List,
+                    interval: float = DEFAULT_BLOCK_INTERVAL, sidecar: bool = False,
+                    segmenter: Optional[Segmenter] = None) -> str:
+    """
+    Processing + export half of the chain; shared by every fetch path.
+    Snippets are packed once into a CompactTranscript (typed arrays plus one text buffer), then
+    blocks stream to disk with keywords counted on the way through, so no block list is ever built.
+    Keywords are ranked by TF-IDF against the shared CorpusIndex; callers persist it with save().
+    """
     # --- Processing Chain ---
     try:
-        blocks = TranscriptProcessor.group_blocks(raw_transcript)
-        full_text = " ".join([b.text for b in blocks])
-        keywords = TranscriptProcessor.extract_keywords(full_text)
-        
         # Dataclass initialization encapsulates the entire 'state' of the transcription.
         data = TranscriptData(
-            url=url, 
-            title=metadata['title'], 
-            channel=metadata['channel'],
-            blocks=blocks,
-            keywords=keywords
+            url=url,
+            title=metadata['title'],
+            channel=metadata['channel']
         )
+        profile = RunProfile.shared()
+        # Normalized once up front, so grouping never touches the per-snippet API objects again.
+        with profile.stage("group_blocks", count=False):
+            transcript = CompactTranscript.from_snippets(raw_transcript)
+        counter = KeywordCounter()
+
+        def blocks():
+            segments = segmenter.segment(transcript) if segmenter else transcript.iter_blocks(interval)
+            grouped = profile.timed(segments, "group_blocks")
+            count = 0
+            for block in profile.timed(counter.tap(grouped), "extract_keywords"):
+                count += 1
+                yield block
+            profile.add("snippets", len(transcript))
+            profile.add("blocks", count)
+            with profile.stage("extract_keywords", count=False):
+                # This video joins the corpus before ranking so its own terms count towards DF.
+                index = CorpusIndex.shared()
+                index.update(os.path.basename(TranscriptExporter.output_path(data)), counter.counts.keys())
+                data.keywords = index.rank(counter.counts, KEYWORD_COUNT)
 
         # --- Export ---
-        file_path = TranscriptExporter.save_markdown(data)
-        print(f"Success! Transcript saved to: {file_path}")
+        with profile.stage("save_markdown"):
+            return TranscriptExporter.write_markdown(data, blocks(), sidecar=sidecar,
+                                                     block_spec=Segmenter.spec_for(interval, segmenter))[0]
+    except Exception as e:
+        raise Exception(f"ERROR: Processing failure: {e}")
+
+@dataclass
+class BatchResult:
+    """Outcome of one video in a batch run. Exactly one of file_path / error is set."""
+    url: str
+    video_id: Optional[str]
+    file_path: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+def read_batch_inputs(urls: List[str], input_file: Optional[str] = None) -> List[str]:
+    """
+    Collects URLs/IDs from CLI args and an optional file ('-' means stdin), one per line.
+    Blank lines and '#' comments are skipped so playlist dumps can be annotated.
+    """
+    lines = list(urls)
+    if input_file:
+        if input_file == '-':
+            lines.extend(sys.stdin.read().splitlines())
+        else:
+            with open(input_file, 'r', encoding='utf-8') as f:
+                lines.extend(f.read().splitlines())
+    return [line.strip() for line in lines if line.strip() and not line.strip().startswith('#')]
+
+def run_batch(urls: List[str], workers: int = DEFAULT_WORKERS, client: Optional[YouTubeClient] = None,
+              cache: Optional[TranscriptCache] = None, engine: Optional[AsyncFetchEngine] = None,
+              interval: float = DEFAULT_BLOCK_INTERVAL, sidecar: bool = False,
+              segmenter: Optional[Segmenter] = None) -> List[BatchResult]:
+    """
+    Exports many videos through one bounded worker pool and one shared YouTubeClient.
+    With an AsyncFetchEngine, fetching goes through its rate-limited/retrying event loop instead.
+    A failure is recorded on its BatchResult and never aborts the rest of the batch.
+    Results are returned in input order.
+    """
+    workers = max(1, workers)
+    results = [BatchResult(url=url, video_id=get_video_id(url)) for url in urls]
+    valid = []
+    for result in results:
+        if result.video_id:
+            valid.append(result)
+        else:
+            result.error = f"Error: Invalid YouTube URL or Video ID: '{result.url}'"
+            RunProfile.shared().add("failed")
+            print(f"FAIL {result.error}", file=sys.stderr)
+
+    def report(result: BatchResult, outcome) -> None:
+        if isinstance(outcome, Exception):
+            result.error = str(outcome).replace("Exception: ", "")
+            RunProfile.shared().add("failed")
+            print(f"FAIL {result.video_id}: {result.error}", file=sys.stderr)
+        else:
+            result.file_path = outcome
+            RunProfile.shared().exported(outcome)
+            print(f"OK   {result.video_id} -> {result.file_path}")
+
+    if engine is not None:
+        _run_batch_async(engine, valid, cache, report, interval, sidecar, segmenter)
+    else:
+        client = client or YouTubeClient(pool_size=workers)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(export_video, client, r.url, r.video_id, None, cache, interval, sidecar, segmenter): r
+                for r in valid
+            }
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    outcome = e
+                report(futures[future], outcome)
+
+    # One index write for the whole batch rather than one per video.
+    CorpusIndex.shared().save()
+    return results
+
+def _run_batch_async(engine: AsyncFetchEngine, results: List[BatchResult], cache: Optional[TranscriptCache],
+                     report, interval: float, sidecar: bool = False, segmenter: Optional[Segmenter] = None) -> None:
+    # Cache hits never enter the engine, so they don't consume rate-limit tokens.
+    pending = []
+    for result in results:
+        try:
+            outcome = export_cached(cache, result.url, result.video_id, interval, sidecar, segmenter)
+        except Exception as e:
+            outcome = e
+        if outcome is None:
+            pending.append(result)
+        else:
+            report(result, outcome)
+
+    def on_fetched(url, video_id, metadata, raw):
+        store_fetched(cache, video_id, metadata, raw)
+        return save_transcript(url, metadata, raw, interval, sidecar, segmenter)
+
+    outcomes = engine.run([(r.url, r.video_id) for r in pending], on_fetched)
+    for result, outcome in zip(pending, outcomes):
+        report(result, outcome)
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Fetch YouTube transcripts into Markdown.")
+    parser.add_argument("urls", nargs="*", help="YouTube URLs or 11-char video IDs")
+    parser.add_argument("-i", "--input", metavar="FILE", help="Read URLs/IDs from FILE, one per line ('-' for stdin)")
+    parser.add_argument("-w", "--workers", type=int,
+                        help=f"Batch worker pool size (default: {DEFAULT_WORKERS}); with --reprocess, processes (default: one per core)")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="Batch via the asyncio engine (per-host rate limit, retry/backoff)")
+    parser.add_argument("--concurrency", type=int, default=ASYNC_CONCURRENCY, help=f"Async engine in-flight video cap (default: {ASYNC_CONCURRENCY})")
+    parser.add_argument("--rate", type=float, default=HOST_RATE_PER_SEC, help=f"Async engine fetch calls/sec per host; one transcript fetch makes several HTTP requests (default: {HOST_RATE_PER_SEC})")
+    parser.add_argument("--reprocess", "--rebuild-keywords", dest="reprocess", action="store_true",
+                        help="Re-parse every saved transcript on a process pool, rebuild the corpus keyword index "
+                             "and re-export each file with fresh keywords")
+    parser.add_argument("--chunksize", type=int, default=REPROCESS_CHUNK_SIZE,
+                        help=f"Transcripts per --reprocess worker task (default: {REPROCESS_CHUNK_SIZE})")
+    parser.add_argument("-s", "--search", metavar="QUERY",
+                        help="Search saved transcripts and print ranked '?t=Ns' jump links")
+    parser.add_argument("--limit", type=int, default=SEARCH_RESULT_LIMIT, help=f"Max search hits (default: {SEARCH_RESULT_LIMIT})")
+    parser.add_argument("--interval", type=float,
+                        help=f"Seconds of speech per paragraph block (default: {DEFAULT_BLOCK_INTERVAL:g}). "
+                             "With another block rule it is the longest a block may run; 0 removes that limit")
+    parser.add_argument("--split-gap", type=float, metavar="SECONDS",
+                        help="Start a new block after a caption gap (silence) of at least SECONDS")
+    parser.add_argument("--max-tokens", type=int, metavar="N",
+                        help="Keep blocks under ~N tokens, preferring to end them on a sentence")
+    parser.add_argument("--chapters", metavar="FILE",
+                        help="Start a new block at every chapter in FILE ('0:00 Intro' lines, as in a video description)")
+    parser.add_argument("--sidecar", action="store_true",
+                        help=f"Also write a JSON-lines copy ({SIDECAR_EXTENSION}) of each transcript for machine consumers")
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument("--refresh", action="store_true", help="Ignore cached transcripts, re-fetch and update the cache")
+    cache_group.add_argument("--no-cache", action="store_true", help="Neither read nor write the transcript cache")
+    parser.add_argument("--cache-ttl", type=float, default=CACHE_TTL_SECONDS, help="Cache entry lifetime in seconds")
+    parser.add_argument("--timings", action="store_true",
+                        help="Print per-stage timings, bytes fetched and snippet/block counts as one JSON line on stderr")
+    parser.add_argument("--profile", metavar="FILE", help="Run under cProfile and dump the stats to FILE (read with: python -m pstats FILE)")
+    parser.add_argument("--log", action="store_true",
+                        help="Log a summary line (with the real run duration) to the lofi-gate ledger")
+    return parser
+
+def log_run(profile: RunProfile, exit_code: int) -> None:
+    """
+    Sends one summary line through lofi-gate's log_to_history, with the run's wall time as
+    its duration. Ledger failure is designated as NON-FATAL; the transcript is the primary goal.
+    """
+    try:
+        spec = importlib.util.spec_from_file_location("lofi_gate_logger", LOFI_GATE_LOGGER)
+        ledger = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(ledger)
+    except (OSError, ImportError) as e:
+        print(f"Warning: could not load the lofi-gate logger: {e}", file=sys.stderr)
+        return
+    record = profile.record()
+    titles = [os.path.splitext(os.path.basename(path))[0] for path in record["exports"]]
+    failed = record["counters"].get("failed", 0)
+    subject = titles[0] if len(titles) == 1 and not failed else f"{len(titles)} transcript(s), {failed} failed"
+    ledger.log_to_history(
+        "youtube-transcript",
+        "SUCCESS" if exit_code == 0 else "FAILED",
+        f"{subject} | {profile.summary()}",
+        duration=record["total_seconds"],
+        command_context="get_transcript.py",
+        render=True,
+    )
+
+def main():
+    parser = build_parser()
+    args = parser.parse_args()
+    profile = RunProfile.reset()
+    profiler = None
+    if args.profile:
+        import cProfile  # Only --profile pays for it.
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    exit_code = 0
+    try:
+        run_cli(parser, args)
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        raise
+    except BaseException:
+        # A crash (or Ctrl-C) must not be reported as a clean run.
+        exit_code = 1
+        raise
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+            print(f"cProfile stats written to {args.profile}", file=sys.stderr)
+        if args.timings:
+            print(json.dumps(dict(profile.record(), exit_code=exit_code)), file=sys.stderr)
+        # Search/reprocess runs export nothing new and have no transcript to report.
+        if args.log and (profile.exports or profile.counters["failed"]):
+            log_run(profile, exit_code)
+
+def run_cli(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    for option, value in (("--split-gap", args.split_gap), ("--max-tokens", args.max_tokens)):
+        if value is not None and value <= 0:
+            parser.error(f"{option} must be a positive number")
+    if args.interval is not None and args.interval < 0:
+        parser.error("--interval must be a positive number (or 0 alongside another block rule)")
+    chapter_starts = None
+    if args.chapters:
+        try:
+            with open(args.chapters, 'r', encoding='utf-8') as f:
+                chapter_starts = ChapterRule.parse(f)
+        except OSError as e:
+            parser.error(f"--chapters: {e}")
+    segmenter = Segmenter.from_options(args.interval, args.split_gap, args.max_tokens, chapter_starts)
+    if args.interval == 0 and not segmenter:
+        parser.error("--interval 0 needs --split-gap, --max-tokens or --chapters to end blocks")
+    interval = DEFAULT_BLOCK_INTERVAL if args.interval is None else args.interval
+    if args.reprocess:
+        if args.chunksize < 1:
+            parser.error("--chunksize must be at least 1")
+        stats = reprocess_transcripts(args.workers, args.chunksize)
+        for path, error in stats.failed:
+            print(f"FAIL {path}: {error}", file=sys.stderr)
+        print(f"Reprocessed {stats.count} transcript(s) in {OUTPUT_DIR} ({stats.rewritten} rewritten) "
+              f"in {stats.seconds:.2f}s: {stats.rate:.1f} transcripts/sec on {stats.workers} worker(s)")
+        sys.exit(1 if stats.failed else 0)
+
+    if args.search:
+        hits = SearchIndex().search(args.search, args.limit)
+        if not hits:
+            print(f"No matches for: {args.search}")
+            sys.exit(1)
+        for hit in hits:
+            print(f"[{hit.timestamp}] {hit.title} -> {hit.url} (score {hit.score:g})")
+        sys.exit(0)
+
+    urls = read_batch_inputs(args.urls, args.input)
+    if not urls:
+        print("Usage: python get_transcript.py <youtube_url> [<youtube_url> ...] [--input FILE|-]")
+        sys.exit(1)
+
+    # Fast path: a video that was already exported with the same block options needs no
+    # network, so none of the lazy HTTP/transcript imports ever load. --refresh/--no-cache re-export.
+    if len(urls) == 1 and not (args.refresh or args.no_cache):
+        video_id = get_video_id(urls[0])
+        block_spec = Segmenter.spec_for(interval, segmenter)
+        existing = TranscriptExporter.find_export(video_id, block_spec=block_spec) if video_id else None
+        # An export without the requested sidecar still needs one written.
+        if existing and not (args.sidecar and not os.path.exists(TranscriptExporter.sidecar_path(existing))):
+            RunProfile.shared().exported(existing)
+            print(f"Already exported {video_id}; skipping fetch.")
+            print(f"Success! Transcript saved to: {existing}")
+            sys.exit(0)
+
+    cache = None if args.no_cache else TranscriptCache(ttl=args.cache_ttl, refresh=args.refresh)
+
+    if len(urls) > 1:
+        engine = AsyncFetchEngine(concurrency=args.concurrency, rate=args.rate) if args.use_async else None
+        workers = DEFAULT_WORKERS if args.workers is None else args.workers
+        results = run_batch(urls, workers=workers, cache=cache, engine=engine, interval=interval,
+                            sidecar=args.sidecar, segmenter=segmenter)
+        failed = [r for r in results if not r.ok]
+        print(f"Batch complete: {len(results) - len(failed)} succeeded, {len(failed)} failed.")
+        sys.exit(1 if failed else 0)
+
+    url = urls[0]
+    video_id = get_video_id(url)
+    if not video_id:
+        # User-friendly validation prevents upstream API errors.
+        print(f"Error: Invalid YouTube URL or Video ID: '{url}'")
+        RunProfile.shared().add("failed")
+        sys.exit(1)
+
+    try:
+        # The cache is checked before any client exists, so a hit stays off the network stack.
+        file_path = export_cached(cache, url, video_id, interval, args.sidecar, segmenter)
+        if file_path is None:
+            client = YouTubeClient()
+            print(f"Fetching metadata and transcript for: {video_id}...")
+
+            # --- Concurrency Model ---
+            # We use ThreadPoolExecutor because these are I/O bound network requests.
+            with concurrent.futures.ThreadPoolExecutor() as executor:
+                file_path = fetch_and_export(client, url, video_id, executor, cache, interval, args.sidecar, segmenter)
     except Exception as e:
-        print(f"ERROR: Processing failure: {e}", file=sys.stderr)
+        # Re-mapping exceptions to stderr ensures failure is loud and explicit.
+        error_msg = str(e).replace("Exception: ", "")
+        print(error_msg, file=sys.stderr)
+        RunProfile.shared().add("failed")
         sys.exit(1)
 
+    CorpusIndex.shared().save()
+    RunProfile.shared().exported(file_path)
+    print(f"Success! Transcript saved to: {file_path}")
+
 if __name__ == "__main__":
     main()
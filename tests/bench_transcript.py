@@ -0,0 +1,364 @@
+"""
+Benchmark harness for the youtube-transcript pipeline.
+
+Times each processing stage on synthetic transcripts (5 minutes up to 12 hours, in both
+snippet shapes), measures peak memory, optionally (--reprocess) reprocesses a saved corpus on 1..N processes, and runs main()
+end to end against a local stub of the watch page + transcript API with configurable latency. Results are written as JSON;
+passing --baseline fails the run when any timing or peak memory regresses past --threshold.
+
+    python tests/bench_transcript.py --output bench.json
+    python tests/bench_transcript.py --baseline bench.json --threshold 0.25
+"""
+import sys
+import os
+import io
+import json
+import time
+import random
+import argparse
+import platform
+import subprocess
+import tempfile
+import threading
+import tracemalloc
+import contextlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import urlparse, parse_qs
+
+# Add the script path to sys.path
+SCRIPT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.agent', 'skills', 'youtube-transcript', 'scripts'))
+sys.path.append(SCRIPT_DIR)
+
+import requests
+import get_transcript
+from get_transcript import TranscriptProcessor, TranscriptExporter, TranscriptData
+from youtube_transcript_api import FetchedTranscriptSnippet
+
+DURATIONS = {"5m": 300, "30m": 1800, "1h": 3600, "3h": 10800, "12h": 43200}
+SHAPES = ("dict", "object")
+# Auto-generated captions arrive roughly every 2-3 seconds.
+SNIPPET_SECONDS = 2.5
+VOCABULARY = (
+    "kubernetes deployment container function example terraform scaling latency throughput "
+    "database postgres migration pipeline observability tracing because really think going "
+    "actually people things the and of to a in is it you that we this"
+).split()
+
+# --- Synthetic fixtures ---
+
+def synthetic_snippets(seconds: float, shape: str, seed: int = 1):
+    """Deterministic caption stream of `seconds` length in the requested snippet shape."""
+    rng = random.Random(seed)
+    snippets = []
+    start = 0.0
+    while start < seconds:
+        text = " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(1, 4)))
+        duration = rng.uniform(1.5, 3.5)
+        if shape == "dict":
+            snippets.append({"start": start, "duration": duration, "text": text})
+        else:
+            snippets.append(FetchedTranscriptSnippet(text=text, start=start, duration=duration))
+        start += SNIPPET_SECONDS
+    return snippets
+
+# --- Measurement ---
+
+def measure(fn, repeat: int):
+    """Best-of-`repeat` wall time, plus peak traced memory from one extra run."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"seconds": best, "peak_bytes": peak}
+
+def bench_stages(durations, repeat: int, output_dir: str):
+    results = {}
+    for label, seconds in durations.items():
+        for shape in SHAPES:
+            raw = synthetic_snippets(seconds, shape)
+            blocks = TranscriptProcessor.group_blocks(raw)
+            full_text = " ".join(b.text for b in blocks)
+            starts = [s["start"] if shape == "dict" else s.start for s in raw]
+            data = TranscriptData(
+                url="https://www.youtube.com/watch?v=dQw4w9WgXcQ", title=f"Bench {label} {shape}",
+                channel="Bench", blocks=blocks, keywords=TranscriptProcessor.extract_keywords(full_text)
+            )
+            suffix = f"{label}/{shape}"
+            results[f"group_blocks/{suffix}"] = measure(lambda: TranscriptProcessor.group_blocks(raw), repeat)
+            results[f"extract_keywords/{suffix}"] = measure(lambda: TranscriptProcessor.extract_keywords(full_text), repeat)
+            segmenter = get_transcript.Segmenter([get_transcript.CaptionGapRule(1.0), get_transcript.TokenBudgetRule(200)])
+            results[f"segment_blocks/{suffix}"] = measure(lambda: TranscriptProcessor.group_blocks(raw, segmenter=segmenter), repeat)
+            results[f"format_seconds/{suffix}"] = measure(lambda: [TranscriptProcessor.format_seconds(s) for s in starts], repeat)
+            with mock.patch.object(get_transcript, 'OUTPUT_DIR', output_dir):
+                results[f"save_markdown/{suffix}"] = measure(lambda: TranscriptExporter.save_markdown(data), repeat)
+            for key in ("group_blocks", "segment_blocks", "extract_keywords", "format_seconds", "save_markdown"):
+                results[f"{key}/{suffix}"]["snippets"] = len(raw)
+    return results
+
+# --- End-to-end stub ---
+
+class YouTubeStub:
+    """
+    Local stand-in for the three endpoints a run touches: the watch page (metadata and the
+    transcript API's key scrape), the innertube player call and the timedtext caption XML.
+    Every response is delayed by `latency` seconds to mimic a real round trip.
+    """
+    API_KEY = "benchkey"
+
+    def __init__(self, durations_by_id, latency: float = 0.0):
+        self.durations_by_id = durations_by_id
+        self.latency = latency
+        self.requests = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                stub.handle(self, {})
+
+            def do_POST(self):
+                stub.handle(self, json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0)))))
+
+            def log_message(self, *args):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            daemon_threads = True
+
+            def handle_error(self, request, client_address):
+                # Clients hanging up early (streamed metadata, keep-alive teardown) are expected.
+                if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+                    super().handle_error(request, client_address)
+
+        self.server = Server(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def handle(self, handler, payload):
+        self.requests += 1
+        time.sleep(self.latency)
+        parsed = urlparse(handler.path)
+        query = parse_qs(parsed.query)
+        if parsed.path == "/watch":
+            vid = query["v"][0]
+            body = (
+                f'<html><head><title>Stub {vid} - YouTube</title>'
+                f'<link itemprop="name" content="Stub Channel"></head><body>'
+                f'<script>ytcfg.set({{"INNERTUBE_API_KEY": "{self.API_KEY}"}});</script>'
+                + "<script>var ytInitialData = {};</script>" * 20000 + "</body></html>"
+            ).encode()
+            content_type = "text/html; charset=utf-8"
+        elif parsed.path == "/youtubei/v1/player":
+            vid = payload["videoId"]
+            body = json.dumps({
+                "playabilityStatus": {"status": "OK"},
+                "captions": {"playerCaptionsTracklistRenderer": {"captionTracks": [{
+                    "baseUrl": f"https://www.youtube.com/api/timedtext?v={vid}",
+                    "name": {"runs": [{"text": "English"}]},
+                    "languageCode": "en",
+                }]}},
+            }).encode()
+            content_type = "application/json"
+        elif parsed.path == "/api/timedtext":
+            vid = query["v"][0]
+            lines = ["<transcript>"]
+            for s in synthetic_snippets(self.durations_by_id[vid], "dict"):
+                lines.append(f'<text start="{s["start"]:.2f}" dur="{s["duration"]:.2f}">{s["text"]}</text>')
+            lines.append("</transcript>")
+            body = "".join(lines).encode()
+            content_type = "text/xml; charset=utf-8"
+        else:
+            handler.send_error(404)
+            return
+        handler.send_response(200)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        try:
+            handler.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The streaming metadata fetch hangs up early by design.
+
+def stub_client_class(base_url: str):
+    """YouTubeClient whose session sends every youtube.com request to the local stub."""
+    class RedirectAdapter(requests.adapters.HTTPAdapter):
+        def send(self, request, **kwargs):
+            request.url = request.url.replace("https://www.youtube.com", base_url, 1)
+            return super().send(request, **kwargs)
+
+    class StubClient(get_transcript.YouTubeClient):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.session.mount("https://www.youtube.com", RedirectAdapter())
+
+    return StubClient
+
+def run_main(argv, base_url: str, output_dir: str) -> int:
+    """Runs get_transcript.main() against the stub. Returns its exit code."""
+    patches = [
+        mock.patch.object(sys, 'argv', ["get_transcript.py"] + argv),
+        mock.patch.object(get_transcript, 'YouTubeClient', stub_client_class(base_url)),
+        mock.patch.object(get_transcript, 'OUTPUT_DIR', output_dir),
+        mock.patch.object(get_transcript, 'CACHE_DIR', os.path.join(output_dir, '.cache')),
+    ]
+    with contextlib.ExitStack() as stack:
+        for patch in patches:
+            stack.enter_context(patch)
+        stack.enter_context(contextlib.redirect_stdout(io.StringIO()))
+        try:
+            get_transcript.main()
+        except SystemExit as e:
+            return e.code or 0
+    return 0
+
+def bench_end_to_end(durations, latency: float, repeat: int, output_dir: str):
+    results = {}
+    for label, seconds in durations.items():
+        vid = f"bench{label:>6}".replace(" ", "_")[:11].ljust(11, "_")
+        with YouTubeStub({vid: seconds}, latency=latency) as stub:
+            argv = [f"https://www.youtube.com/watch?v={vid}", "--no-cache"]
+            exit_codes = []
+            result = measure(lambda: exit_codes.append(run_main(argv, stub.base_url, output_dir)), repeat)
+            if any(exit_codes):
+                raise RuntimeError(f"main() failed against the stub for {label}: exit {exit_codes}")
+            result["requests"] = stub.requests
+            result["latency_seconds"] = latency
+            results[f"main/{label}"] = result
+    return results
+
+# --- Start-up ---
+
+def import_seconds(code: str, module: str) -> float:
+    """Cumulative import time of `module` in a fresh interpreter, from -X importtime."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True)
+    for line in proc.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1]) / 1e6
+    raise RuntimeError(f"{module} not in -X importtime output")
+
+def bench_startup(repeat: int, output_dir: str):
+    """Fresh-process costs: importing the script, and a CLI run for an already-exported video."""
+    code = f"import sys; sys.path.insert(0, {os.path.dirname(os.path.abspath(get_transcript.__file__))!r}); import get_transcript"
+    results = {"startup/import": {"seconds": min(import_seconds(code, "get_transcript") for _ in range(repeat))}}
+
+    cwd = os.path.join(output_dir, "startup")
+    data = TranscriptData(url="https://www.youtube.com/watch?v=dQw4w9WgXcQ", title="Startup Bench", channel="Bench",
+                          blocks=TranscriptProcessor.group_blocks(synthetic_snippets(300, "dict")))
+    with mock.patch.object(get_transcript, 'OUTPUT_DIR', os.path.join(cwd, get_transcript.OUTPUT_DIR)):
+        TranscriptExporter.save_markdown(data)
+    argv = [sys.executable, get_transcript.__file__, "dQw4w9WgXcQ"]
+    results["startup/already-exported"] = measure(
+        lambda: subprocess.run(argv, cwd=cwd, capture_output=True, check=True), repeat
+    )
+    return results
+
+# --- Reprocess ---
+
+# Saved transcripts in the reprocess corpus, cycling through the selected --durations.
+REPROCESS_CORPUS = 48
+
+def bench_reprocess(durations, repeat: int, output_dir: str, corpus: int = REPROCESS_CORPUS):
+    """Throughput of --reprocess over a saved corpus in-process and on one worker per core."""
+    corpus_dir = os.path.join(output_dir, "reprocess")
+    fixtures = [TranscriptProcessor.group_blocks(synthetic_snippets(seconds, "dict")) for seconds in durations.values()]
+    with mock.patch.object(get_transcript, 'OUTPUT_DIR', corpus_dir):
+        for i in range(corpus):
+            data = TranscriptData(url=f"https://www.youtube.com/watch?v=bench{i:06d}", title=f"Reprocess {i}",
+                                  channel="Bench", blocks=fixtures[i % len(fixtures)])
+            TranscriptExporter.save_markdown(data)
+        results = {}
+        for workers in sorted({1, os.cpu_count() or 1}):
+            result = measure(lambda: get_transcript.reprocess_transcripts(workers), repeat)
+            result.update(transcripts=corpus, transcripts_per_sec=corpus / result["seconds"])
+            results[f"reprocess/workers={workers}"] = result
+    return results
+
+# --- Baseline comparison ---
+
+# Measurements compared against the baseline, for every result that records them (main/*
+# included); startup/import runs in a subprocess and has no peak_bytes, so only its time is compared.
+COMPARED_METRICS = ("seconds", "peak_bytes")
+
+def compare(current, baseline, threshold: float):
+    """Returns [(key, metric, baseline_value, current_value)] for metrics worse than baseline by > threshold."""
+    regressions = []
+    for key, result in current.items():
+        before = baseline.get(key) or {}
+        for metric in COMPARED_METRICS:
+            if before.get(metric) and metric in result and result[metric] > before[metric] * (1 + threshold):
+                regressions.append((key, metric, before[metric], result[metric]))
+    return regressions
+
+def run(durations, repeat: int = 3, latency: float = 0.05, end_to_end: bool = True, reprocess: bool = False):
+    with tempfile.TemporaryDirectory() as output_dir:
+        results = bench_stages(durations, repeat, output_dir)
+        results.update(bench_startup(repeat, output_dir))
+        if reprocess:
+            results.update(bench_reprocess(durations, repeat, output_dir))
+        if end_to_end:
+            results.update(bench_end_to_end(durations, latency, repeat, output_dir))
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "latency_seconds": latency,
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        },
+        "results": results,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the youtube-transcript pipeline")
+    parser.add_argument("--durations", default=",".join(DURATIONS), help=f"Comma-separated fixtures from {list(DURATIONS)}")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per measurement (best is kept)")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Stub latency per HTTP request")
+    parser.add_argument("--skip-e2e", action="store_true", help="Only time the processing stages")
+    parser.add_argument("--reprocess", action="store_true",
+                        help=f"Also time --reprocess over a {REPROCESS_CORPUS}-transcript corpus built from --durations")
+    parser.add_argument("--output", help="Write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", help="Baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed slowdown or peak memory growth vs baseline (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    durations = {label: DURATIONS[label] for label in args.durations.split(",")}
+    report = run(durations, args.repeat, args.latency_ms / 1000, not args.skip_e2e, args.reprocess)
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(payload + "\n")
+    else:
+        print(payload)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(report["results"], baseline, args.threshold)
+        for key, metric, before, after in regressions:
+            unit = "s" if metric == "seconds" else " bytes"
+            print(f"REGRESSION {key} {metric}: {before:g}{unit} -> {after:g}{unit} (+{(after / before - 1) * 100:.0f}%)",
+                  file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import sys
+import os
+import io
+import time
+import asyncio
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+# Add the script path to sys.path
+SCRIPT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.agent', 'skills', 'youtube-transcript', 'scripts'))
+sys.path.append(SCRIPT_DIR)
+
+import get_transcript
+from get_transcript import AsyncFetchEngine, TokenBucket, YouTubeClient, run_batch
+from youtube_transcript_api import RequestBlocked, TranscriptsDisabled
+
+class ScriptedClient:
+    """Replays a scripted sequence of outcomes per video and tracks in-flight calls."""
+    def __init__(self, script):
+        self.script = {vid: list(outcomes) for vid, outcomes in script.items()}
+        self.attempts = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def fetch_metadata(self, url):
+        return {"title": f"Video {get_transcript.get_video_id(url)}", "channel": "Test Channel"}
+
+    def request_transcript(self, video_id):
+        with self.lock:
+            self.attempts[video_id] = self.attempts.get(video_id, 0) + 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            outcome = self.script[video_id].pop(0) if self.script[video_id] else None
+        try:
+            time.sleep(0.01)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return [{"start": 0.0, "text": "hello"}]
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    # Sync path: reuse YouTubeClient's mapping on top of the scripted call.
+    fetch_transcript_raw = YouTubeClient.fetch_transcript_raw
+
+class TestAsyncEngine(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(get_transcript, 'OUTPUT_DIR', self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+    def engine(self, client, **kwargs):
+        kwargs.setdefault("rate", 1000.0)
+        kwargs.setdefault("burst", 1000.0)
+        return AsyncFetchEngine(client, backoff_base=0.001, backoff_max=0.01, **kwargs)
+
+    def test_retries_transient_errors_only(self):
+        client = ScriptedClient({
+            "aaaaaaaaaaa": [RequestBlocked("aaaaaaaaaaa"), RequestBlocked("aaaaaaaaaaa")],
+            "bbbbbbbbbbb": [TranscriptsDisabled("bbbbbbbbbbb")],
+        })
+        engine = self.engine(client)
+        outcomes = engine.run([("aaaaaaaaaaa", "aaaaaaaaaaa"), ("bbbbbbbbbbb", "bbbbbbbbbbb")],
+                              lambda url, vid, meta, raw: (meta['title'], len(raw)))
+
+        self.assertEqual(outcomes[0], ("Video aaaaaaaaaaa", 1))
+        self.assertEqual(str(outcomes[1]), "ERROR: Transcripts are disabled for this video (Owner choice).")
+        self.assertEqual(client.attempts, {"aaaaaaaaaaa": 3, "bbbbbbbbbbb": 1})
+        self.assertEqual(engine.retries, 2)
+
+    def test_gives_up_after_max_retries_with_sync_error_message(self):
+        client = ScriptedClient({"aaaaaaaaaaa": [RequestBlocked("aaaaaaaaaaa")] * 10})
+        outcomes = self.engine(client, max_retries=2).run([("aaaaaaaaaaa", "aaaaaaaaaaa")], lambda *a: None)
+        self.assertEqual(client.attempts["aaaaaaaaaaa"], 3)
+        self.assertEqual(str(outcomes[0]), "ERROR: Could not fetch the transcript (Network block or anti-bot).")
+
+    def test_concurrency_cap_is_respected(self):
+        ids = [f"vid{i:08d}" for i in range(40)]
+        client = ScriptedClient({vid: [] for vid in ids})
+        outcomes = self.engine(client, concurrency=5).run([(vid, vid) for vid in ids], lambda *a: "ok")
+        self.assertEqual(outcomes, ["ok"] * 40)
+        self.assertLessEqual(client.max_in_flight, 5)
+
+    def test_batch_results_match_sync_path(self):
+        script = {"aaaaaaaaaaa": [], "bbbbbbbbbbb": [TranscriptsDisabled("bbbbbbbbbbb")]}
+        urls = ["aaaaaaaaaaa", "bbbbbbbbbbb", "bad"]
+        with mock.patch('sys.stdout', new=io.StringIO()), mock.patch('sys.stderr', new=io.StringIO()):
+            sync = run_batch(urls, workers=2, client=ScriptedClient(script))
+            async_ = run_batch(urls, engine=self.engine(ScriptedClient(script)))
+        self.assertEqual(
+            [(r.ok, r.error, os.path.basename(r.file_path or "")) for r in sync],
+            [(r.ok, r.error, os.path.basename(r.file_path or "")) for r in async_]
+        )
+
+    def test_token_bucket_limits_rate(self):
+        async def drain():
+            bucket = TokenBucket(rate=50.0, capacity=1)
+            started = time.monotonic()
+            for _ in range(6):
+                await bucket.acquire()
+            return time.monotonic() - started
+        # One token up front, then five refills at 50/s.
+        self.assertGreaterEqual(asyncio.run(drain()), 0.09)
+
+    def test_token_bucket_survives_a_new_event_loop(self):
+        # Each AsyncFetchEngine.run is its own asyncio.run; the bucket must work in every one.
+        bucket = TokenBucket(rate=200.0, capacity=1)
+
+        async def contend():
+            await asyncio.gather(*(bucket.acquire() for _ in range(3)))
+        asyncio.run(contend())
+        asyncio.run(contend())
+
+if __name__ == '__main__':
+    unittest.main()
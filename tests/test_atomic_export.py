@@ -0,0 +1,89 @@
+import sys
+import os
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+# Add the script path to sys.path
+SCRIPT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.agent', 'skills', 'youtube-transcript', 'scripts'))
+sys.path.append(SCRIPT_DIR)
+
+import get_transcript
+from get_transcript import TranscriptExporter, TranscriptData, TranscriptBlock, RunProfile
+
+def sample_data(text="hello world"):
+    return TranscriptData(
+        url="https://www.youtube.com/watch?v=dQw4w9WgXcQ", title="Atomic Video", channel="C",
+        blocks=[
+            TranscriptBlock(timestamp="00:00", start=0.25, text=text),
+            TranscriptBlock(timestamp="01:00", start=61.5, text="second block"),
+        ],
+        keywords=["hello"]
+    )
+
+class TestAtomicExport(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(get_transcript, 'OUTPUT_DIR', self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+        RunProfile.reset()
+
+    def test_unchanged_export_is_not_rewritten(self):
+        path = TranscriptExporter.save_markdown(sample_data())
+        os.utime(path, ns=(1, 1))
+        TranscriptExporter.save_markdown(sample_data())
+        self.assertEqual(os.stat(path).st_mtime_ns, 1)
+        self.assertEqual(RunProfile.shared().counters["unchanged_files"], 1)
+        self.assertEqual([name for name in os.listdir(self.tmp.name) if name.endswith(".tmp")], [])
+
+    def test_changed_export_is_replaced(self):
+        path = TranscriptExporter.save_markdown(sample_data())
+        os.utime(path, ns=(1, 1))
+        TranscriptExporter.save_markdown(sample_data("goodbye world"))
+        self.assertNotEqual(os.stat(path).st_mtime_ns, 1)
+        with open(path, 'r', encoding='utf-8') as f:
+            self.assertIn("goodbye world", f.read())
+
+    def test_failed_write_keeps_old_file(self):
+        path = TranscriptExporter.save_markdown(sample_data())
+        with open(path, 'r', encoding='utf-8') as f:
+            before = f.read()
+
+        def broken():
+            yield TranscriptBlock(timestamp="00:00", start=0.0, text="partial")
+            raise RuntimeError("stream broke")
+
+        with mock.patch('shutil.copyfileobj', side_effect=OSError("disk full")), self.assertRaises(OSError):
+            TranscriptExporter.save_markdown(sample_data("new text"), path)
+        with self.assertRaises(RuntimeError):
+            TranscriptExporter.write_markdown(sample_data(), broken(), path)
+        with open(path, 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read(), before)
+        self.assertEqual([name for name in os.listdir(self.tmp.name) if name.endswith(".tmp")], [])
+
+    def test_sidecar_round_trip(self):
+        path = TranscriptExporter.save_markdown(sample_data(), sidecar=True)
+        sidecar = TranscriptExporter.sidecar_path(path)
+        with open(sidecar, 'r', encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual(lines[0], {"title": "Atomic Video", "channel": "C",
+                                    "url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ", "keywords": ["hello"]})
+        self.assertEqual(lines[1], {"start": 0.25, "timestamp": "00:00", "text": "hello world"})
+
+        data = TranscriptExporter.load_sidecar(path)
+        self.assertEqual(data.title, "Atomic Video")
+        self.assertEqual([b.start for b in data.blocks], [0.25, 61.5])
+
+        # Both files count as unchanged on a second identical export.
+        TranscriptExporter.save_markdown(sample_data(), sidecar=True)
+        self.assertEqual(RunProfile.shared().counters["unchanged_files"], 2)
+
+    def test_no_sidecar_by_default(self):
+        path = TranscriptExporter.save_markdown(sample_data())
+        self.assertFalse(os.path.exists(TranscriptExporter.sidecar_path(path)))
+
+if __name__ == '__main__':
+    unittest.main()
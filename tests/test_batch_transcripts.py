@@ -0,0 +1,71 @@
+import sys
+import os
+import io
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+# Add the script path to sys.path
+SCRIPT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.agent', 'skills', 'youtube-transcript', 'scripts'))
+sys.path.append(SCRIPT_DIR)
+
+import get_transcript
+from get_transcript import read_batch_inputs, run_batch
+
+class FakeClient:
+    """Stands in for YouTubeClient so the batch runner can be exercised offline."""
+    def __init__(self, failing_ids=()):
+        self.failing_ids = set(failing_ids)
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def fetch_metadata(self, url):
+        return {"title": f"Video {get_transcript.get_video_id(url)}", "channel": "Test Channel"}
+
+    def fetch_transcript_raw(self, video_id):
+        with self.lock:
+            self.calls.append(video_id)
+        if video_id in self.failing_ids:
+            raise Exception("ERROR: Transcripts are disabled for this video (Owner choice).")
+        return [{"start": 0.0, "text": "hello"}, {"start": 61.0, "text": "world"}]
+
+class TestBatchMode(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(get_transcript, 'OUTPUT_DIR', self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_read_batch_inputs_merges_args_and_file(self):
+        path = os.path.join(self.tmp.name, 'urls.txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("# playlist\nbbbbbbbbbbb\n\n  ccccccccccc  \n")
+        self.assertEqual(
+            read_batch_inputs(["aaaaaaaaaaa"], path),
+            ["aaaaaaaaaaa", "bbbbbbbbbbb", "ccccccccccc"]
+        )
+
+    def test_read_batch_inputs_from_stdin(self):
+        with mock.patch.object(sys, 'stdin', io.StringIO("aaaaaaaaaaa\nbbbbbbbbbbb\n")):
+            self.assertEqual(read_batch_inputs([], '-'), ["aaaaaaaaaaa", "bbbbbbbbbbb"])
+
+    def test_one_failure_does_not_abort_batch(self):
+        client = FakeClient(failing_ids={"bbbbbbbbbbb"})
+        urls = ["aaaaaaaaaaa", "https://youtu.be/bbbbbbbbbbb", "not a url", "ccccccccccc"]
+
+        with mock.patch('sys.stdout', new=io.StringIO()), mock.patch('sys.stderr', new=io.StringIO()):
+            results = run_batch(urls, workers=2, client=client)
+
+        self.assertEqual([r.url for r in results], urls)
+        self.assertEqual([r.ok for r in results], [True, False, False, True])
+        self.assertIn("disabled", results[1].error)
+        self.assertIn("Invalid YouTube URL", results[2].error)
+        self.assertTrue(os.path.exists(results[0].file_path))
+        self.assertTrue(os.path.exists(results[3].file_path))
+        # The invalid input never reaches the network.
+        self.assertEqual(sorted(client.calls), ["aaaaaaaaaaa", "bbbbbbbbbbb", "ccccccccccc"])
+
+if __name__ == '__main__':
+    unittest.main()
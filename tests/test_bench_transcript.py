@@ -0,0 +1,36 @@
+import sys
+import os
+import unittest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import bench_transcript
+from bench_transcript import compare, run
+
+class TestBenchHarness(unittest.TestCase):
+    """Keeps the benchmark harness (and its end-to-end stub of main()) from rotting."""
+
+    def test_smallest_fixture_produces_every_measurement(self):
+        report = run({"5m": 300}, repeat=1, latency=0.0, reprocess=True)
+        results = report["results"]
+        for stage in ("group_blocks", "extract_keywords", "format_seconds", "save_markdown"):
+            for shape in bench_transcript.SHAPES:
+                self.assertIn(f"{stage}/5m/{shape}", results)
+                self.assertGreater(results[f"{stage}/5m/{shape}"]["peak_bytes"], 0)
+        # watch page for metadata + watch page, player and timedtext for the transcript
+        self.assertGreaterEqual(results["main/5m"]["requests"], 4)
+        self.assertGreater(results["reprocess/workers=1"]["transcripts_per_sec"], 0)
+        self.assertIn("python", report["meta"])
+
+    def test_reprocess_is_opt_in(self):
+        results = run({"5m": 300}, repeat=1, end_to_end=False)["results"]
+        self.assertFalse([key for key in results if key.startswith(("reprocess/", "main/"))])
+
+    def test_compare_flags_only_regressions_past_threshold(self):
+        baseline = {"a": {"seconds": 1.0, "peak_bytes": 100}, "b": {"seconds": 1.0}, "gone": {"seconds": 1.0}}
+        current = {"a": {"seconds": 1.2, "peak_bytes": 200}, "b": {"seconds": 1.3}, "new": {"seconds": 9.0}}
+        self.assertEqual(compare(current, baseline, 0.25),
+                         [("a", "peak_bytes", 100, 200), ("b", "seconds", 1.0, 1.3)])
+
+if __name__ == '__main__':
+    unittest.main()
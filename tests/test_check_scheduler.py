@@ -0,0 +1,143 @@
+import sys
+import os
+import io
+import shutil
+import tempfile
+import subprocess
+import unittest
+from unittest import mock
+
+# Add the script path to sys.path
+SCRIPT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.agent', 'skills', 'lofi-gate', 'scripts'))
+sys.path.append(SCRIPT_DIR)
+
+try:
+    import scheduler
+except ImportError:  # The lofi-gate package isn't installed.
+    scheduler = None
+import logger
+
+@unittest.skipIf(scheduler is None, "lofi-gate is not installed")
+class TestIncrementalScheduler(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.repo = os.path.join(self.tmp.name, 'repo')
+        os.makedirs(self.repo)
+        self.counter = os.path.join(self.tmp.name, 'runs.txt')
+        self.write('app.py', 'print("hi")\n')
+        self.write_config('exit 0')
+        subprocess.run(["git", "init", "-q"], cwd=self.repo, check=True)
+
+        cwd = os.getcwd()
+        os.chdir(self.repo)
+        self.addCleanup(os.chdir, cwd)
+        patcher = mock.patch.object(logger, 'get_log_path', return_value=os.path.join(self.repo, logger.LOG_FILENAME))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write(self, name, content):
+        with open(os.path.join(self.repo, name), 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def write_config(self, outcome, lint=False):
+        # The "test suite" appends to a counter outside the repo, then passes or fails.
+        command = f"echo run >> {self.counter} && {outcome}"
+        self.write('lofi.toml', (
+            f"[project]\ntest_command = \"{command}\"\n\n"
+            f"[gate]\nstrict_tdd = false\nsecurity_check = false\nlint_check = {str(lint).lower()}\n"
+        ))
+
+    def run_gate(self, **kwargs):
+        with mock.patch('sys.stdout', new=io.StringIO()):
+            return scheduler.run_scheduled(**kwargs)
+
+    def runs(self):
+        if not os.path.exists(self.counter):
+            return 0
+        with open(self.counter, encoding='utf-8') as f:
+            return len(f.read().splitlines())
+
+    def statuses(self):
+        return [r["status"] for r in logger.iter_records(logger.get_store_path())]
+
+    def test_unchanged_inputs_are_served_from_cache(self):
+        self.assertEqual(self.run_gate(), 0)
+        self.assertEqual(self.run_gate(), 0)
+        self.assertEqual(self.runs(), 1)
+        self.assertEqual(self.statuses(), ["PASS", "CACHED"])
+        cached = list(logger.iter_records(logger.get_store_path()))[-1]
+        self.assertEqual(cached["label"], "Test Suite")
+        self.assertIn("saved", cached["message"])
+        # Checks only append; the view is rendered once at the end of the run.
+        with open(logger.LOG_FILENAME, encoding='utf-8') as f:
+            self.assertIn("CACHED", f.read())
+
+        # --no-cache reruns regardless.
+        self.assertEqual(self.run_gate(use_cache=False), 0)
+        self.assertEqual(self.runs(), 2)
+
+    def test_source_and_config_changes_invalidate(self):
+        self.run_gate()
+        self.write('app.py', 'print("changed")\n')
+        self.run_gate()
+        self.assertEqual(self.runs(), 2)
+
+        self.write('new_module.py', 'x = 1\n')
+        self.run_gate()
+        self.assertEqual(self.runs(), 3)
+
+        self.write_config('exit 0', lint=False)
+        with open('lofi.toml', 'a', encoding='utf-8') as f:
+            f.write("security_fail_on_error = false\n")
+        self.run_gate()
+        self.assertEqual(self.runs(), 4)
+        # The ledger itself changes every run and must not count as an input.
+        self.run_gate()
+        self.assertEqual(self.runs(), 4)
+
+    def test_cached_security_scan_expires(self):
+        # A security scan whose dependencies never change: cached, but only until the TTL.
+        scan = {"label": "Security Scan", "kind": "security", "command": f"echo run >> {self.counter}",
+                "inputs": "dependencies", "fail_on_error": True}
+        with mock.patch.object(scheduler, 'build_checks', side_effect=lambda *_: [dict(scan)]):
+            self.run_gate()
+            self.run_gate()
+            self.assertEqual(self.runs(), 1)
+            with mock.patch.object(scheduler, 'SECURITY_CACHE_TTL_SECONDS', 0):
+                self.run_gate()
+            self.assertEqual(self.runs(), 2)
+        self.assertEqual(self.statuses(), ["PASS", "CACHED", "PASS"])
+
+    @unittest.skipIf(shutil.which("npm") is None, "npm is not installed")
+    def test_logged_failures_do_not_invalidate_other_checks(self):
+        # Lint fails on every run; its error blob, blob counts and archive segments land in
+        # the repo, but the passing Test Suite's inputs are unchanged.
+        self.write('package.json', '{"scripts": {"lint": "echo lint broke && exit 2"}}')
+        self.write_config('exit 0', lint=True)
+        with mock.patch.object(logger, 'SEGMENT_MAX_BYTES', 1):
+            self.assertEqual(self.run_gate(), 1)
+            self.assertEqual(self.run_gate(), 1)
+        self.assertTrue(os.path.isdir(logger.BLOB_DIRNAME))
+        self.assertTrue(os.path.isdir(logger.ARCHIVE_DIRNAME))
+        self.assertEqual(self.runs(), 1)
+        records = list(logger.iter_history(logger.get_store_path()))
+        self.assertEqual(sorted((r["label"], r["status"]) for r in records),
+                         [("Lint", "FAIL"), ("Lint", "FAIL"), ("Test Suite", "CACHED"), ("Test Suite", "PASS")])
+
+    def test_failures_are_never_cached(self):
+        self.write_config('exit 3')
+        self.assertEqual(self.run_gate(), 1)
+        self.assertEqual(self.run_gate(), 1)
+        self.assertEqual(self.runs(), 2)
+        self.assertEqual(self.statuses(), ["FAIL", "FAIL"])
+
+    def test_file_digests_are_memoized_by_stat(self):
+        self.run_gate()
+        with mock.patch.object(scheduler.hashlib, 'sha256', wraps=scheduler.hashlib.sha256) as sha:
+            self.run_gate()
+        # Only the per-check fingerprint hash; no file was re-read.
+        self.assertEqual(sha.call_count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import sys
+import os
+import random
+import tracemalloc
+import unittest
+from types import SimpleNamespace
+
+# Add the script path to sys.path
+SCRIPT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.agent', 'skills', 'youtube-transcript', 'scripts'))
+sys.path.append(SCRIPT_DIR)
+
+from get_transcript import CompactTranscript, TranscriptProcessor
+
+def reference_blocks(raw, interval=60.0):
+    # The generic snippet loop is the behavioural reference for the compact path.
+    return list(TranscriptProcessor.iter_blocks(iter(raw), interval))
+
+def synthetic(count, seed=7, step=1.7, jitter=0.0):
+    rng = random.Random(seed)
+    return [{"start": max(0.0, i * step + rng.uniform(-jitter, jitter)), "text": f" word{i} \n"} for i in range(count)]
+
+class TestCompactTranscript(unittest.TestCase):
+    def test_blocks_identical_for_both_shapes(self):
+        raw = synthetic(2000)
+        objects = [SimpleNamespace(**s) for s in raw]
+        expected = reference_blocks(raw)
+        self.assertEqual(TranscriptProcessor.group_blocks(raw), expected)
+        self.assertEqual(TranscriptProcessor.group_blocks(objects), expected)
+
+    def test_blocks_identical_for_fractional_intervals_and_unsorted_input(self):
+        for interval in (0.1, 7.3, 60.0, 3600.0):
+            raw = synthetic(3000, step=0.05)
+            self.assertEqual(TranscriptProcessor.group_blocks(raw, interval), reference_blocks(raw, interval))
+        jittered = synthetic(3000, jitter=5.0)
+        compact = CompactTranscript.from_snippets(jittered)
+        self.assertFalse(compact.is_sorted)
+        self.assertEqual(list(compact.iter_blocks(30.0)), reference_blocks(jittered, 30.0))
+
+    def test_empty_and_round_trip(self):
+        self.assertEqual(TranscriptProcessor.group_blocks([]), [])
+        raw = [{"start": 0.0, "text": "a"}, {"start": 1.0, "text": " "}, {"start": 2.0, "text": "b"}]
+        self.assertEqual(list(CompactTranscript.from_snippets(raw)), [
+            {"start": 0.0, "text": "a"}, {"start": 1.0, "text": ""}, {"start": 2.0, "text": "b"}
+        ])
+
+    def test_compact_form_is_several_times_smaller(self):
+        count = 100_000
+        tracemalloc.start()
+        try:
+            objects = [SimpleNamespace(start=i * 1.5, text=f"caption {i}") for i in range(count)]
+            object_bytes = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            compact = CompactTranscript.from_snippets(objects)
+            compact_bytes = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(len(compact), count)
+        self.assertLess(compact_bytes * 3, object_bytes)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import sys
+import os
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+# Add the script path to sys.path
+SCRIPT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.agent', 'skills', 'youtube-transcript', 'scripts'))
+sys.path.append(SCRIPT_DIR)
+
+import get_transcript
+from get_transcript import (
+    CorpusIndex, TranscriptBlock, TranscriptData, TranscriptExporter, rebuild_keywords, save_transcript
+)
+
+def snippets(*texts):
+    return [{"start": i * 20.0, "text": text} for i, text in enumerate(texts)]
+
+class TestCorpusKeywords(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(get_transcript, 'OUTPUT_DIR', self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+    def keywords_of(self, path):
+        return TranscriptExporter.load_markdown(path).keywords
+
+    def test_load_markdown_round_trips_save_markdown(self):
+        data = TranscriptData(
+            url="https://youtu.be/dQw4w9WgXcQ",
+            title='Quotes "and" colons: ok',
+            channel="Test Channel",
+            blocks=[
+                TranscriptBlock(timestamp="00:00", start=0.0, text="Intro\nwith a caption newline"),
+                TranscriptBlock(timestamp="01:00", start=60.0, text="Content"),
+            ],
+            keywords=["caption", "newline"],
+        )
+        loaded = TranscriptExporter.load_markdown(TranscriptExporter.save_markdown(data))
+        self.assertEqual(loaded, data)
+
+    def test_corpus_common_words_are_demoted(self):
+        meta = lambda title: {"title": title, "channel": "c"}
+        topics = ["kubernetes", "terraform", "ansible", "postgres", "graphql"]
+        for i, topic in enumerate(topics):
+            path = save_transcript(f"vid{i:08d}", meta(f"Talk {i}"), snippets(f"function function {topic}"))
+
+        # Raw frequency would put 'function' first; it is in every document.
+        self.assertEqual(self.keywords_of(path), ["graphql", "function"])
+
+        CorpusIndex.shared().save()
+        with open(CorpusIndex.default_path(), encoding='utf-8') as f:
+            self.assertEqual(set(json.load(f)["docs"]), {f"Talk {i}.md" for i in range(5)})
+
+    def test_reexport_replaces_document_terms(self):
+        index = CorpusIndex(os.path.join(self.tmp.name, "idx.json"))
+        index.update("a.md", ["kubernetes", "function"])
+        index.update("a.md", ["terraform"])
+        self.assertEqual(dict(index.df), {"terraform": 1})
+        self.assertEqual(list(index.docs), ["a.md"])
+
+    def test_rebuild_rewrites_every_file_against_the_corpus(self):
+        meta = lambda title: {"title": title, "channel": "c"}
+        first = save_transcript("aaaaaaaaaaa", meta("One"), snippets("example kubernetes"))
+        save_transcript("bbbbbbbbbbb", meta("Two"), snippets("example terraform"))
+        # The first export was ranked when it was the only document.
+        self.assertEqual(self.keywords_of(first), ["example", "kubernetes"])
+
+        # Only the first export's ranking changes; the second was ranked against both already.
+        self.assertEqual(rebuild_keywords(), 1)
+        self.assertEqual(self.keywords_of(first), ["kubernetes", "example"])
+        self.assertEqual(rebuild_keywords(), 0)
+        self.assertTrue(os.path.exists(CorpusIndex.default_path()))
+
+if __name__ == '__main__':
+    unittest.main()
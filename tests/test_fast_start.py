@@ -0,0 +1,109 @@
+import sys
+import os
+import tempfile
+import subprocess
+import unittest
+from unittest import mock
+
+# Add the script path to sys.path
+SCRIPT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.agent', 'skills', 'youtube-transcript', 'scripts'))
+sys.path.append(SCRIPT_DIR)
+
+import get_transcript
+from get_transcript import TranscriptExporter, TranscriptData, TranscriptBlock, TranscriptCache, Segmenter, save_transcript
+
+SCRIPT = os.path.join(SCRIPT_DIR, 'get_transcript.py')
+
+# Modules that only execute once their lazy proxy is used (-X importtime logs their children).
+NETWORK_MODULES = ("urllib3", "youtube_transcript_api._api", "asyncio.base_events", "concurrent.futures.thread")
+
+def importtime(args, cwd=None):
+    """Runs Python with -X importtime. Returns (completed process, {module: cumulative microseconds})."""
+    proc = subprocess.run([sys.executable, "-X", "importtime"] + args, cwd=cwd, capture_output=True, text=True)
+    modules = {}
+    for line in proc.stderr.splitlines():
+        parts = line.split("|")
+        if line.startswith("import time:") and len(parts) == 3 and parts[1].strip().isdigit():
+            modules[parts[2].strip()] = int(parts[1])
+    return proc, modules
+
+class TestFastStart(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def export(self, output_dir):
+        data = TranscriptData(
+            url="https://www.youtube.com/watch?v=dQw4w9WgXcQ", title="Fast Video", channel="C",
+            blocks=[TranscriptBlock(timestamp="00:00", start=0.0, text="hello world")]
+        )
+        with mock.patch.object(get_transcript, 'OUTPUT_DIR', output_dir):
+            return TranscriptExporter.save_markdown(data)
+
+    def test_import_does_not_load_network_stack(self):
+        proc, modules = importtime(["-c", f"import sys; sys.path.insert(0, {SCRIPT_DIR!r}); import get_transcript"])
+        self.assertEqual(proc.returncode, 0, proc.stderr[-2000:])
+        self.assertIn("get_transcript", modules)
+        self.assertEqual([m for m in NETWORK_MODULES if m in modules], [])
+
+    def test_missing_dependency_is_module_not_found(self):
+        with self.assertRaises(ModuleNotFoundError) as caught:
+            get_transcript.lazy_import("no_such_transcript_dependency")
+        self.assertEqual(caught.exception.name, "no_such_transcript_dependency")
+        self.assertNotIn("no_such_transcript_dependency", sys.modules)
+
+    def test_import_time_guard(self):
+        # Importing the script must stay well under the cost of the client library alone;
+        # eager imports made it cost more than the library (~200 ms) on its own.
+        best = lambda args, name: min(importtime(args)[1][name] for _ in range(3))
+        script = best(["-c", f"import sys; sys.path.insert(0, {SCRIPT_DIR!r}); import get_transcript"], "get_transcript")
+        library = best(["-c", "import youtube_transcript_api"], "youtube_transcript_api")
+        self.assertLess(script, library)
+
+    def test_manifest_finds_existing_export(self):
+        output_dir = os.path.join(self.tmp.name, 'out')
+        path = self.export(output_dir)
+        self.assertEqual(TranscriptExporter.find_export("dQw4w9WgXcQ", output_dir), path)
+        self.assertIsNone(TranscriptExporter.find_export("aaaaaaaaaaa", output_dir))
+        os.remove(path)
+        self.assertIsNone(TranscriptExporter.find_export("dQw4w9WgXcQ", output_dir))
+
+    def test_already_exported_video_skips_network(self):
+        # OUTPUT_DIR is relative to the working directory, like a real agent run.
+        path = self.export(os.path.join(self.tmp.name, '.agent', 'research', 'yt-transcripts'))
+        proc, modules = importtime([SCRIPT, "https://youtu.be/dQw4w9WgXcQ"], cwd=self.tmp.name)
+        self.assertEqual(proc.returncode, 0, proc.stderr[-2000:])
+        self.assertIn("Fast Video.md", proc.stdout)
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual([m for m in NETWORK_MODULES if m in modules], [])
+
+    def test_cached_transcript_exports_without_network_stack(self):
+        cache = TranscriptCache(cache_dir=os.path.join(self.tmp.name, '.agent', 'research', '.yt-cache'))
+        cache.put("dQw4w9WgXcQ", {"title": "Cached Video", "channel": "C"}, [{"start": 0.0, "text": "hello", "duration": 1.0}])
+        proc, modules = importtime([SCRIPT, "dQw4w9WgXcQ"], cwd=self.tmp.name)
+        self.assertEqual(proc.returncode, 0, proc.stderr[-2000:])
+        self.assertIn("Cached Video.md", proc.stdout)
+        self.assertNotIn("Fetching", proc.stdout)
+        self.assertEqual([m for m in NETWORK_MODULES if m in modules], [])
+
+    def test_manifest_matches_block_options(self):
+        output_dir = os.path.join(self.tmp.name, 'out')
+        data = TranscriptData(url="https://www.youtube.com/watch?v=dQw4w9WgXcQ", title="Gap Video", channel="C")
+        gaps = Segmenter.from_options(min_gap=2.0)
+        with mock.patch.object(get_transcript, 'OUTPUT_DIR', output_dir):
+            path = save_transcript(data.url, {"title": data.title, "channel": "C"},
+                                   [{"start": 0.0, "text": "hello", "duration": 1.0}], segmenter=gaps)
+        spec = Segmenter.spec_for(segmenter=gaps)
+        self.assertEqual(TranscriptExporter.find_export("dQw4w9WgXcQ", output_dir, spec), path)
+        # A default run must not be served the gap-cut export, nor a 30s one.
+        self.assertIsNone(TranscriptExporter.find_export("dQw4w9WgXcQ", output_dir))
+        self.assertIsNone(TranscriptExporter.find_export("dQw4w9WgXcQ", output_dir, Segmenter.spec_for(30.0)))
+
+    def test_invalid_id_fails_without_network_stack(self):
+        proc, modules = importtime([SCRIPT, "not a video"], cwd=self.tmp.name)
+        self.assertEqual(proc.returncode, 1)
+        self.assertIn("Invalid YouTube URL", proc.stdout)
+        self.assertEqual([m for m in NETWORK_MODULES if m in modules], [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,368 @@
+import sys
+import os
+import io
+import re
+import time
+import tempfile
+import multiprocessing
+import concurrent.futures
+import unittest
+from unittest import mock
+
+# Add the script path to sys.path
+SCRIPT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.agent', 'skills', 'lofi-gate', 'scripts'))
+sys.path.append(SCRIPT_DIR)
+
+import logger
+
+try:
+    from lofi_gate import logger as package_logger
+except ImportError:  # The lofi-gate package isn't installed.
+    package_logger = None
+
+class LedgerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.log_path = os.path.join(self.tmp.name, logger.LOG_FILENAME)
+        patcher = mock.patch.object(logger, 'get_log_path', return_value=self.log_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        quiet = mock.patch('sys.stdout', new=io.StringIO())
+        quiet.start()
+        self.addCleanup(quiet.stop)
+
+    def read(self, render=True):
+        # Logging only appends to the store; the view is rendered on demand.
+        if render:
+            logger.write_entries([], render=True)
+        with open(self.log_path, encoding='utf-8') as f:
+            return f.read()
+
+    def totals(self):
+        return logger.parse_footer(self.read().splitlines(keepends=True))[1:]
+
+class TestStructuredStore(LedgerTestCase):
+    def test_store_is_source_of_truth(self):
+        logger.log_to_history("Tests", "PASS", "ok", tokens_used=10, tokens_saved=3, duration=1.5, command_context="npm test")
+        logger.log_to_history("Lint", "FAIL", "bad", tokens_used=5, tokens_saved=1, error_content="line 1\nline 2")
+
+        records = list(logger.iter_records(logger.get_store_path()))
+        self.assertEqual([r["label"] for r in records], ["Tests", "Lint"])
+        self.assertEqual(records[0]["command"], "npm test")
+        self.assertEqual(records[0]["duration"], 1.5)
+        self.assertEqual((records[-1]["total_tokens_used"], records[-1]["total_tokens_saved"]), (15, 4))
+
+        content = self.read()
+        self.assertEqual(self.totals(), (15, 4))
+        self.assertEqual(content.count("Total Token Size"), 1)
+        self.assertLess(content.index("**Tests**"), content.index("**Lint**"))
+        self.assertIn("(seen 1 times): line 2\n", content)
+        self.assertIn(f"**[{records[0]['timestamp']}]** [npm test]", content)
+
+    def test_logging_does_not_render_by_default(self):
+        with mock.patch.object(logger, 'render_history', wraps=logger.render_history) as render:
+            logger.log_to_history("Tests", "PASS", "ok")
+            logger.log_many([{"label": "Lint", "status": "PASS"}])
+        self.assertEqual(render.call_count, 0)
+        self.assertFalse(os.path.exists(self.log_path))
+        logger.log_to_history("Build", "PASS", "ok", render=True)
+        with open(self.log_path, encoding='utf-8') as f:
+            content = f.read()
+        self.assertLess(content.index("**Tests**"), content.index("**Build**"))
+
+    def test_torn_tail_line_is_ignored(self):
+        logger.log_to_history("Tests", "PASS", "ok", tokens_used=4)
+        with open(logger.get_store_path(), 'a', encoding='utf-8') as f:
+            f.write('{"label": "Half')
+        logger.log_to_history("Lint", "PASS", "ok", tokens_used=1)
+        self.assertEqual(self.totals(), (5, 0))
+        self.assertEqual([r["label"] for r in logger.iter_records(logger.get_store_path())], ["Tests", "Lint"])
+
+    def test_legacy_ledger_totals_are_carried_over(self):
+        with open(self.log_path, 'w', encoding='utf-8') as f:
+            f.write("- old entry\n\n> 📊 **Total Token Size:** 100 | 💰 **Total Token Savings:** 40\n")
+        logger.log_to_history("Tests", "PASS", "ok", tokens_used=1, tokens_saved=2)
+        self.assertEqual(self.totals(), (101, 42))
+        with open(os.path.join(self.tmp.name, logger.LEGACY_FILENAME), encoding='utf-8') as f:
+            self.assertTrue(f.read().startswith("- old entry\n"))
+
+    def test_render_migrates_legacy_ledger_first(self):
+        with open(self.log_path, 'w', encoding='utf-8') as f:
+            f.write("- old entry\n\n> 📊 **Total Token Size:** 500 | 💰 **Total Token Savings:** 70\n")
+        with logger.ledger_lock(self.log_path):
+            self.assertTrue(logger.render_history())
+        self.assertEqual(self.totals(), (500, 70))
+        logger.log_to_history("Tests", "PASS", "ok", tokens_used=5)
+        self.assertEqual(self.totals(), (505, 70))
+        with open(os.path.join(self.tmp.name, logger.LEGACY_FILENAME), encoding='utf-8') as f:
+            self.assertTrue(f.read().startswith("- old entry\n"))
+
+    def test_empty_store_never_renders_over_existing_file(self):
+        legacy = os.path.join(self.tmp.name, logger.LEGACY_FILENAME)
+        with open(legacy, 'w', encoding='utf-8') as f:
+            f.write("- older migration\n")
+        with open(self.log_path, 'w', encoding='utf-8') as f:
+            f.write("- hand-written ledger\n")
+        with logger.ledger_lock(self.log_path):
+            self.assertFalse(logger.render_history())
+        self.assertEqual(self.read(), "- hand-written ledger\n")
+
+    def test_render_shows_tail_but_store_keeps_everything(self):
+        with mock.patch.object(logger, 'MAX_LOG_LINES', 50), \
+             mock.patch.object(logger, 'TAIL_BLOCK_BYTES', 512):
+            logger.log_many([{"label": "Tests", "status": "PASS", "message": f"run {i}", "tokens_used": 1} for i in range(300)], render=True)
+        content = self.read(render=False)
+        self.assertTrue(content.startswith("... (Showing last 50 entries;"))
+        self.assertIn("run 299\n", content)
+        self.assertNotIn("run 249\n", content)
+        self.assertEqual(len(list(logger.iter_records(logger.get_store_path()))), 300)
+        self.assertEqual(self.totals(), (300, 0))
+
+@unittest.skipIf(package_logger is None, "lofi-gate is not installed")
+class TestPackageWriter(LedgerTestCase):
+    """`lofi-gate verify` logs through the installed package, which writes only the Markdown view."""
+
+    def package_log(self, *args, **kwargs):
+        package_logger.log_to_history(*args, project_root=self.tmp.name, **kwargs)
+
+    def test_render_keeps_entries_written_by_the_package(self):
+        logger.log_to_history("Skill", "PASS", "ok", tokens_used=10)
+        self.package_log("Tests", "FAIL", "Failed", 5, 1, 2.5, "npm test", error_content="line 1\nboom")
+        logger.log_to_history("Lint", "PASS", "ok", tokens_used=2, render=True)
+
+        records = list(logger.iter_records(logger.get_store_path()))
+        self.assertEqual([r["label"] for r in records], ["Skill", "Lint", "Tests"])
+        self.assertEqual((records[-1]["command"], records[-1]["duration"]), ("npm test", 2.5))
+        self.assertEqual(records[-1]["error_excerpt"], "boom")
+        content = self.read(render=False)
+        self.assertIn("❌ **Tests**: FAIL (2.50s)", content)
+        self.assertEqual(self.totals(), (17, 1))
+
+        # Already ingested: later renders and package writes don't duplicate it.
+        self.package_log("Tests", "PASS", "Passed", 3, 0)
+        self.read()
+        self.read()
+        self.assertEqual([r["label"] for r in logger.iter_records(logger.get_store_path())],
+                         ["Skill", "Lint", "Tests", "Tests"])
+        self.assertEqual(self.totals(), (20, 1))
+
+    def test_package_ledger_before_any_store_is_migrated(self):
+        self.package_log("Tests", "PASS", "Passed", 7, 2)
+        logger.log_to_history("Lint", "PASS", "ok", tokens_used=1, render=True)
+        self.assertEqual(self.totals(), (8, 2))
+        self.assertEqual([r["label"] for r in logger.iter_records(logger.get_store_path())], ["Lint"])
+
+class TestArchiveRotation(LedgerTestCase):
+    def fill(self, count):
+        with mock.patch.object(logger, 'SEGMENT_MAX_BYTES', 2048):
+            for i in range(count):
+                logger.log_to_history("Tests", "PASS", f"run {i}", tokens_used=1, tokens_saved=2, render=False)
+
+    def archive_dir(self):
+        return logger.get_archive_dir(logger.get_store_path())
+
+    def test_rotation_archives_instead_of_discarding(self):
+        self.fill(100)
+        segments = logger.load_archive_index(self.archive_dir())
+        self.assertGreater(len(segments), 1)
+        self.assertLessEqual(os.path.getsize(logger.get_store_path()), 2048 + 512)
+        self.assertTrue(all(s["file"].endswith(".jsonl.gz") for s in segments))
+
+        history = [r["message"] for r in logger.iter_history(logger.get_store_path())]
+        self.assertEqual(history, [f"run {i}" for i in range(100)])
+        self.assertEqual(sum(s["entries"] for s in segments) + len(list(logger.iter_records(logger.get_store_path()))), 100)
+
+    def test_totals_and_render_survive_rotation(self):
+        self.fill(100)
+        with logger.ledger_lock(self.log_path):
+            logger.rotate_segment(logger.get_store_path())
+        self.assertEqual(os.path.getsize(logger.get_store_path()), 0)
+        logger.log_to_history("Lint", "PASS", "after", tokens_used=1)
+        self.assertEqual(self.totals(), (101, 200))
+        with mock.patch.object(logger, 'MAX_LOG_LINES', 30):
+            with logger.ledger_lock(self.log_path):
+                logger.render_history()
+        content = self.read(render=False)
+        # The view reaches back into the archive to fill its window.
+        self.assertEqual(content.count("- **["), 30)
+        self.assertIn("run 99\n", content)
+        self.assertIn("**Lint**", content)
+
+    def test_range_queries_skip_segments(self):
+        archive_dir = self.archive_dir()
+        os.makedirs(archive_dir)
+        segments = []
+        for n, day in enumerate(["2026-01-01", "2026-01-02", "2026-01-03"], 1):
+            name = f"segment-{n:06d}.jsonl.gz"
+            with logger.gzip.open(os.path.join(archive_dir, name), 'wt', encoding='utf-8') as f:
+                f.write(logger.json.dumps({"label": "Tests", "status": "PASS", "timestamp": f"{day} 09:00:00"}) + "\n")
+            segments.append({"file": name, "first": f"{day} 09:00:00", "last": f"{day} 09:00:00", "entries": 1,
+                             "total_tokens_used": 0, "total_tokens_saved": 0})
+        logger.save_archive_index(archive_dir, segments)
+
+        with mock.patch.object(logger, 'iter_segment', wraps=logger.iter_segment) as opened:
+            days = [r["timestamp"][:10] for r in logger.iter_history(logger.get_store_path(), since="2026-01-02", until="2026-01-02")]
+        self.assertEqual(days, ["2026-01-02"])
+        self.assertEqual([c.args[1]["file"] for c in opened.call_args_list], ["segment-000002.jsonl.gz"])
+
+class TestErrorBlobs(LedgerTestCase):
+    TRACE = "\x1b[31mTraceback (most recent call last):\x1b[0m\r\n  File \"app.py\", line 3\r\nAssertionError: took 0.42s   \r\n"
+
+    def test_repeated_errors_are_stored_once(self):
+        for i in range(3):
+            trace = self.TRACE.replace("0.42s", f"0.{i}7s")
+            logger.log_to_history("Tests", "FAIL", f"run {i}", error_content=trace)
+        logger.log_to_history("Lint", "FAIL", "other", error_content="E501 line too long")
+
+        records = list(logger.iter_records(logger.get_store_path()))
+        self.assertTrue(all("error_content" not in r for r in records))
+        self.assertEqual(len({r["error_hash"] for r in records[:3]}), 1)
+        self.assertEqual([r["error_seen"] for r in records], [1, 2, 3, 1])
+        self.assertEqual(records[0]["error_excerpt"], "AssertionError: took 0.07s")
+
+        blob_dir = logger.get_blob_dir(logger.get_store_path())
+        self.assertEqual(len([n for n in os.listdir(blob_dir) if n.endswith(".txt")]), 2)
+        body = logger.read_error_blob(blob_dir, records[0]["error_hash"][:logger.ERROR_REF_CHARS])
+        self.assertEqual(body, 'Traceback (most recent call last):\n  File "app.py", line 3\nAssertionError: took 0.07s')
+
+        content = self.read()
+        self.assertNotIn("Traceback", content)
+        self.assertIn("(seen 3 times): AssertionError: took 0.27s", content)
+
+    def test_errors_expand_on_request(self):
+        logger.log_to_history("Tests", "FAIL", "boom", error_content=self.TRACE)
+        with logger.ledger_lock(self.log_path):
+            logger.render_history(expand_errors=True)
+        content = self.read(render=False)
+        self.assertIn("  <details>\n", content)
+        self.assertIn('  File "app.py", line 3\n', content)
+        self.assertNotIn("(seen 1 times)", content)
+
+    def test_inline_errors_from_older_records_still_render(self):
+        record = logger.make_record("Tests", "FAIL", "old", error_content="legacy trace")
+        with open(logger.get_store_path(), 'w', encoding='utf-8') as f:
+            f.write(logger.json.dumps(record) + "\n")
+        with logger.ledger_lock(self.log_path):
+            logger.render_history()
+        self.assertIn("  legacy trace\n", self.read())
+
+class TestHistoryStats(unittest.TestCase):
+    def record(self, label, status, duration, day="2026-01-01", saved=0):
+        return {"label": label, "status": status, "duration": duration, "timestamp": f"{day} 10:00:00", "tokens_saved": saved}
+
+    def test_percentiles_and_pass_rates(self):
+        records = [self.record("Tests", "PASS", d) for d in range(1, 21)]
+        records += [self.record("Lint", "FAIL", 0, day="2026-01-02", saved=5), self.record("Lint", "PASS", 2.0, day="2026-01-02", saved=7)]
+        report = logger.history_stats(records)
+
+        tests = report["labels"]["Tests"]
+        self.assertEqual((tests["p50_duration"], tests["p95_duration"]), (10, 19))
+        self.assertEqual(tests["pass_rate"], 1.0)
+        lint = report["labels"]["Lint"]
+        self.assertEqual(lint["pass_rate"], 0.5)
+        # A run that recorded no duration doesn't drag the percentiles to zero.
+        self.assertEqual(lint["p50_duration"], 2.0)
+        self.assertEqual(list(report["days"]), ["2026-01-01", "2026-01-02"])
+        self.assertEqual(report["days"]["2026-01-02"]["tokens_saved"], 12)
+
+        self.assertEqual(list(logger.history_stats(records, label="Lint")["labels"]), ["Lint"])
+        self.assertEqual(list(logger.history_stats(records, since="2026-01-02")["days"]), ["2026-01-02"])
+        table = logger.format_stats(report)
+        self.assertLess(table.index("Tests"), table.index("Lint"))
+
+class TestBatchLogging(LedgerTestCase):
+    def test_log_many_is_one_write(self):
+        entries = [
+            {"label": f"Check {i}", "status": "PASS", "tokens_used": i, "tokens-saved": 1, "command": "npm test"}
+            for i in range(12)
+        ]
+        with mock.patch.object(logger, 'append_records', wraps=logger.append_records) as append:
+            self.assertEqual(logger.log_many(entries), 12)
+        self.assertEqual(append.call_count, 1)
+        self.assertEqual(self.totals(), (sum(range(12)), 12))
+        self.assertEqual(self.read().count("[npm test]"), 12)
+
+    def test_stream_flushes_in_groups_and_skips_bad_lines(self):
+        lines = [
+            '{"label": "A", "status": "PASS"}',
+            'not json',
+            '{"label": "B", "status": "FAIL", "error_content": "boom"}',
+            '',
+            '{"status": "PASS"}',
+            '{"label": "C", "status": "PASS", "tokens_used": 7}',
+        ]
+        with mock.patch('sys.stderr', new=io.StringIO()) as err, \
+             mock.patch.object(logger, 'append_records', wraps=logger.append_records) as append, \
+             mock.patch.object(logger, 'render_history', wraps=logger.render_history) as render:
+            self.assertEqual(logger.log_stream(io.StringIO("\n".join(lines)), batch_size=2), 3)
+        self.assertEqual(append.call_count, 2)
+        self.assertEqual(render.call_count, 1)
+        self.assertIn("line 2", err.getvalue())
+        self.assertIn("line 5", err.getvalue())
+        content = self.read()
+        self.assertLess(content.index("**A**"), content.index("**B**"))
+        self.assertLess(content.index("**B**"), content.index("**C**"))
+        self.assertEqual(self.totals(), (7, 0))
+
+def _stress_writer(log_path, writer_id, count):
+    # Runs in a child process: each writer logs `count` entries worth 1 used / 2 saved tokens,
+    # re-rendering the view every few entries.
+    sys.stdout = io.StringIO()
+    with mock.patch.object(logger, 'get_log_path', return_value=log_path):
+        for i in range(count):
+            logger.log_to_history("Parallel", "PASS", f"writer {writer_id} entry {i}", tokens_used=1, tokens_saved=2,
+                                  render=i % 10 == 9)
+
+def _package_writer(project_root, count):
+    # Runs in a child process, as `lofi-gate verify --parallel` does: checks log from threads
+    # through the package's logger, straight into the Markdown view.
+    sys.stdout = io.StringIO()
+    with concurrent.futures.ThreadPoolExecutor(4) as pool:
+        for i in range(count):
+            pool.submit(package_logger.log_to_history, f"Package {i}", "PASS", "Passed", 3, 0, project_root=project_root)
+            time.sleep(0.005)
+
+class TestConcurrentWriters(LedgerTestCase):
+    def test_parallel_writers_lose_nothing(self):
+        writers, per_writer = 8, 40
+        processes = [
+            multiprocessing.Process(target=_stress_writer, args=(self.log_path, w, per_writer))
+            for w in range(writers)
+        ]
+        for p in processes:
+            p.start()
+        for p in processes:
+            p.join()
+        self.assertEqual([p.exitcode for p in processes], [0] * writers)
+
+        content = "".join(r["message"] + "\n" for r in logger.iter_records(logger.get_store_path()))
+        entries = re.findall(r"writer (\d+) entry (\d+)", content)
+        self.assertEqual(len(entries), writers * per_writer)
+        self.assertEqual(len(set(entries)), writers * per_writer)
+        self.assertEqual(self.totals(), (writers * per_writer, 2 * writers * per_writer))
+
+    @unittest.skipIf(package_logger is None, "lofi-gate is not installed")
+    def test_package_writer_alongside_rendering_writers_loses_nothing(self):
+        writers, per_writer, package_entries = 4, 40, 40
+        # An existing ledger: a package write into a fresh tree would be migrated as legacy.
+        self.read()
+        processes = [
+            multiprocessing.Process(target=_stress_writer, args=(self.log_path, w, per_writer))
+            for w in range(writers)
+        ] + [multiprocessing.Process(target=_package_writer, args=(self.tmp.name, package_entries))]
+        for p in processes:
+            p.start()
+        for p in processes:
+            p.join()
+        self.assertEqual([p.exitcode for p in processes], [0] * (writers + 1))
+
+        self.read()
+        labels = [r["label"] for r in logger.iter_records(logger.get_store_path())]
+        self.assertEqual(sorted(label for label in labels if label.startswith("Package")),
+                         sorted(f"Package {i}" for i in range(package_entries)))
+        self.assertEqual(labels.count("Parallel"), writers * per_writer)
+        self.assertEqual(self.totals(), (writers * per_writer + 3 * package_entries, 2 * writers * per_writer))
+
+if __name__ == '__main__':
+    unittest.main()
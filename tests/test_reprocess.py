@@ -0,0 +1,80 @@
+import sys
+import os
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+# Add the script path to sys.path
+SCRIPT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.agent', 'skills', 'youtube-transcript', 'scripts'))
+sys.path.append(SCRIPT_DIR)
+
+import get_transcript
+from get_transcript import (
+    CorpusIndex, TranscriptExporter, reprocess_transcripts, save_transcript, EXPORT_MANIFEST_FILENAME
+)
+
+TOPICS = ("kubernetes", "terraform", "postgres", "grafana", "rustlang", "webassembly")
+
+def snippets(text):
+    return [{"start": 0.0, "text": text}, {"start": 61.0, "text": text}]
+
+class TestReprocess(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(get_transcript, 'OUTPUT_DIR', self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(CorpusIndex._shared.clear)
+        CorpusIndex._shared.clear()
+
+    def export_corpus(self):
+        paths = []
+        for i, topic in enumerate(TOPICS):
+            video_id = f"video{i:06d}"
+            paths.append(save_transcript(video_id, {"title": f"Talk {topic}", "channel": "c"},
+                                         snippets(f"example demo {topic} {topic}")))
+        return paths
+
+    def keywords(self, paths):
+        return {os.path.basename(p): TranscriptExporter.load_markdown(p).keywords for p in paths}
+
+    def test_pool_matches_in_process_run(self):
+        paths = self.export_corpus()
+        serial = reprocess_transcripts(workers=1)
+        expected = self.keywords(paths)
+
+        os.remove(os.path.join(self.tmp.name, EXPORT_MANIFEST_FILENAME))
+        pooled = reprocess_transcripts(workers=2, chunksize=2)
+        self.assertEqual((serial.count, pooled.count, pooled.workers), (6, 6, 2))
+        self.assertEqual(self.keywords(paths), expected)
+        self.assertEqual(expected["Talk kubernetes.md"][0], "kubernetes")
+        # Nothing changed since the in-process run, so nothing was rewritten.
+        self.assertEqual(pooled.rewritten, 0)
+        self.assertGreater(pooled.rate, 0)
+        # The manifest is written once, by the parent, with every video.
+        with open(os.path.join(self.tmp.name, EXPORT_MANIFEST_FILENAME), encoding='utf-8') as f:
+            self.assertEqual(len(json.load(f)), 6)
+
+    def test_stopword_change_is_applied_to_saved_transcripts(self):
+        paths = self.export_corpus()
+        self.assertIn("example", self.keywords(paths)["Talk grafana.md"])
+        with mock.patch.object(get_transcript, 'STOPWORDS', get_transcript.STOPWORDS | {"example"}):
+            stats = reprocess_transcripts(workers=2, chunksize=1)
+        self.assertEqual(stats.rewritten, 6)
+        self.assertTrue(all("example" not in words for words in self.keywords(paths).values()))
+        with open(CorpusIndex.default_path(), encoding='utf-8') as f:
+            self.assertNotIn("example", json.load(f)["docs"]["Talk grafana.md"])
+
+    def test_unreadable_file_is_reported_not_fatal(self):
+        self.export_corpus()
+        broken = os.path.join(self.tmp.name, "Broken.md")
+        with open(broken, 'w', encoding='utf-8') as f:
+            f.write("---\ntitle: {not json\n---\n")
+        stats = reprocess_transcripts(workers=2)
+        self.assertEqual(stats.count, 6)
+        self.assertEqual([path for path, _ in stats.failed], [broken])
+
+if __name__ == '__main__':
+    unittest.main()
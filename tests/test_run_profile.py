@@ -0,0 +1,94 @@
+import sys
+import os
+import io
+import json
+import time
+import shutil
+import tempfile
+import contextlib
+import unittest
+from unittest import mock
+
+# Add the script path to sys.path
+SCRIPT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.agent', 'skills', 'youtube-transcript', 'scripts'))
+sys.path.append(SCRIPT_DIR)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import get_transcript
+from get_transcript import RunProfile
+from bench_transcript import YouTubeStub, run_main
+
+class TestRunProfile(unittest.TestCase):
+    def test_nested_and_lazy_stages_are_exclusive(self):
+        profile = RunProfile()
+
+        def produce():
+            for i in range(3):
+                time.sleep(0.01)
+                yield i
+
+        with profile.stage("save_markdown"):
+            items = list(profile.timed(produce(), "group_blocks"))
+        self.assertEqual(items, [0, 1, 2])
+        self.assertGreaterEqual(profile.seconds["group_blocks"], 0.03)
+        # The writer's own time excludes what it pulled through the lazy stage.
+        self.assertLess(profile.seconds["save_markdown"], 0.01)
+        self.assertEqual((profile.calls["group_blocks"], profile.calls["save_markdown"]), (1, 1))
+        self.assertIn("group_blocks", profile.summary())
+
+class TestInstrumentedRun(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        # A private copy of the lofi-gate logger, so its ledger lands under tmp/ (it logs
+        # to the directory four levels above itself).
+        scripts = os.path.join(self.tmp.name, '.agent', 'skills', 'lofi-gate', 'scripts')
+        os.makedirs(scripts)
+        shutil.copy(os.path.abspath(get_transcript.LOFI_GATE_LOGGER), scripts)
+        patcher = mock.patch.object(get_transcript, 'LOFI_GATE_LOGGER', os.path.join(scripts, 'logger.py'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_stub(self, *flags):
+        output_dir = os.path.join(self.tmp.name, 'out')
+        stderr = io.StringIO()
+        with YouTubeStub({"prof_video1": 600}) as stub, contextlib.redirect_stderr(stderr):
+            code = run_main(["https://www.youtube.com/watch?v=prof_video1", "--no-cache", *flags], stub.base_url, output_dir)
+        return code, stderr.getvalue()
+
+    def test_timings_record_covers_every_stage(self):
+        code, stderr = self.run_stub("--timings")
+        self.assertEqual(code, 0)
+        record = json.loads(stderr.strip().splitlines()[-1])
+        self.assertEqual(list(record["stages"]), list(get_transcript.PROFILE_STAGES))
+        self.assertTrue(all(s["calls"] >= 1 for s in record["stages"].values()))
+        self.assertGreater(record["counters"]["bytes_fetched"], 100_000)  # The stub's watch page.
+        self.assertEqual(record["counters"]["snippets"], 240)
+        self.assertEqual(record["counters"]["blocks"], 10)
+        self.assertEqual(record["exit_code"], 0)
+        self.assertTrue(record["exports"][0].endswith("Stub prof_video1.md"))
+
+    def test_profile_dump_and_ledger_summary(self):
+        stats_path = os.path.join(self.tmp.name, 'run.prof')
+        code, stderr = self.run_stub("--profile", stats_path, "--log")
+        self.assertEqual(code, 0)
+        self.assertTrue(os.path.getsize(stats_path) > 0)
+
+        with open(os.path.join(self.tmp.name, 'verification_history.jsonl'), encoding='utf-8') as f:
+            entry = json.loads(f.readline())
+        self.assertEqual((entry["label"], entry["status"]), ("youtube-transcript", "SUCCESS"))
+        self.assertGreater(entry["duration"], 0)
+        self.assertTrue(entry["message"].startswith("Stub prof_video1 | fetch_metadata "))
+        self.assertIn("240 snippets", entry["message"])
+
+    def test_crash_is_recorded_as_a_failure(self):
+        stderr = io.StringIO()
+        with mock.patch.object(get_transcript, 'run_cli', side_effect=RuntimeError("boom")), \
+                mock.patch.object(sys, 'argv', ["get_transcript.py", "--timings"]), \
+                contextlib.redirect_stderr(stderr), self.assertRaises(RuntimeError):
+            get_transcript.main()
+        record = json.loads(stderr.getvalue().strip().splitlines()[-1])
+        self.assertEqual(record["exit_code"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import sys
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+# Add the script path to sys.path
+SCRIPT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.agent', 'skills', 'youtube-transcript', 'scripts'))
+sys.path.append(SCRIPT_DIR)
+
+import get_transcript
+from get_transcript import SearchIndex, TranscriptBlock, TranscriptData, TranscriptExporter
+
+def export(url, title, *texts):
+    blocks = [TranscriptBlock(timestamp=f"{i:02d}:00", start=i * 60.0, text=text) for i, text in enumerate(texts)]
+    return TranscriptExporter.save_markdown(TranscriptData(url=url, title=title, channel="c", blocks=blocks))
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(get_transcript, 'OUTPUT_DIR', self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_hits_are_save_markdown_jump_urls(self):
+        export("https://youtu.be/aaaaaaaaaaa", "Infra Talk", "intro", "deploying kubernetes with helm", "wrap up")
+        export("https://www.youtube.com/watch?v=bbbbbbbbbbb&t=5s", "Other Talk", "kubernetes mention")
+
+        hits = SearchIndex().search("kubernetes helm")
+        self.assertEqual(hits[0].url, "https://youtu.be/aaaaaaaaaaa?t=60s")
+        self.assertEqual((hits[0].title, hits[0].timestamp), ("Infra Talk", "01:00"))
+        # Blocks matching fewer query terms rank below, with the same URL scheme as the export.
+        self.assertEqual(hits[1].url, "https://www.youtube.com/watch?v=bbbbbbbbbbb&t=0s")
+        self.assertEqual(len(hits), 2)
+
+        with open(os.path.join(self.tmp.name, "Infra Talk.md"), encoding='utf-8') as f:
+            self.assertIn(hits[0].url, f.read())
+
+    def test_reexport_replaces_postings(self):
+        export("https://youtu.be/aaaaaaaaaaa", "Infra Talk", "kubernetes")
+        export("https://youtu.be/aaaaaaaaaaa", "Infra Talk", "terraform")
+        self.assertEqual(SearchIndex().search("kubernetes"), [])
+        self.assertEqual([h.url for h in SearchIndex().search("terraform")], ["https://youtu.be/aaaaaaaaaaa?t=0s"])
+
+    def test_missing_index_and_empty_query(self):
+        self.assertEqual(SearchIndex().search("anything"), [])
+        export("https://youtu.be/aaaaaaaaaaa", "Infra Talk", "kubernetes")
+        self.assertEqual(SearchIndex().search("  "), [])
+
+    def test_postings_are_streamed_not_collected(self):
+        seen = []
+        original = SearchIndex.index_document
+
+        def spy(index, file_name, title, base_url, postings):
+            seen.append(postings)
+            return original(index, file_name, title, base_url, postings)
+
+        with mock.patch.object(SearchIndex, 'index_document', spy):
+            export("https://youtu.be/aaaaaaaaaaa", "Infra Talk", "intro", "kubernetes")
+        self.assertNotIsInstance(seen[0], list)
+        self.assertEqual([h.timestamp for h in SearchIndex().search("kubernetes")], ["01:00"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import sys
+import os
+import time
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+# Add the script path to sys.path
+SCRIPT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.agent', 'skills', 'youtube-transcript', 'scripts'))
+sys.path.append(SCRIPT_DIR)
+
+import get_transcript
+from get_transcript import (
+    CaptionGapRule, ChapterRule, CompactTranscript, IntervalRule, MaxDurationRule, Segmenter, TokenBudgetRule,
+    TranscriptCache, TranscriptExporter, TranscriptProcessor, save_transcript, TOKEN_CHARS
+)
+
+def talk(count, seed=3):
+    """Captions every ~2s, with a 5s pause after every sentence (every 7th snippet)."""
+    rng = random.Random(seed)
+    snippets, start = [], 0.0
+    for i in range(count):
+        end_of_sentence = i % 7 == 6
+        text = " ".join(rng.choice(("deploy", "cluster", "latency", "we", "the")) for _ in range(3))
+        snippets.append({"start": start, "duration": 1.8, "text": text + ("." if end_of_sentence else "")})
+        start += 2.0 + (5.0 if end_of_sentence else 0.0)
+    return snippets
+
+class TestSegmenter(unittest.TestCase):
+    def test_interval_rule_matches_iter_blocks(self):
+        raw = talk(300)
+        shuffled = raw[:]
+        random.Random(1).shuffle(shuffled)
+        for data in (raw, shuffled):
+            for interval in (7.3, 60.0):
+                self.assertEqual(list(Segmenter([IntervalRule(interval)]).segment(data)),
+                                 TranscriptProcessor.group_blocks(data, interval))
+
+    def test_caption_gaps_split_at_silence(self):
+        blocks = TranscriptProcessor.group_blocks(talk(70), segmenter=Segmenter([CaptionGapRule(3.0)]))
+        self.assertEqual(len(blocks), 10)
+        self.assertTrue(all(b.text.endswith(".") for b in blocks))
+
+    def test_unknown_durations_never_open_a_gap(self):
+        raw = [{"start": s["start"], "text": s["text"]} for s in talk(70)]
+        self.assertEqual(len(TranscriptProcessor.group_blocks(raw, segmenter=Segmenter([CaptionGapRule(3.0)]))), 1)
+
+    def test_token_budget_is_kept_and_prefers_sentence_ends(self):
+        budget = 40
+        blocks = TranscriptProcessor.group_blocks(talk(500), segmenter=Segmenter([TokenBudgetRule(budget)]))
+        self.assertTrue(all(len(b.text) <= budget * TOKEN_CHARS for b in blocks))
+        sentence_ends = sum(b.text.endswith(".") for b in blocks[:-1])
+        self.assertGreater(sentence_ends, (len(blocks) - 1) * 0.8)
+
+    def test_blocks_never_straddle_a_chapter(self):
+        chapters = ChapterRule.parse(["Chapters:", "0:00 Intro", "1:05 - Setup", "1:02:03 Q&A"])
+        self.assertEqual(chapters, [0.0, 65.0, 3723.0])
+        blocks = TranscriptProcessor.group_blocks(talk(1500), segmenter=Segmenter([ChapterRule(chapters)]))
+        self.assertEqual(len(blocks), 3)
+        self.assertGreaterEqual(blocks[1].start, 65.0)
+        self.assertGreaterEqual(blocks[2].start, 3723.0)
+
+    def test_from_options_leaves_plain_intervals_to_the_fast_path(self):
+        self.assertIsNone(Segmenter.from_options(interval=30.0))
+        rules = Segmenter.from_options(interval=30.0, min_gap=2.0, max_tokens=100, chapter_starts=[0.0]).rules
+        self.assertEqual([type(r) for r in rules], [ChapterRule, CaptionGapRule, TokenBudgetRule, MaxDurationRule])
+        self.assertEqual(rules[-1].max_seconds, 30.0)
+
+    def test_max_duration_backstop_bounds_blocks_without_clock_cuts(self):
+        # Without durations no gap ever opens, so only the backstop ends blocks: every 60s
+        # from each block's own start, not at minute boundaries.
+        raw = [{"start": s["start"], "text": s["text"]} for s in talk(70)]
+        segmenter = Segmenter.from_options(min_gap=3.0)
+        self.assertEqual(segmenter.rules[-1].max_seconds, 60.0)
+        blocks = TranscriptProcessor.group_blocks(raw, segmenter=segmenter)
+        self.assertGreater(len(blocks), 1)
+        ends = [b.start for b in blocks[1:]] + [raw[-1]["start"] + 2.0]
+        self.assertTrue(all(end - b.start <= 62.0 for b, end in zip(blocks, ends)))
+        self.assertNotEqual([b.start for b in blocks], [b.start for b in TranscriptProcessor.group_blocks(raw)])
+        self.assertEqual([type(r) for r in Segmenter.from_options(interval=0, min_gap=3.0).rules], [CaptionGapRule])
+
+    def test_backstop_leaves_content_cuts_alone(self):
+        # Chapters at 0 and 600s: the cap splits each chapter from the chapter's start, so
+        # the blocks are not the minute buckets, and the second chapter still starts a block.
+        raw = talk(300)
+        blocks = TranscriptProcessor.group_blocks(raw, segmenter=Segmenter.from_options(chapter_starts=[0.0, 600.0]))
+        self.assertIn(601.0, [b.start for b in blocks])
+        self.assertNotEqual(blocks, TranscriptProcessor.group_blocks(raw))
+        # A gap-driven block is never cut short just because it crosses a minute boundary.
+        gaps = TranscriptProcessor.group_blocks(raw, segmenter=Segmenter.from_options(min_gap=3.0))
+        self.assertEqual(gaps, TranscriptProcessor.group_blocks(raw, segmenter=Segmenter([CaptionGapRule(3.0)])))
+
+    def test_rules_must_implement_cut_and_spec(self):
+        class Partial(get_transcript.SegmentRule):
+            def cut(self, t, a, i):
+                return False
+
+        with self.assertRaises(TypeError):
+            Partial()
+
+    def test_single_pass_scales_to_long_inputs(self):
+        raw = talk(100_000)
+        segmenter = Segmenter([ChapterRule([600.0 * i for i in range(100)]), CaptionGapRule(3.0), TokenBudgetRule(200)])
+        compact = CompactTranscript.from_snippets(raw)
+        started = time.perf_counter()
+        blocks = list(segmenter.segment(compact))
+        self.assertLess(time.perf_counter() - started, 5.0)
+        self.assertEqual(sum(len(b.text) + 1 for b in blocks), len(compact.text) + 1)
+
+class TestSegmentedExport(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(get_transcript, 'OUTPUT_DIR', self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_segmented_blocks_reach_the_markdown(self):
+        segmenter = Segmenter([CaptionGapRule(3.0)])
+        path = save_transcript("aaaaaaaaaaa", {"title": "Gaps", "channel": "c"}, talk(70), segmenter=segmenter)
+        blocks = TranscriptExporter.load_markdown(path).blocks
+        self.assertEqual(len(blocks), 10)
+        self.assertEqual(blocks[1].start, 19.0)
+
+    def test_cache_keeps_durations(self):
+        cache = TranscriptCache(cache_dir=os.path.join(self.tmp.name, "cache"))
+        cache.put("aaaaaaaaaaa", {"title": "t", "channel": "c"}, talk(14))
+        snippets = cache.get("aaaaaaaaaaa")["snippets"]
+        self.assertEqual(snippets[0]["duration"], 1.8)
+        self.assertEqual(len(TranscriptProcessor.group_blocks(snippets, segmenter=Segmenter([CaptionGapRule(3.0)]))), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import sys
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+# Add the script path to sys.path
+SCRIPT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.agent', 'skills', 'youtube-transcript', 'scripts'))
+sys.path.append(SCRIPT_DIR)
+
+import get_transcript
+from get_transcript import CompactTranscript, TranscriptProcessor, TranscriptExporter, TranscriptData, save_transcript
+
+WORDS = ["kubernetes", "deployment", "container", "function", "example", "terraform", "because", "scaling"]
+
+def synthetic_snippets(count, step=2.5):
+    return [{"start": i * step, "text": f" {WORDS[i % len(WORDS)]} {WORDS[(i * 3) % len(WORDS)]} "} for i in range(count)]
+
+class TestStreamingExport(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(get_transcript, 'OUTPUT_DIR', self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+    def read(self, path):
+        with open(path, encoding='utf-8') as f:
+            return f.read()
+
+    def test_streaming_pipeline_matches_materialized_export(self):
+        raw = synthetic_snippets(500)
+        url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=42s"
+        meta = {"title": "Streaming Equivalence", "channel": "Test Channel"}
+
+        blocks = TranscriptProcessor.group_blocks(raw)
+        keywords = TranscriptProcessor.extract_keywords(" ".join(b.text for b in blocks))
+        expected = self.read(TranscriptExporter.save_markdown(
+            TranscriptData(url=url, title=meta['title'], channel=meta['channel'], blocks=blocks, keywords=keywords)
+        ))
+
+        # A one-shot generator is packed straight into the compact arrays, never into a snippet list.
+        streamed = self.read(save_transcript(url, meta, (s for s in raw)))
+        self.assertEqual(streamed, expected)
+        self.assertIn("watch?v=dQw4w9WgXcQ&t=60s", streamed)
+
+    def test_interval_is_configurable(self):
+        raw = synthetic_snippets(48)  # 120 seconds of speech
+        self.assertEqual(len(TranscriptProcessor.group_blocks(raw)), 2)
+        thirty = TranscriptProcessor.group_blocks(raw, interval=30)
+        self.assertEqual([b.timestamp for b in thirty], ["00:00", "00:30", "01:00", "01:30"])
+
+    def test_blocks_are_yielded_lazily(self):
+        consumed = []
+
+        def snippets():
+            for s in synthetic_snippets(100):
+                consumed.append(s)
+                yield s
+
+        first = next(TranscriptProcessor.iter_blocks(snippets()))
+        self.assertEqual(first.start, 0.0)
+        # Only the first minute plus the snippet that closed it have been pulled.
+        self.assertEqual(len(consumed), 25)
+
+    def test_generator_input_packs_like_a_list(self):
+        raw = synthetic_snippets(50) + [{"start": 200.0, "text": "tail", "duration": 1.5}]
+        listed = CompactTranscript.from_snippets(raw)
+        streamed = CompactTranscript.from_snippets(s for s in raw)
+        self.assertEqual(streamed.text, listed.text)
+        self.assertEqual((streamed.starts, streamed.offsets), (listed.starts, listed.offsets))
+        self.assertEqual(streamed.durations[-1], 1.5)
+        self.assertEqual(list(streamed.iter_blocks()), list(listed.iter_blocks()))
+
+if __name__ == '__main__':
+    unittest.main()
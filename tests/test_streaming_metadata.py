@@ -0,0 +1,86 @@
+import sys
+import os
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the script path to sys.path
+SCRIPT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.agent', 'skills', 'youtube-transcript', 'scripts'))
+sys.path.append(SCRIPT_DIR)
+
+from get_transcript import YouTubeClient, MetadataScanner
+
+PADDING = b"<script>var ytInitialData = {};</script>" * 50000  # ~2 MB of inline JS
+PAGES = {
+    "/watch-early": (
+        b"<html><head><title>Streaming Talk - YouTube</title>"
+        b'<link itemprop="name" content="Conf Channel"></head><body>' + PADDING + b"</body></html>"
+    ),
+    "/watch-author-late": (
+        b"<html><head><title>Late Author</title></head><body>" + PADDING +
+        b'<script>{"author":"JSON Channel"}</script></body></html>'
+    ),
+}
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Local stand-in for the YouTube watch page."""
+    def do_GET(self):
+        body = PAGES.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The client hung up early, which is the point.
+
+    def log_message(self, *args):
+        pass
+
+class TestStreamingMetadata(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_early_exit_reads_a_fraction_of_the_page(self):
+        client = YouTubeClient()
+        metadata, stats = client.fetch_metadata_with_stats(f"{self.base}/watch-early")
+        self.assertEqual(metadata, {"title": "Streaming Talk", "channel": "Conf Channel"})
+        self.assertTrue(stats.complete)
+        self.assertLess(stats.bytes_read, len(PAGES["/watch-early"]) // 10)
+        self.assertGreater(stats.time_to_metadata, 0)
+        self.assertEqual(client.metadata_fetches, 1)
+        self.assertEqual(client.metadata_totals.bytes_read, stats.bytes_read)
+
+    def test_late_fallback_reads_until_found(self):
+        metadata, stats = YouTubeClient().fetch_metadata_with_stats(f"{self.base}/watch-author-late")
+        self.assertEqual(metadata, {"title": "Late Author", "channel": "JSON Channel"})
+        self.assertTrue(stats.complete)
+        self.assertGreater(stats.bytes_read, len(PADDING))
+
+    def test_http_error_is_non_fatal(self):
+        self.assertEqual(
+            YouTubeClient().fetch_metadata(f"{self.base}/missing"),
+            {"title": "YouTube Transcript", "channel": "Unknown Channel"}
+        )
+
+    def test_scanner_matches_across_chunk_boundaries(self):
+        page = '<html><title>Split Title - YouTube</title><link itemprop="name" content="Split Channel"></html>'
+        scanner = MetadataScanner()
+        for ch in page:
+            scanner.feed(ch)
+        self.assertEqual(scanner.result(), {"title": "Split Title", "channel": "Split Channel"})
+
+if __name__ == '__main__':
+    unittest.main()
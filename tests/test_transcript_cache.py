@@ -0,0 +1,83 @@
+import sys
+import os
+import time
+import tempfile
+import unittest
+from unittest import mock
+
+# Add the script path to sys.path
+SCRIPT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.agent', 'skills', 'youtube-transcript', 'scripts'))
+sys.path.append(SCRIPT_DIR)
+
+import get_transcript
+from get_transcript import TranscriptCache, export_video
+
+class CountingClient:
+    """Counts network calls so tests can prove a cache hit never touches the network."""
+    def __init__(self):
+        self.metadata_calls = 0
+        self.transcript_calls = 0
+
+    def fetch_metadata(self, url):
+        self.metadata_calls += 1
+        return {"title": "Cached Talk", "channel": "Conf Channel"}
+
+    def fetch_transcript_raw(self, video_id):
+        self.transcript_calls += 1
+        return [{"start": 0.0, "text": "welcome"}, {"start": 65.0, "text": "kubernetes"}]
+
+class TestTranscriptCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache_dir = os.path.join(self.tmp.name, 'cache')
+        patcher = mock.patch.object(get_transcript, 'OUTPUT_DIR', os.path.join(self.tmp.name, 'out'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_hit_skips_network_and_exports_identically(self):
+        client = CountingClient()
+        cache = TranscriptCache(self.cache_dir)
+        first = export_video(client, "aaaaaaaaaaa", "aaaaaaaaaaa", cache=cache)
+        with open(first, encoding='utf-8') as f:
+            first_content = f.read()
+
+        second = export_video(client, "aaaaaaaaaaa", "aaaaaaaaaaa", cache=cache)
+        with open(second, encoding='utf-8') as f:
+            self.assertEqual(f.read(), first_content)
+        self.assertEqual((client.metadata_calls, client.transcript_calls), (1, 1))
+
+    def test_refresh_refetches_and_expired_entries_miss(self):
+        client = CountingClient()
+        export_video(client, "aaaaaaaaaaa", "aaaaaaaaaaa", cache=TranscriptCache(self.cache_dir))
+        export_video(client, "aaaaaaaaaaa", "aaaaaaaaaaa", cache=TranscriptCache(self.cache_dir, refresh=True))
+        self.assertEqual(client.transcript_calls, 2)
+
+        self.assertIsNotNone(TranscriptCache(self.cache_dir).get("aaaaaaaaaaa"))
+        self.assertIsNone(TranscriptCache(self.cache_dir, ttl=-1).get("aaaaaaaaaaa"))
+        # Expired entries are dropped on read.
+        self.assertFalse(os.path.exists(os.path.join(self.cache_dir, "aaaaaaaaaaa.json")))
+
+    def test_size_cap_evicts_least_recently_used(self):
+        cache = TranscriptCache(self.cache_dir)
+        meta = {"title": "t", "channel": "c"}
+        snippets = [{"start": float(i), "text": "x" * 50} for i in range(20)]
+        for vid in ("aaaaaaaaaaa", "bbbbbbbbbbb"):
+            cache.put(vid, meta, snippets)
+        # Make 'a' the oldest, then read it so it becomes the most recently used.
+        old = time.time() - 100
+        os.utime(os.path.join(self.cache_dir, "aaaaaaaaaaa.json"), (old, old))
+        os.utime(os.path.join(self.cache_dir, "bbbbbbbbbbb.json"), (old + 1, old + 1))
+        self.assertIsNotNone(cache.get("aaaaaaaaaaa"))
+
+        entry_size = os.path.getsize(os.path.join(self.cache_dir, "aaaaaaaaaaa.json"))
+        # Room for two entries (with slack for differing timestamp widths), not three.
+        cache.max_bytes = entry_size * 2 + entry_size // 2
+        cache.put("ccccccccccc", meta, snippets)
+
+        self.assertIsNotNone(cache.get("aaaaaaaaaaa"))
+        self.assertIsNone(cache.get("bbbbbbbbbbb"))
+        self.assertIsNotNone(cache.get("ccccccccccc"))
+
+if __name__ == '__main__':
+    unittest.main()